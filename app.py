@@ -2,19 +2,84 @@
 
 # Run with 'shiny run --reload --launch-browser ./app.py' in Terminal when in the directory
 
-import re
 import os
 import csv
 import datetime
 import calendar
+import tempfile
 import statistics
-import numpy as np
 from shiny import reactive, req
-from shiny.express import input, render, ui
+from shiny.express import input, render, session, ui
 from shiny.types import FileInfo
 from shinywidgets import render_plotly
-import pandas as pd
-import plotly.express as px
+from lazy_imports import np, pd, px
+from performance_metrics import (
+    timed,
+    get_timing_summary,
+    get_timing_histogram,
+    export_timings_json,
+    reset_timings,
+)
+from session_datasets import (
+    MEMORY_CAP_BYTES,
+    register_session_dataset,
+    get_session_dataset,
+    release_session_dataset,
+    get_total_dataset_bytes,
+    get_memory_report,
+)
+from figure_widgets import sync_figure_widget
+from figure_cache import (
+    make_selection_hash,
+    get_or_build_figure,
+    get_figure_cache_stats,
+)
+from publication_data import (
+    INGEST_CHUNK_ROWS,
+    create_publisher_tuplelist,
+    get_publisher_column_labels,
+    get_top_publishers,
+    load_workbook_dataset,
+    iter_workbook_dataset,
+    get_selected_publication_mask,
+    get_venue_mask,
+    count_selected_authors,
+)
+from publication_analytics import (
+    get_efficiency_matrix,
+    get_mean_efficiency,
+    get_period_changes,
+    get_period_count_matrix,
+    get_publisher_columns,
+    rolling_window_rate,
+    fit_linear_trends,
+)
+from summary_report import iter_wide_rows, write_summary_report
+from dashboard_snapshot import build_dashboard_snapshot
+from workbook_validation import WorkbookValidationError
+from author_drilldown import (
+    DRILLDOWN_PAGE_SIZE,
+    get_author_rows,
+    get_author_summary,
+    get_author_timeline,
+    get_coauthor_counts,
+    get_publication_page,
+)
+from publisher_cohorts import (
+    save_cohort,
+    get_cohort_members,
+    build_author_totals,
+    build_cohort_totals,
+    get_cohort_totals,
+    get_cohort_period_counts,
+)
+from shared_dataset import (
+    start_preload,
+    DATA_POLL_SECONDS,
+    get_shared_dataset_source,
+    is_shared_dataset_configured,
+    get_preloaded_dataset,
+)
 
 year_designations = {
     # Each Year Designation is [Start Month, Start Day],[End Month, End Day]
@@ -23,9 +88,47 @@ year_designations = {
     "Fiscal_Year": [[7, 1], [6, 30]],
 }
 
+year_designation_choices = {
+    "1": "Calendar Year (January 1st - December 31st)",
+    "2": "Academic Year (August 1st - July 31st)",
+    "3": "Fiscal Year (July 1st - June 30th)",
+}
+
 publish_data_dict: dict = {}
 
-PERCENT_SUPER_HEADER = "Research %, Based on fall semester (e.g. 2003/2004 academic year is considered 2003)"
+# Chunked attribution of this session's latest upload
+session_ingestion = {
+    "Chunks": None,  # Yields the dataset after each attributed chunk - Generator
+    "Datapaths": None,  # Upload being attributed - Tuple of Strings
+    "Progress": None,  # Progress bar shown while attributing - Progress
+}
+ingestion_progress = reactive.value(1.0)
+ingestion_trigger = reactive.value(0)
+# Uploads that failed validation, kept so their charts stay empty instead of retrying
+rejected_datapaths = reactive.value(None)
+# Bumped when this session saves a cohort so the cohort choices are offered again
+saved_cohorts_changed = reactive.value(0)
+# Page of the drilldown's publication list, from 0
+drilldown_page = reactive.value(0)
+# Publishers and timespan picked on a chart, which narrow every other chart's view
+cross_filter = reactive.value(
+    {
+        "Publishers": None,  # Picked publisher keys - Tuple of Strings
+        "Publishers_Source": None,  # Output the publishers were picked on - String
+        "Period": None,  # Picked first and last day - Tuple of Datetimes
+        "Period_Source": None,  # Output the timespan was picked on - String
+    }
+)
+# Output whose figure is being built, which its own cross filter picks do not narrow
+building_output = {"Output_ID": None}
+
+SHOW_PERFORMANCE_PANEL = os.environ.get("DASHBOARD_PERFORMANCE_PANEL", "0") == "1"
+
+# Most frequent venues shown in the venue breakdown
+VENUE_BREAKDOWN_LIMIT = 15
+
+# Periods past the selected timespan that the faculty trend lines are extended into
+TREND_PROJECTION_PERIODS = 2
 
 df_data_styles = [
     {
@@ -43,179 +146,189 @@ df_data_styles = [
 ]
 
 
-def read_in_file_all_data():
-    """Read in the raw publication data that includes all the publications"""
-    req(input.file1())
-    file: list[FileInfo] | None = input.file1()
-    if file is not None:
-        all_raw_data = pd.read_excel(
-            file[0]["datapath"], sheet_name="All Data", index_col=None
-        )
-        return all_raw_data
+if is_shared_dataset_configured():
 
+    @reactive.poll(get_shared_dataset_source, DATA_POLL_SECONDS)
+    def shared_dataset_source():
+        """Get the path and hash of the worker's shared dataset, changing only when a new one is swapped in"""
+        return get_shared_dataset_source()
 
-def read_in_file_publisher_data():
-    """Read in the raw publisher data detailing names and research percentages"""
-    req(input.file1())
+else:
+
+    def shared_dataset_source():
+        """No workbook is preloaded or watched, so sessions only show uploads and nothing is polled"""
+        return None
+
+
+@reactive.calc
+def dataset_source():
+    """Get the workbooks this session's charts are built from: the uploaded master files,
+    otherwise the preloaded or watched workbook once it is ready"""
     file: list[FileInfo] | None = input.file1()
     if file is not None:
-        publisher_raw_data = pd.read_excel(
-            file[0]["datapath"], sheet_name="Publishers", index_col=None, header=[0, 1]
-        )
-        return publisher_raw_data
+        datapaths = tuple(each_file["datapath"] for each_file in file)
+        req(datapaths != rejected_datapaths.get())
+        return datapaths
+    return req(shared_dataset_source())
 
 
-def check_publisher_repeats(publisher_names_full):
-    """Check for publisher name repeats and assign numbers to names if
-    a name appears more than once"""
-    publisher_list = []
-    for each_name in publisher_names_full:
-        publisher_list.append(each_name[1])
-    name_counts = []
-    for each_name in publisher_list:
-        if publisher_list.count(each_name) > 1:
-            if each_name not in name_counts:
-                name_counts.append(each_name)
-    if len(name_counts) > 0:
-        for each_repeat_name in name_counts:
-            repeat_count = 1
-            for index, each_name in enumerate(publisher_list):
-                if publisher_list[index] == each_repeat_name:
-                    publisher_list[index] = each_name + "_" + str(repeat_count)
-                    repeat_count += 1
-    return publisher_list, name_counts
+def register_loaded_dataset(
+    datapaths, dataset, shared_objects=None, estimate_bytes=True
+):
+    """Make a parsed dataset this session's current one and account for its memory,
+    only measuring it again when estimate_bytes is set"""
+    publish_data_dict.clear()
+    publish_data_dict.update(dataset["Publish_Data"])
+    dataset["Publish_Data"] = publish_data_dict
+    register_session_dataset(
+        session.id,
+        datapaths,
+        dataset,
+        evict_callback=publish_data_dict.clear,
+        shared_objects=shared_objects,
+        estimate_bytes=estimate_bytes,
+    )
 
 
-@render.ui
-@reactive.event(input.file1, ignore_none=True)
-def create_publisher_data():
-    """Create a dictionary with all publishers and their corresponding publications and other assigned information"""
-    all_raw_data = read_in_file_all_data()
-    publisher_raw_data = read_in_file_publisher_data()
-    publisher_names_full = create_publisher_tuplelist(publisher_raw_data)
-    if all_raw_data is not None:
-        if publisher_raw_data is not None:
-            all_data = all_raw_data.drop(
-                ["Online published", "Number of NYIT \nStudent Authors"], axis=1
-            )
-            publisher_data = publisher_raw_data.sort_index(axis=1).drop(
-                [
-                    PERCENT_SUPER_HEADER,
-                    "Position",
-                ],
-                axis=1,
+def load_session_dataset():
+    """Return this session's parsed workbook and attribution structures,
+    transparently reloading them if they were evicted to save memory"""
+    datapaths = dataset_source()
+    dataset = get_session_dataset(session.id, datapaths)
+    if dataset is None:
+        preloaded_dataset, preloaded_source = get_preloaded_dataset()
+        if input.file1() is None:
+            # A newer shared dataset may have been swapped in since this session last polled
+            req(preloaded_source == datapaths)
+            dataset = dict(preloaded_dataset)
+        else:
+            preloaded_dataset = None
+            dataset = load_workbook_dataset(
+                *datapaths,
+                workbook_names=[each_file["name"] for each_file in input.file1()],
             )
-            publisher_list, name_counts = check_publisher_repeats(publisher_names_full)
-
-            for index, each_publisher in enumerate(publisher_list):
-                # Use Default Dictionary Values to replace this
-                publish_data_dict[each_publisher] = {
-                    "Search_Name_Last": publisher_names_full[index][
-                        1
-                    ],  # Publisher Last Name - String
-                    "Search_Name_First": publisher_names_full[index][
-                        0
-                    ],  # Publisher First Name - String
-                    "Search_Name_Middle_I": None,  # Publisher Middle Initial - String
-                    "Display_Name": publisher_names_full[index][1]
-                    + ", "
-                    + publisher_names_full[index][0],  # Whole Display Name - String
-                    "Author_Publications": (),  # All Publications attributed to Publisher - Tuple of Tuples that include Date,DOI, & Citation((date,doi,citation),())
-                    "Publication_Amount": 0,  # Amount of Publications attributed to Publisher - Integer
-                    "Currently_at_NYIT": False,  # Still at NYIT or Not - Boolean
-                    "Research_Percents": {},  # Percentage of Work as Research - Dictionary {Fall Semester Year:Percent - Float,}
-                }
-                if publish_data_dict[each_publisher]["Search_Name_Last"] in name_counts:
-                    # Look for last name & First Initial
-                    # If First Initial is the same, look for first name
-                    # If first name is the same, look for middle initial if it exists
-                    pass
-                else:
-                    regex_name_search_cite = (
-                        r"(\W|\A)"
-                        + publish_data_dict[each_publisher]["Search_Name_Last"]
-                        + r"(\W)+"
-                        + publish_data_dict[each_publisher]["Search_Name_First"][0]
-                    )
-                    regex_name_search_last = (
-                        r"(\W|\A)"
-                        + publish_data_dict[each_publisher]["Search_Name_Last"]
-                        + r"(\W|\Z)"
-                    )
-                    name_match_cite = re.compile(regex_name_search_cite, re.IGNORECASE)
-                    name_match_last = re.compile(regex_name_search_last, re.IGNORECASE)
-                    all_attributed_publications = []
-                    for index, row in all_data.iterrows():
-                        publication_placeholder = []
-                        if re.search(name_match_cite, row["Citation"]) is not None:
-                            publication_placeholder.append(row["Print Published"])
-                            publication_placeholder.append(row["DOI"])
-                            publication_placeholder.append(row["Citation"])
-                        if publication_placeholder:
-                            all_attributed_publications.append(
-                                tuple(publication_placeholder)
-                            )
-                    all_attributed_publications = tuple(all_attributed_publications)
-                    publish_data_dict[each_publisher][
-                        "Author_Publications"
-                    ] = all_attributed_publications
-                    publish_data_dict[each_publisher]["Publication_Amount"] = len(
-                        all_attributed_publications
-                    )
-                    for index, row in publisher_data.iterrows():
-                        if (
-                            re.search(name_match_last, row["Last Name"].tolist()[0])
-                            is not None
-                        ):
-                            publish_data_dict[each_publisher]["Currently_at_NYIT"] = (
-                                row["Currently at NYIT"].tolist()[0]
-                            )
+        register_loaded_dataset(datapaths, dataset, shared_objects=preloaded_dataset)
+    return dataset
 
-            newest_publication_date = get_time_extremes("Newest")
 
-            recorded_year_range = range(
-                min(list(publisher_raw_data[PERCENT_SUPER_HEADER].columns)),
-                newest_publication_date.year + 1,
-            )
+@reactive.calc
+def dataset_ready():
+    """Get the workbooks this session's charts are built from once every row has been attributed"""
+    datapaths = dataset_source()
+    req(ingestion_progress.get() >= 1)
+    return datapaths
 
-            for index, each_publisher in enumerate(publisher_list):
-                year_dict = {}
-                name_match = re.compile(
-                    publish_data_dict[each_publisher]["Search_Name_Last"], re.IGNORECASE
-                )
-                for index, row in publisher_raw_data.iterrows():
-                    if re.search(name_match, row["Last Name"].tolist()[0]) is not None:
-                        for each_year in recorded_year_range:
-                            research_percent = publisher_raw_data[
-                                PERCENT_SUPER_HEADER, each_year
-                            ].iloc[index]
-                            if np.isnan(research_percent.item()):
-                                year_dict[each_year] = 0
-                            else:
-                                year_dict[each_year] = research_percent.item()
-
-                publish_data_dict[each_publisher]["Research_Percents"] = year_dict
-
-
-def create_publisher_tuplelist(publisher_raw_data, first_last=True):
-    """Create a tuple with each publisher name as ('first name','last name') or ('last name','first name')"""
-    if first_last is True:
-        publisher_names_full = tuple(
-            zip(
-                list(publisher_raw_data[publisher_raw_data.columns[0]]),
-                list(publisher_raw_data[publisher_raw_data.columns[1]]),
-            )
+
+def read_in_file_all_data():
+    """Get the publication data that includes all the publications, with duplicate rows merged"""
+    return load_session_dataset()["All_Data"]
+
+
+def read_in_file_duplicate_report():
+    """Get the report of sheet rows that were merged into a single publication"""
+    return load_session_dataset()["Duplicate_Report"]
+
+
+def read_in_file_publisher_data():
+    """Get the raw publisher data detailing names and research percentages"""
+    return load_session_dataset()["Publisher_Data"]
+
+
+start_preload()
+
+
+@session.on_ended
+def release_dataset_on_session_end():
+    """Drop this session from the server memory accounting when its connection closes"""
+    release_session_dataset(session.id)
+
+
+def advance_ingestion():
+    """Attribute the next chunk of the upload, returning whether any rows are left"""
+    if session_ingestion["Chunks"] is None:
+        return False
+    dataset = next(session_ingestion["Chunks"])
+    # Measuring the growing dataset after every chunk would cost more than attributing it
+    register_loaded_dataset(
+        session_ingestion["Datapaths"],
+        dataset,
+        estimate_bytes=dataset["Rows_Attributed"] == dataset["Rows_Total"],
+    )
+    if dataset["Rows_Attributed"] < dataset["Rows_Total"]:
+        attributed_fraction = dataset["Rows_Attributed"] / dataset["Rows_Total"]
+        session_ingestion["Progress"].set(
+            attributed_fraction,
+            message="Attributing publications",
+            detail=f"{dataset['Rows_Attributed']} of {dataset['Rows_Total']} rows",
         )
-    elif first_last is False:
-        publisher_names_full = tuple(
-            zip(
-                list(publisher_raw_data[publisher_raw_data.columns[1]]),
-                list(publisher_raw_data[publisher_raw_data.columns[0]]),
-            )
+        ingestion_progress.set(attributed_fraction)
+        return True
+    session_ingestion["Progress"].close()
+    session_ingestion.update({"Chunks": None, "Datapaths": None, "Progress": None})
+    ingestion_progress.set(1.0)
+    return False
+
+
+def show_validation_report(validation_report):
+    """Show the problems that got an upload rejected, as a table in a modal"""
+    report_table = pd.DataFrame(validation_report).to_html(
+        index=False, classes="table table-sm", border=0
+    )
+    ui.modal_show(
+        ui.modal(
+            ui.p("The upload was not loaded. Fix these problems and upload it again."),
+            ui.HTML(report_table),
+            title="Workbook rejected",
+            size="xl",
+            easy_close=True,
         )
-    else:
-        raise ValueError("Not a valid option. Need true or false for first_last")
-    return publisher_names_full
+    )
+
+
+@render.ui
+@reactive.event(dataset_source)
+@timed()
+def create_publisher_data():
+    """Load the uploaded master files and start attributing their publications to each publisher,
+    one chunk of rows at a time so the charts can render from partial results"""
+    datapaths = dataset_source()
+    if session_ingestion["Progress"] is not None:
+        session_ingestion["Progress"].close()
+        session_ingestion.update({"Chunks": None, "Datapaths": None, "Progress": None})
+    if input.file1() is None or get_session_dataset(session.id, datapaths) is not None:
+        ingestion_progress.set(1.0)
+        load_session_dataset()
+        return
+    session_ingestion["Chunks"] = iter_workbook_dataset(
+        *datapaths,
+        workbook_names=[each_file["name"] for each_file in input.file1()],
+        chunk_rows=INGEST_CHUNK_ROWS,
+    )
+    session_ingestion["Datapaths"] = datapaths
+    session_ingestion["Progress"] = ui.Progress(min=0, max=1)
+    session_ingestion["Progress"].set(0, message="Reading workbooks")
+    ingestion_progress.set(0.0)
+    # Reads and validates the workbooks, then registers the dataset before any row is attributed
+    try:
+        advance_ingestion()
+    except WorkbookValidationError as validation_error:
+        session_ingestion["Progress"].close()
+        session_ingestion.update({"Chunks": None, "Datapaths": None, "Progress": None})
+        ingestion_progress.set(1.0)
+        rejected_datapaths.set(datapaths)
+        show_validation_report(validation_error.validation_report)
+        return
+    ingestion_trigger.set(ingestion_trigger.get() + 1)
+
+
+@reactive.effect
+def attribute_next_chunk():
+    """Keep attributing the upload chunk by chunk, letting outputs refresh in between"""
+    ingestion_trigger.get()
+    with reactive.isolate():
+        rows_remaining = advance_ingestion()
+    if rows_remaining:
+        reactive.invalidate_later(0)
 
 
 def convert_tuples_to_name_list(tuplelist):
@@ -227,7 +340,7 @@ def convert_tuples_to_name_list(tuplelist):
 
 
 @render.ui
-@reactive.event(input.file1, ignore_none=True)
+@reactive.event(dataset_source)
 def change_author():
     """Update the checklist to display all publisher names when raw data file is loaded in"""
     publisher_raw_data = read_in_file_publisher_data()
@@ -236,6 +349,74 @@ def change_author():
     )
     author_list = convert_tuples_to_name_list(publisher_names_full)
     ui.update_checkbox_group("selectauthor", choices=sorted(author_list))
+    for each_side in ["a", "b"]:
+        ui.update_selectize(
+            "compare_authors_" + each_side, choices=sorted(author_list), selected=[]
+        )
+    ui.update_select(
+        "drilldown_author",
+        choices={
+            each_name.split(",")[0]: each_name for each_name in sorted(author_list)
+        },
+    )
+
+
+@reactive.effect
+def change_cohort_choices():
+    """Offer every cohort of the loaded workbook, keeping the checked ones that still exist"""
+    saved_cohorts_changed()
+    cohort_names = list(get_cohort_members(load_session_dataset()))
+    with reactive.isolate():
+        checked_cohorts = [
+            each_cohort
+            for each_cohort in input.groupselector()
+            if each_cohort in cohort_names
+        ]
+        compared_cohorts = [
+            each_cohort
+            for each_cohort in input.compare_cohorts()
+            if each_cohort in cohort_names
+        ]
+        if input.file1() is None and not checked_cohorts:
+            # Preloaded workbook, so open on a populated view instead of an empty one
+            checked_cohorts = ["Still at NYIT"]
+    ui.update_checkbox_group(
+        "groupselector", choices=cohort_names, selected=checked_cohorts
+    )
+    ui.update_selectize(
+        "compare_cohorts", choices=cohort_names, selected=compared_cohorts
+    )
+
+
+@reactive.effect
+@reactive.event(input.save_cohort)
+def save_selected_cohort():
+    """Save the selected publishers as a cohort offered to every session on this worker"""
+    try:
+        save_cohort(input.cohort_name(), input.selectauthor())
+    except ValueError as e:
+        ui.notification_show(str(e), type="warning")
+        return
+    ui.update_text("cohort_name", value="")
+    saved_cohorts_changed.set(saved_cohorts_changed.get() + 1)
+
+
+@reactive.effect
+@reactive.event(dataset_ready)
+def change_venue_choices():
+    """Offer every venue parsed from the citations, most published in first, once the upload is attributed"""
+    publication_table = load_session_dataset()["Publication_Table"]
+    venue_codes = publication_table["Venue_Codes"]
+    venue_counts = np.bincount(
+        venue_codes[venue_codes >= 0],
+        minlength=len(publication_table["Venue_Names"]),
+    )
+    venue_order = np.argsort(-venue_counts, kind="stable")
+    ui.update_selectize(
+        "venue_filter",
+        choices=publication_table["Venue_Names"][venue_order].tolist(),
+        selected=[],
+    )
 
 
 def get_time_extremes(extreme_select, selected_publishers=None):
@@ -276,14 +457,40 @@ def get_time_extremes(extreme_select, selected_publishers=None):
     return extreme_value
 
 
+def get_cross_filter(dimension):
+    """Get the publishers or timespan picked on a chart, or None if nothing is picked or it was
+    picked on the output being built"""
+    active_filter = cross_filter.get()
+    if active_filter[dimension] is None or (
+        active_filter[dimension + "_Source"] == building_output["Output_ID"]
+    ):
+        return None
+    return active_filter[dimension]
+
+
+def get_output_view(output_id, get_view):
+    """Call get_view as though building output_id, so the cross filter picks made on it are left out"""
+    previous_output_id = building_output["Output_ID"]
+    building_output["Output_ID"] = output_id
+    try:
+        return get_view()
+    finally:
+        building_output["Output_ID"] = previous_output_id
+
+
 def get_selecteddate_timeextremes(extreme_select):
-    """Get the upper and lower bounds of the selected timespan"""
+    """Get the upper and lower bounds of the selected timespan, narrowed to any timespan picked on a chart"""
+    cross_period = get_cross_filter("Period")
     if extreme_select == "Newest":
         selected_end_time = input.daterange()[1]
         dt_value = datetime.datetime.strptime(str(selected_end_time), "%Y-%m-%d")
+        if cross_period is not None:
+            dt_value = min(dt_value, cross_period[1])
     elif extreme_select == "Oldest":
         selected_start_time = input.daterange()[0]
         dt_value = datetime.datetime.strptime(str(selected_start_time), "%Y-%m-%d")
+        if cross_period is not None:
+            dt_value = max(dt_value, cross_period[0])
     else:
         raise ValueError("Not a valid extreme option. Need 'Newest' or 'Oldest'")
     return dt_value
@@ -298,8 +505,13 @@ def get_selected_timespan_months_list():
 
 def get_selected_timespan_year_bins():
     """Get a list of start and end dates for filtering out publications"""
-    selected_start_time = get_selecteddate_timeextremes("Oldest")
-    selected_end_time = get_selecteddate_timeextremes("Newest")
+    return get_timespan_year_bins(
+        get_selecteddate_timeextremes("Oldest"), get_selecteddate_timeextremes("Newest")
+    )
+
+
+def get_timespan_year_bins(selected_start_time, selected_end_time):
+    """Get a list of start and end dates splitting a timespan into the selected year designation"""
     start_date_dti = pd.DatetimeIndex([selected_start_time]).to_list()[0]
     end_date_dti = pd.DatetimeIndex([selected_end_time]).to_list()[0]
     if str(input.radio()) == "1":
@@ -319,6 +531,9 @@ def get_selected_timespan_year_bins():
         ).to_list()
     else:
         raise ValueError("Not a valid year designation option")
+    if not x_axis_dates:
+        # A timespan picked inside one year has no year start to split it at
+        x_axis_dates = [start_date_dti, end_date_dti]
     if x_axis_dates[0] > start_date_dti:
         x_axis_dates.insert(0, start_date_dti)
     elif x_axis_dates[0] < start_date_dti:
@@ -334,7 +549,7 @@ def get_selected_timespan_year_bins():
 @reactive.event(input.alltime, ignore_none=True)
 def change_timespan_all():
     """Change selected timepsan so the entire timespan includes all publications that have been recorded"""
-    req(input.file1())
+    load_session_dataset()
     newest_global_dt = get_time_extremes("Newest")
     oldest_global_dt = get_time_extremes("Oldest")
     ui.update_date_range("daterange", start=oldest_global_dt, end=newest_global_dt)
@@ -343,24 +558,27 @@ def change_timespan_all():
 @reactive.effect
 # @reactive.event(input.groupselector, ignore_none=True)
 def change_selected_authors():
-    """Change selected publishers so the only selected ones are still employed at NYIT"""
-    req(input.file1())
-    author_list = []
-    if str(input.groupselector()) == "('Still at NYIT',)":
-        for author_data in publish_data_dict.values():
-            if author_data["Currently_at_NYIT"] is True:
-                author_list.append(author_data["Display_Name"])
-
-    elif str(input.groupselector()) == "('All',)":
-        for author_data in publish_data_dict.values():
-            author_list.append(author_data["Display_Name"])
-    ui.update_checkbox_group("selectauthor", selected=author_list)
+    """Change selected publishers to everyone in the checked cohorts"""
+    cohort_members = get_cohort_members(load_session_dataset())
+    author_list = {}
+    for each_cohort in input.groupselector():
+        for each_publisher in cohort_members.get(each_cohort, []):
+            author_list[publish_data_dict[each_publisher]["Display_Name"]] = None
+    ui.update_checkbox_group("selectauthor", selected=list(author_list))
 
 
 def get_selected_publishers(lname=True, allnames=False):
-    """Get a list with the names of all the selected publishers"""
+    """Get a list with the names of all the selected publishers, narrowed to any publishers picked on a chart"""
+    load_session_dataset()
     if allnames is False:
         selected_names = input.selectauthor()
+        cross_publishers = get_cross_filter("Publishers")
+        if cross_publishers is not None:
+            selected_names = [
+                each_name
+                for each_name in selected_names
+                if each_name.split(",")[0] in cross_publishers
+            ]
     else:
         publisher_raw_data = read_in_file_publisher_data()
         selected_names_temp = create_publisher_tuplelist(
@@ -374,226 +592,164 @@ def get_selected_publishers(lname=True, allnames=False):
     return selected_names_list
 
 
-def calculate_time_relevant_data(dates_only=True):
-    """Get relevant data list corresponding to the selected publishers in the selected timespan"""
-    selected_names = get_selected_publishers(lname=True, allnames=False)
-    dt_start = get_selecteddate_timeextremes("Oldest")
-    dt_end = get_selecteddate_timeextremes("Newest")
-    total_publication_list = []
-    total_publication_list_datesonly = []
-    for each_selected_publisher in selected_names:
-        total_publication_list = total_publication_list + list(
-            publish_data_dict[each_selected_publisher]["Author_Publications"]
-        )
-    total_publication_list = sorted(total_publication_list, key=lambda x: x[0])
-    # Filter out publications not in selected time range
-    eliminate_list = []
-    for each_pub in total_publication_list:
-        if (each_pub[0] < dt_start) or (each_pub[0] > dt_end):
-            eliminate_list.append(each_pub)
-    for each_val in eliminate_list:
-        while each_val in total_publication_list:
-            total_publication_list.remove(each_val)
-    for each_pub in total_publication_list:
-        total_publication_list_datesonly.append(each_pub[0])
-    if dates_only:
-        return total_publication_list_datesonly
+def get_venue_filter_mask(publication_table):
+    """Flag the publications in the venues chosen in the venue filter, or None when no venue is chosen"""
+    selected_venues = input.venue_filter()
+    if not selected_venues:
+        return None
+    return get_venue_mask(publication_table, selected_venues)
+
+
+def get_view_publication_filter(publication_table):
+    """Flag the publications in the selected venues and the selected timespan, narrowed to any timespan picked on a chart"""
+    publication_dates = publication_table["Dates"]
+    view_filter = (
+        publication_dates >= np.datetime64(get_selecteddate_timeextremes("Oldest"))
+    ) & (publication_dates <= np.datetime64(get_selecteddate_timeextremes("Newest")))
+    venue_filter_mask = get_venue_filter_mask(publication_table)
+    if venue_filter_mask is not None:
+        view_filter &= venue_filter_mask
+    return view_filter
+
+
+def get_count_mode():
+    """Get how publications are counted. Fractional credit, when on, takes precedence over the count mode,
+    so every chart then counts each publication as 1/k for each of its k department co-authors
+    """
+    if input.fractional_credit():
+        return "Fractional"
+    return str(input.count_mode())
+
+
+def count_view_periods(selected_names, period_edges):
+    """Count the publications in view per period with one mask-and-sum over the attribution matrices,
+    as a periods x publishers matrix along with each period's total in the count mode
+    """
+    publication_table = load_session_dataset()["Publication_Table"]
+    count_mode = get_count_mode()
+    author_counts, department_counts = get_period_count_matrix(
+        publication_table,
+        selected_names,
+        period_edges,
+        get_view_publication_filter(publication_table),
+        fractional_credit=count_mode == "Fractional",
+    )
+    if count_mode != "Unique":
+        # Count each publication once per selected author, as in the per-author lists
+        department_counts = author_counts.sum(axis=1)
+    return author_counts, department_counts
+
+
+def get_view_cohort_totals(publisher_keys):
+    """Get the running totals of a group of publishers for the current venue filter"""
+    dataset = load_session_dataset()
+    venue_mask = get_venue_filter_mask(dataset["Publication_Table"])
+    if venue_mask is None and ingestion_progress.get() >= 1:
+        return get_cohort_totals(dataset, publisher_keys)
+    # Venue filtered totals, and those of a dataset still being attributed, are not materialized
+    return build_cohort_totals(dataset["Publication_Table"], publisher_keys, venue_mask)
+
+
+def count_view_totals(selected_names, period_edges):
+    """Count the selected publishers' publications in view per period in the count mode by looking up
+    their materialized running totals, for charts that only show the totals"""
+    # The view ends on the last selected day, which may fall inside the last period
+    view_edges = np.minimum(
+        np.maximum(
+            np.array(period_edges, dtype="datetime64[ns]"),
+            np.datetime64(get_selecteddate_timeextremes("Oldest"), "ns"),
+        ),
+        np.datetime64(get_selecteddate_timeextremes("Newest"), "ns")
+        + np.timedelta64(1, "ns"),
+    )
+    count_mode = get_count_mode()
+    period_counts = get_cohort_period_counts(
+        get_view_cohort_totals(selected_names), view_edges, count_mode
+    )
+    if count_mode == "Attributed":
+        # Running totals are summed as floats, but attributed counts are whole
+        period_counts = period_counts.astype(np.int64)
+    return period_counts
+
+
+def get_view_publication_weights(publication_table, selected_names):
+    """Get how much each publication in view counts for the selected publishers in the count mode"""
+    count_mode = get_count_mode()
+    if count_mode == "Unique":
+        publication_weights = get_selected_publication_mask(
+            publication_table, selected_names
+        ).astype(np.float64)
+    elif count_mode == "Fractional":
+        publication_weights = publication_table["Credit_Matrix"][
+            :, get_publisher_columns(publication_table, selected_names)
+        ].sum(axis=1, dtype=np.float64)
     else:
-        return total_publication_list
+        publication_weights = count_selected_authors(
+            publication_table, selected_names
+        ).astype(np.float64)
+    return publication_weights * get_view_publication_filter(publication_table)
+
+
+def get_selected_timespan_edges():
+    """Get the start of the selected timespan followed by the day after it ends, as a single period"""
+    return [
+        get_selecteddate_timeextremes("Oldest"),
+        get_selecteddate_timeextremes("Newest") + datetime.timedelta(days=1),
+    ]
 
 
+@timed()
 def determine_pubcounts():
-    """Generate publication lists corresponding to publishers, months, and the sums of each months"""
-    dt_end = get_selecteddate_timeextremes("Newest")
-    dt_month_end = datetime.datetime(
-        dt_end.year, dt_end.month, calendar.monthrange(dt_end.year, dt_end.month)[1]
+    """Generate the publication counts of the selected publishers in each month of the selected timespan"""
+    month_counts = count_view_totals(
+        get_selected_publishers(lname=True, allnames=False),
+        get_selected_timespan_month_edges(),
     )
-    x_axis_dates = get_selected_timespan_months_list()
-    total_publication_list = calculate_time_relevant_data(dates_only=False)
-    month_publication_counts = [0] * len(x_axis_dates)
-    for month_index, _ in enumerate(x_axis_dates):
-        for each_pub in total_publication_list:
-            if month_index == len(x_axis_dates) - 1:
-                if (
-                    each_pub[0] >= x_axis_dates[month_index]
-                    and each_pub[0] <= dt_month_end
-                ):
-                    month_publication_counts[month_index] = (
-                        month_publication_counts[month_index] + 1
-                    )
-            else:
-                if (
-                    each_pub[0] >= x_axis_dates[month_index]
-                    and each_pub[0] < x_axis_dates[month_index + 1]
-                ):
-                    month_publication_counts[month_index] = (
-                        month_publication_counts[month_index] + 1
-                    )
     total_pubs_per_month = {
-        "Months": x_axis_dates,
-        "Pub_Counts": month_publication_counts,
+        "Months": get_selected_timespan_months_list(),
+        "Pub_Counts": month_counts.tolist(),
     }
     return total_pubs_per_month
 
 
+@timed()
 def determine_pubs_per_publisher():
     """Determine the amount of publications by publisher in the selected timespan"""
     selected_names = get_selected_publishers(lname=True, allnames=False)
-    total_publication_list = calculate_time_relevant_data(dates_only=False)
-    pub_counts_per_publisher = {}
-    for each_name in selected_names:
-        pub_counts_per_publisher[each_name] = 0
-        name_match = re.compile(each_name, re.IGNORECASE)
-        for each_filtered_pub in total_publication_list:
-            if re.search(name_match, each_filtered_pub[2]) is not None:
-                pub_counts_per_publisher[each_name] += 1
-    return pub_counts_per_publisher
-
-
-def determine_pubs_per_publisher_overtime(all_or_not=False):
-    """Assembles a dictionary where the keys are each publisher and the values are a list of the dates of their publications in the selected timespan"""
-    selected_names = get_selected_publishers(lname=True, allnames=all_or_not)
-    total_publication_list = calculate_time_relevant_data(dates_only=False)
-    pub_counts_per_publisher_over_time = {}
-    for each_name in selected_names:
-        pub_counts_per_publisher_over_time[each_name] = []
-        name_match = re.compile(each_name, re.IGNORECASE)
-        for each_filtered_pub in total_publication_list:
-            if re.search(name_match, each_filtered_pub[2]) is not None:
-                pub_counts_per_publisher_over_time[each_name].append(
-                    each_filtered_pub[0]
-                )
-    return pub_counts_per_publisher_over_time
+    author_counts, _ = count_view_periods(selected_names, get_selected_timespan_edges())
+    return dict(zip(selected_names, author_counts[0].tolist()))
 
 
+@timed()
 def determine_count_sums():
     """Determine the amount of publications by publisher in the selected timespan, but broken down by month"""
     selected_names = get_selected_publishers(lname=True, allnames=False)
-    x_axis_dates = get_selected_timespan_months_list()
-    dt_end = get_selecteddate_timeextremes("Newest")
-    dt_month_end = datetime.datetime(
-        dt_end.year, dt_end.month, calendar.monthrange(dt_end.year, dt_end.month)[1]
+    author_counts, _ = count_view_periods(
+        selected_names, get_selected_timespan_month_edges()
     )
-    total_publication_list = calculate_time_relevant_data(dates_only=False)
-    pub_counts_sums = {}
-    month_publication_counts = [0] * len(x_axis_dates)
-    for each_name in selected_names:
-        pub_counts_sums[each_name] = month_publication_counts.copy()
-    for month_index, _ in enumerate(x_axis_dates):
-        for each_pub in total_publication_list:
-            if month_index == len(x_axis_dates) - 1:
-                if (
-                    each_pub[0] >= x_axis_dates[month_index]
-                    and each_pub[0] <= dt_month_end
-                ):
-                    month_publication_counts[month_index] = (
-                        month_publication_counts[month_index] + 1
-                    )
-                    for each_publisher in selected_names:
-                        name_match = re.compile(each_publisher, re.IGNORECASE)
-                        if re.search(name_match, each_pub[2]) is not None:
-                            pub_counts_sums[each_publisher][month_index] += 1
-            else:
-                if (
-                    each_pub[0] >= x_axis_dates[month_index]
-                    and each_pub[0] < x_axis_dates[month_index + 1]
-                ):
-                    month_publication_counts[month_index] = (
-                        month_publication_counts[month_index] + 1
-                    )
-                    for each_publisher in selected_names:
-                        name_match = re.compile(each_publisher, re.IGNORECASE)
-                        if re.search(name_match, each_pub[2]) is not None:
-                            pub_counts_sums[each_publisher][month_index] += 1
-    return pub_counts_sums
+    return dict(zip(selected_names, author_counts.T.tolist()))
 
 
-def determine_pubs_per_range(
-    date_year_ranges, selected_names, pub_counts_per_publisher_over_time
-):
-    """"""
-    pubs_per_range = {}
-    for range_index, each_range in enumerate(date_year_ranges):
-        if each_range != date_year_ranges[-1]:
-            pubs_per_range[
-                str(date_year_ranges[range_index].year)
-                + " - "
-                + str(date_year_ranges[range_index + 1].year)
-            ] = 0
-            for each_selected_publisher in selected_names:
-                for (
-                    each_selected_publisher_publication
-                ) in pub_counts_per_publisher_over_time[each_selected_publisher]:
-                    if (
-                        each_selected_publisher_publication
-                        >= date_year_ranges[range_index]
-                        and each_selected_publisher_publication
-                        < date_year_ranges[range_index + 1]
-                    ):
-                        pubs_per_range[
-                            str(date_year_ranges[range_index].year)
-                            + " - "
-                            + str(date_year_ranges[range_index + 1].year)
-                        ] += 1
-    return pubs_per_range
+@timed()
+def determine_pubs_per_range(date_year_ranges, selected_names):
+    """Determine the amount of publications by the selected publishers in each timespan"""
+    period_counts = count_view_totals(selected_names, date_year_ranges)
+    return dict(zip(get_period_labels(date_year_ranges), period_counts.tolist()))
 
 
-def determine_pubs_per_faculty_range(
-    date_year_ranges, selected_names, pub_counts_per_publisher_over_time
-):
-    """"""
-    pubs_per_faculty_in_range = {}
-    each_faculty_pubs_in_range = {}
-    for range_index, each_range in enumerate(date_year_ranges):
-        if each_range != date_year_ranges[-1]:
-            pubs_per_faculty_in_range[
-                str(date_year_ranges[range_index].year)
-                + " - "
-                + str(date_year_ranges[range_index + 1].year)
-            ] = {}
-            for each_selected_publisher in selected_names:
-                each_faculty_pubs_in_range[each_selected_publisher] = 0
-                if len(pub_counts_per_publisher_over_time[each_selected_publisher]) > 0:
-                    for (
-                        each_selected_publisher_publication
-                    ) in pub_counts_per_publisher_over_time[each_selected_publisher]:
-                        if (
-                            each_selected_publisher_publication
-                            >= date_year_ranges[range_index]
-                            and each_selected_publisher_publication
-                            < date_year_ranges[range_index + 1]
-                        ):
-                            each_faculty_pubs_in_range[each_selected_publisher] += 1
-            pubs_per_faculty_in_range[
-                str(date_year_ranges[range_index].year)
-                + " - "
-                + str(date_year_ranges[range_index + 1].year)
-            ] = each_faculty_pubs_in_range.copy()
-    return pubs_per_faculty_in_range
-
-
-def determine_each_faculty_pub_in_range(
-    date_year_ranges, selected_names, pub_counts_per_publisher_over_time
-):
-    """"""
-    each_faculty_pubs_in_range = {}
-    for range_index, each_range in enumerate(date_year_ranges):
-        if each_range != date_year_ranges[-1]:
-            for each_selected_publisher in selected_names:
-                each_faculty_pubs_in_range[each_selected_publisher] = 0
-                for (
-                    each_selected_publisher_publication
-                ) in pub_counts_per_publisher_over_time[each_selected_publisher]:
-                    if (
-                        each_selected_publisher_publication
-                        >= date_year_ranges[range_index]
-                        and each_selected_publisher_publication
-                        < date_year_ranges[range_index + 1]
-                    ):
-                        each_faculty_pubs_in_range[each_selected_publisher] += 1
-    return each_faculty_pubs_in_range
+@timed()
+def determine_pubs_per_faculty_range(date_year_ranges, selected_names):
+    """Determine the amount of publications by each selected publisher in each timespan"""
+    author_counts, _ = count_view_periods(selected_names, date_year_ranges)
+    return {
+        each_range: dict(zip(selected_names, period_counts))
+        for each_range, period_counts in zip(
+            get_period_labels(date_year_ranges), author_counts.tolist()
+        )
+    }
 
 
+@timed()
 def determine_facultypubs_dicts(pubs_per_faculty_in_range, selected_names):
     """Determine the amount of publications by faculty in the determined timespans"""
     faculty_pubs_by_faculty = {}
@@ -606,6 +762,7 @@ def determine_facultypubs_dicts(pubs_per_faculty_in_range, selected_names):
     return faculty_pubs_by_faculty
 
 
+@timed()
 def determine_faculty_pubs_percents(pubs_per_faculty_in_range, selected_names):
     """"""
     pubs_per_faculty_percent = {}
@@ -639,6 +796,7 @@ def determine_faculty_pubs_percents(pubs_per_faculty_in_range, selected_names):
     return pubs_per_faculty_percent
 
 
+@timed()
 def determine_med_max_min(med_max_min):
     """Determine the median, maximum, or minimum of the publications of the selected publishers over the selected timespan"""
     all_names = get_selected_publishers(lname=True, allnames=True)
@@ -647,13 +805,8 @@ def determine_med_max_min(med_max_min):
     if len(selected_names) <= 0:
         return
     date_year_ranges = get_selected_timespan_year_bins()
-    pub_counts_per_publisher_over_time = determine_pubs_per_publisher_overtime(
-        all_or_not=True
-    )
     pubs_per_faculty_in_range = determine_pubs_per_faculty_range(
-        date_year_ranges,
-        all_names,
-        pub_counts_per_publisher_over_time,
+        date_year_ranges, all_names
     )
     pubs_per_faculty_percent = determine_faculty_pubs_percents(
         pubs_per_faculty_in_range, all_names
@@ -694,6 +847,7 @@ def determine_med_max_min(med_max_min):
     return med_max_min_values
 
 
+@timed()
 def determine_activity_stats(most_or_least, year_or_month):
     """Determine the most or least active month or year of the selected publishers"""
     if year_or_month not in ["Year", "Month"]:
@@ -751,6 +905,1068 @@ def write_csv_export():
         writer.writerows(export_data)
 
 
+def get_cached_figure(output_id, build_figure, view_key=()):
+    """Return the figure for this output and the current view, only building it if no session has built it yet"""
+    if ingestion_progress.get() < 1:
+        # Partial results of an upload still being attributed are not shared
+        return get_output_view(output_id, build_figure)
+    cache_key = get_output_view(output_id, lambda: get_figure_cache_key(output_id))
+    return get_or_build_figure(
+        cache_key + tuple(view_key),
+        lambda: get_output_view(output_id, build_figure),
+    )
+
+
+def get_figure_cache_key(output_id):
+    """Key an output's figure by the view it shows: the sidebar selection as chosen, and as narrowed
+    by any cross filter picks, since figures are built from either"""
+    return (
+        load_session_dataset()["Dataset_Hash"],
+        output_id,
+        make_selection_hash(input.selectauthor()),
+        make_selection_hash(get_selected_publishers(lname=False)),
+        (
+            str(get_selecteddate_timeextremes("Oldest")),
+            str(get_selecteddate_timeextremes("Newest")),
+        ),
+        str(input.radio()),
+        get_count_mode(),
+        make_selection_hash(input.venue_filter()),
+    )
+
+
+@timed()
+def build_total_over_timespan_figure():
+    """Plot the total amount of publications published from the
+    selected publishers over the selected timespan"""
+    total_pubs_per_month = determine_pubcounts()
+    running_count = 0
+    for time_index in range(len(total_pubs_per_month["Pub_Counts"])):
+        total_pubs_per_month["Pub_Counts"][time_index] += running_count
+        running_count = total_pubs_per_month["Pub_Counts"][time_index]
+
+    graph_data = {
+        "Months": total_pubs_per_month["Months"],
+        "Publication Counts": total_pubs_per_month["Pub_Counts"],
+    }
+    graph_df = pd.DataFrame(graph_data)
+    fig = px.area(graph_df, x="Months", y="Publication Counts")
+    # Dragging brushes a span of months to filter the other charts, which needs points to select
+    fig.update_traces(mode="lines+markers", marker_size=4)
+    fig.update_layout(dragmode="select", selectdirection="h")
+    return fig
+
+
+@timed()
+def build_total_over_timespan_perfaculty_figure():
+    """Plot the total amount of publications published from the
+    selected publishers over the selected timespan, displaying the
+    individual contributions of each publisher stacked"""
+    pub_counts_sums = determine_count_sums()
+    dt_start = get_selecteddate_timeextremes("Oldest")
+    dt_end = get_selecteddate_timeextremes("Newest")
+    x_axis_dates = pd.date_range(dt_start, dt_end, freq="MS").tolist()
+    dt_months = x_axis_dates
+    for each_publisher_sums in pub_counts_sums.values():
+        running_count = 0
+        for time_index in enumerate(each_publisher_sums):
+            each_publisher_sums[time_index[0]] += running_count
+            running_count = each_publisher_sums[time_index[0]]
+
+    pub_month_list = []
+    publisher_list = []
+    pub_count_list = []
+    for index, each_publisher in enumerate(list(pub_counts_sums.keys())):
+        temp_publisher_list = [each_publisher] * len(list(pub_counts_sums.values())[0])
+        publisher_list = publisher_list + temp_publisher_list
+        temp_pubcount_list = list(pub_counts_sums.values())[index]
+        pub_count_list = pub_count_list + temp_pubcount_list
+        temp_pubmonth_list = dt_months
+        pub_month_list = pub_month_list + temp_pubmonth_list
+
+    graph_data = {
+        "Months": pub_month_list,
+        "Publication Counts": pub_count_list,
+        "Publisher": publisher_list,
+    }
+
+    graph_df = pd.DataFrame(graph_data)
+    fig = px.area(
+        graph_df,
+        x="Months",
+        y="Publication Counts",
+        color="Publisher",
+    )
+    return fig
+
+
+@timed()
+def build_proportional_breakdown_figure():
+    """Plot the percentage proportional breakdown of the total amount of
+    publications published from the selected publishers over the selected timespan
+    """
+    labels = []
+    sizes = []
+    pub_counts_per_publisher = determine_pubs_per_publisher()
+    for each_name, each_count in pub_counts_per_publisher.items():
+        labels.append(each_name)
+        sizes.append(each_count)
+
+    graph_data = {"Publisher": labels, "Publications": sizes}
+    graph_df = pd.DataFrame(graph_data)
+    fig = px.pie(
+        graph_df,
+        values="Publications",
+        names="Publisher",
+    )
+    return fig
+
+
+@timed()
+def build_publication_frequency_figure():
+    """Plot the frequency of publications published from the
+    selected publishers over the selected timespan"""
+    total_pubs_per_month = determine_pubcounts()
+    graph_df = pd.DataFrame(
+        {
+            "Months": [
+                each_month.strftime("%Y-%m")
+                for each_month in total_pubs_per_month["Months"]
+            ],
+            "Publications": total_pubs_per_month["Pub_Counts"],
+        }
+    )
+    fig = px.histogram(
+        graph_df,
+        x="Months",
+        y="Publications",
+        histfunc="sum",
+        nbins=len(graph_df),
+        labels={"Months": "Month"},
+    )
+    return fig
+
+
+@timed()
+def build_plot_pub_per_year_figure():
+    """plot each timespan's amount of publications"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    date_year_ranges = get_selected_timespan_year_bins()
+
+    pubs_per_range = determine_pubs_per_range(date_year_ranges, selected_names)
+
+    years_list = list(pubs_per_range.keys())
+    counts_list = list(pubs_per_range.values())
+    graph_df = pd.DataFrame({"Year": years_list, "Count": counts_list})
+
+    fig = px.bar(graph_df, x="Year", y="Count")
+    fig.update_xaxes(tickangle=90)
+    return fig
+
+
+@timed()
+def build_plot_pubs_per_faculty_figure():
+    """plot each timespan's amount of publications broken up by selected faculty"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    date_year_ranges = get_selected_timespan_year_bins()
+
+    pubs_per_faculty_in_range = determine_pubs_per_faculty_range(
+        date_year_ranges, selected_names
+    )
+
+    publishers_list = []
+    year_count_list = []
+    year_span_list = []
+
+    for (
+        each_timespan,
+        counts_broken_down,
+    ) in pubs_per_faculty_in_range.items():
+        for each_publisher in counts_broken_down.keys():
+            publishers_list.append(each_publisher)
+            year_count_list.append(counts_broken_down[each_publisher])
+            year_span_list.append(each_timespan)
+
+    graph_df = pd.DataFrame(
+        {
+            "Year": year_span_list,
+            "Count": year_count_list,
+            "Publisher": publishers_list,
+        }
+    )
+
+    fig = px.bar(graph_df, x="Year", y="Count", color="Publisher")
+    fig.update_xaxes(tickangle=90)
+    return fig
+
+
+@timed()
+def build_plot_faculty_productivity_stacked_figure():
+    """Plot the efficiency of selected publishers in combination to display entire department productivity"""
+    selected_names = get_selected_publishers(True)
+    date_year_ranges = get_selected_timespan_year_bins()
+
+    pubs_per_faculty_in_range = determine_pubs_per_faculty_range(
+        date_year_ranges, selected_names
+    )
+    pubs_per_faculty_percent = determine_faculty_pubs_percents(
+        pubs_per_faculty_in_range, selected_names
+    )
+
+    publishers_list = []
+    year_efficiency_list = []
+    year_span_list = []
+
+    for (
+        each_publisher,
+        each_percent_list,
+    ) in pubs_per_faculty_percent.items():
+        for timespan_index, each_timespan in enumerate(
+            pubs_per_faculty_in_range.keys()
+        ):
+            publishers_list.append(each_publisher)
+            year_efficiency_list.append(each_percent_list[timespan_index])
+            year_span_list.append(each_timespan)
+
+    graph_df = pd.DataFrame(
+        {
+            "Year": year_span_list,
+            "Efficiency": year_efficiency_list,
+            "Publisher": publishers_list,
+        }
+    )
+
+    fig = px.bar(graph_df, x="Year", y="Efficiency", color="Publisher")
+    fig.update_xaxes(tickangle=90)
+    return fig
+
+
+@timed()
+def build_plot_faculty_productivity_sidebyside_figure():
+    """Plot the efficiency of selected publishers side-by-side for comparison purposes"""
+    selected_names = get_selected_publishers(True)
+    if len(selected_names) > 1:
+        selected_names = selected_names[0:1]
+    date_year_ranges = get_selected_timespan_year_bins()
+
+    pubs_per_faculty_in_range = determine_pubs_per_faculty_range(
+        date_year_ranges, selected_names
+    )
+    pubs_per_faculty_percent = determine_faculty_pubs_percents(
+        pubs_per_faculty_in_range, selected_names
+    )
+
+    pubs_per_faculty_percent.update(determine_med_max_min("Median"))
+
+    pubs_per_faculty_percent.update(determine_med_max_min("Maximum"))
+
+    publishers_list = []
+    year_efficiency_list = []
+    year_span_list = []
+
+    for (
+        each_publisher,
+        each_percent_list,
+    ) in pubs_per_faculty_percent.items():
+        for timespan_index, each_timespan in enumerate(
+            pubs_per_faculty_in_range.keys()
+        ):
+            publishers_list.append(each_publisher)
+            year_efficiency_list.append(each_percent_list[timespan_index])
+            year_span_list.append(each_timespan)
+
+    graph_df = pd.DataFrame(
+        {
+            "Year": year_span_list,
+            "Efficiency": year_efficiency_list,
+            "Publisher": publishers_list,
+        }
+    )
+
+    fig = px.bar(
+        graph_df,
+        x="Year",
+        y="Efficiency",
+        color="Publisher",
+        barmode="group",
+    )
+    fig.update_xaxes(tickangle=90)
+    return fig
+
+
+def get_selected_timespan_month_edges():
+    """Get the start date of each month in the selected timespan followed by the day after its last month ends"""
+    dt_end = get_selecteddate_timeextremes("Newest")
+    dt_month_end = datetime.datetime(
+        dt_end.year, dt_end.month, calendar.monthrange(dt_end.year, dt_end.month)[1]
+    )
+    return get_selected_timespan_months_list() + [
+        dt_month_end + datetime.timedelta(days=1)
+    ]
+
+
+def get_rolling_window_months():
+    """Get the rolling window length in months, at least one month"""
+    window_months = input.rolling_months()
+    return max(int(window_months), 1) if window_months else 1
+
+
+@timed()
+def build_rolling_publication_rate_figure():
+    """Plot the average monthly publication rate over a trailing window of months
+    for the department and each selected publisher"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    month_edges = get_selected_timespan_month_edges()
+    author_counts, department_counts = count_view_periods(selected_names, month_edges)
+    rolling_rates = rolling_window_rate(
+        np.column_stack([department_counts, author_counts]),
+        get_rolling_window_months(),
+    )
+    month_starts = month_edges[:-1]
+    graph_df = pd.DataFrame(
+        {
+            "Months": month_starts * rolling_rates.shape[1],
+            "Publications Per Month": rolling_rates.T.ravel(),
+            "Publisher": np.repeat(["Department"] + selected_names, len(month_starts)),
+        }
+    )
+    fig = px.line(graph_df, x="Months", y="Publications Per Month", color="Publisher")
+    return fig
+
+
+@timed()
+def build_plot_faculty_trends_figure():
+    """Plot each selected publisher's publications per timespan with a fitted trend line
+    extended into the next timespans"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    date_year_ranges = get_selected_timespan_year_bins()
+    author_counts, _ = count_view_periods(selected_names, date_year_ranges)
+    slopes, trend_values = fit_linear_trends(author_counts, TREND_PROJECTION_PERIODS)
+    period_labels = get_period_labels(date_year_ranges)
+    last_start_year = date_year_ranges[-2].year if len(date_year_ranges) > 1 else 0
+    projected_labels = [
+        str(last_start_year + projection_index)
+        + " - "
+        + str(last_start_year + projection_index + 1)
+        + " (projected)"
+        for projection_index in range(1, TREND_PROJECTION_PERIODS + 1)
+    ]
+    publisher_labels = [
+        f"{each_name} ({slopes[name_index]:+.2f}/period)"
+        for name_index, each_name in enumerate(selected_names)
+    ]
+    graph_df = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "Year": period_labels * len(selected_names),
+                    "Count": author_counts.T.ravel(),
+                    "Publisher": np.repeat(publisher_labels, len(period_labels)),
+                    "Series": "Publications",
+                }
+            ),
+            pd.DataFrame(
+                {
+                    "Year": (period_labels + projected_labels) * len(selected_names),
+                    # Counts cannot fall below zero
+                    "Count": np.maximum(trend_values, 0).T.ravel(),
+                    "Publisher": np.repeat(
+                        publisher_labels, len(period_labels) + len(projected_labels)
+                    ),
+                    "Series": "Trend",
+                }
+            ),
+        ]
+    )
+    fig = px.line(
+        graph_df,
+        x="Year",
+        y="Count",
+        color="Publisher",
+        line_dash="Series",
+        markers=True,
+    )
+    fig.update_xaxes(tickangle=90)
+    return fig
+
+
+def get_period_labels(date_year_ranges):
+    """Label each timespan by its start and end years"""
+    return [
+        str(date_year_ranges[range_index].year)
+        + " - "
+        + str(date_year_ranges[range_index + 1].year)
+        for range_index in range(len(date_year_ranges) - 1)
+    ]
+
+
+def get_research_percent_matrix(selected_names, date_year_ranges):
+    """Get each selected publisher's research percent for the start year of every timespan, 0 if unrecorded"""
+    return np.array(
+        [
+            [
+                publish_data_dict[each_name]["Research_Percents"].get(
+                    date_year_ranges[range_index].year, 0
+                )
+                for each_name in selected_names
+            ]
+            for range_index in range(len(date_year_ranges) - 1)
+        ],
+        dtype=float,
+    ).reshape(max(len(date_year_ranges) - 1, 0), len(selected_names))
+
+
+@timed()
+def build_growth_heatmap_figure():
+    """Plot each selected publisher's publications or efficiency per timespan as a heatmap,
+    or the change from each timespan to the next"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    req(selected_names)
+    date_year_ranges = get_selected_timespan_year_bins()
+    author_counts, _ = count_view_periods(selected_names, date_year_ranges)
+    heatmap_values = author_counts
+    if input.heatmap_measure() == "Efficiency":
+        heatmap_values = get_efficiency_matrix(
+            author_counts,
+            get_research_percent_matrix(selected_names, date_year_ranges),
+        )
+    period_labels = get_period_labels(date_year_ranges)
+    color_label = str(input.heatmap_measure())
+    color_options = {"color_continuous_scale": "Blues"}
+    if input.heatmap_change():
+        # The first timespan has nothing to change from
+        heatmap_values = get_period_changes(heatmap_values)
+        period_labels = period_labels[1:]
+        color_label += " Change"
+        color_options = {
+            "color_continuous_scale": "RdBu",
+            "color_continuous_midpoint": 0,
+        }
+    fig = px.imshow(
+        heatmap_values.T,
+        x=period_labels,
+        y=[
+            publish_data_dict[each_name]["Display_Name"] for each_name in selected_names
+        ],
+        labels={"x": "Year", "y": "Publisher", "color": color_label},
+        aspect="auto",
+        **color_options,
+    )
+    fig.update_xaxes(tickangle=90, type="category")
+    fig.update_yaxes(type="category")
+    return fig
+
+
+def get_comparison_side(side):
+    """Get the publishers and year bins of one side of the comparison, using the sidebar selection
+    when no authors are chosen for it"""
+    display_names = input["compare_authors_" + side]() or input.selectauthor()
+    req(display_names)
+    selected_start_time, selected_end_time = input["compare_daterange_" + side]()
+    req(selected_start_time, selected_end_time)
+    req(selected_start_time < selected_end_time)
+    return [each_name.split(",")[0] for each_name in display_names], (
+        get_timespan_year_bins(
+            datetime.datetime.combine(selected_start_time, datetime.time()),
+            datetime.datetime.combine(selected_end_time, datetime.time()),
+        )
+    )
+
+
+@timed()
+def calculate_comparison_side(side):
+    """Count one side of the comparison per timespan and per publisher from every publisher's running
+    totals, taken in one pass over the side's publications"""
+    selected_names, date_year_ranges = get_comparison_side(side)
+    publication_table = load_session_dataset()["Publication_Table"]
+    author_totals = build_author_totals(
+        publication_table,
+        selected_names,
+        get_venue_filter_mask(publication_table),
+    )
+    count_mode = get_count_mode()
+    author_mode = "Fractional" if count_mode == "Fractional" else "Attributed"
+    author_counts = get_cohort_period_counts(
+        author_totals, date_year_ranges, author_mode
+    )
+    if count_mode == "Unique":
+        period_counts = get_cohort_period_counts(author_totals, date_year_ranges)
+    else:
+        period_counts = get_cohort_period_counts(
+            author_totals, date_year_ranges, count_mode
+        ).sum(axis=1)
+    author_efficiency = get_mean_efficiency(
+        author_counts, get_research_percent_matrix(selected_names, date_year_ranges)
+    )
+    return {
+        "Names": selected_names,  # Publisher keys of this side - List of Strings
+        "Period_Labels": get_period_labels(
+            date_year_ranges
+        ),  # Timespans - List of Strings
+        "Period_Counts": period_counts,  # Whole selection per timespan - Array
+        "Author_Counts": author_counts.sum(axis=0),  # Per publisher - Array
+        "Author_Efficiency": author_efficiency,  # Mean per publisher - Array
+    }
+
+
+@reactive.calc
+def comparison_side_a():
+    """Side A of the comparison, counted once for every output showing it"""
+    return calculate_comparison_side("a")
+
+
+@reactive.calc
+def comparison_side_b():
+    """Side B of the comparison, counted once for every output showing it"""
+    return calculate_comparison_side("b")
+
+
+def get_comparison_sides():
+    """Get both sides of the comparison keyed by side"""
+    return {"a": comparison_side_a(), "b": comparison_side_b()}
+
+
+def get_comparison_view_key():
+    """Key the comparison figures by both sides' authors, falling back to the sidebar selection
+    as the sides do, and date ranges"""
+    return tuple(
+        (
+            make_selection_hash(
+                input["compare_authors_" + each_side]() or input.selectauthor()
+            ),
+            tuple(
+                str(each_date)
+                for each_date in input["compare_daterange_" + each_side]()
+            ),
+        )
+        for each_side in ["a", "b"]
+    )
+
+
+@timed()
+def build_comparison_periods_figure():
+    """Plot both sides' publications per timespan, aligned by timespan number, with the change from A to B"""
+    comparison_sides = get_comparison_sides()
+    shared_periods = min(
+        len(each_side["Period_Counts"]) for each_side in comparison_sides.values()
+    )
+    graph_rows = []
+    for each_side, side_data in comparison_sides.items():
+        for period_index, each_count in enumerate(side_data["Period_Counts"]):
+            graph_rows.append(
+                {
+                    "Timespan": period_index + 1,
+                    "Publications": each_count,
+                    "Series": each_side.upper(),
+                    "Years": side_data["Period_Labels"][period_index],
+                }
+            )
+    for period_index in range(shared_periods):
+        graph_rows.append(
+            {
+                "Timespan": period_index + 1,
+                "Publications": comparison_sides["b"]["Period_Counts"][period_index]
+                - comparison_sides["a"]["Period_Counts"][period_index],
+                "Series": "Change (B - A)",
+                "Years": comparison_sides["a"]["Period_Labels"][period_index]
+                + " to "
+                + comparison_sides["b"]["Period_Labels"][period_index],
+            }
+        )
+    fig = px.bar(
+        pd.DataFrame(graph_rows),
+        x="Timespan",
+        y="Publications",
+        color="Series",
+        barmode="group",
+        hover_data=["Years"],
+    )
+    fig.update_xaxes(type="category")
+    return fig
+
+
+def get_comparison_author_table():
+    """Tabulate each publisher on either side with their publications and efficiency on both, and the change"""
+    comparison_sides = get_comparison_sides()
+    author_rows = {}
+    for each_side, side_data in comparison_sides.items():
+        for name_index, each_name in enumerate(side_data["Names"]):
+            author_row = author_rows.setdefault(
+                each_name,
+                {"Author": publish_data_dict[each_name]["Display_Name"]},
+            )
+            author_row[each_side.upper() + " Publications"] = round(
+                float(side_data["Author_Counts"][name_index]), 2
+            )
+            author_row[each_side.upper() + " Efficiency"] = round(
+                float(side_data["Author_Efficiency"][name_index]), 2
+            )
+    author_table = pd.DataFrame(
+        list(author_rows.values()),
+        columns=[
+            "Author",
+            "A Publications",
+            "B Publications",
+            "A Efficiency",
+            "B Efficiency",
+        ],
+    )
+    author_table.insert(
+        3,
+        "Publication Change",
+        (author_table["B Publications"] - author_table["A Publications"]).round(2),
+    )
+    author_table["Efficiency Change"] = (
+        author_table["B Efficiency"] - author_table["A Efficiency"]
+    ).round(2)
+    return author_table
+
+
+def set_cross_filter(dimension, picked_value, source_output):
+    """Narrow the other charts to publishers or a timespan picked on source_output,
+    or drop the pick when the same one is made again"""
+    with reactive.isolate():
+        active_filter = dict(cross_filter.get())
+    if (
+        active_filter[dimension] == picked_value
+        and active_filter[dimension + "_Source"] == source_output
+    ):
+        picked_value = None
+    active_filter[dimension] = picked_value
+    active_filter[dimension + "_Source"] = (
+        None if picked_value is None else source_output
+    )
+    cross_filter.set(active_filter)
+
+
+def filter_by_clicked_period(trace, points, state):
+    """Narrow the other charts to the timespan whose bar was clicked"""
+    if not points.point_inds:
+        return
+    date_year_ranges = get_output_view(
+        "plot_pub_per_year", get_selected_timespan_year_bins
+    )
+    period_labels = get_period_labels(date_year_ranges)
+    clicked_label = trace.x[points.point_inds[0]]
+    if clicked_label not in period_labels:
+        return
+    range_index = period_labels.index(clicked_label)
+    period_end = pd.Timestamp(date_year_ranges[range_index + 1])
+    if range_index + 2 < len(date_year_ranges):
+        # Each timespan ends the day before the next one starts
+        period_end -= pd.Timedelta(days=1)
+    set_cross_filter(
+        "Period",
+        (
+            pd.Timestamp(date_year_ranges[range_index]).to_pydatetime(),
+            period_end.to_pydatetime(),
+        ),
+        "plot_pub_per_year",
+    )
+
+
+def filter_by_clicked_publisher(trace, points, state):
+    """Narrow the other charts to the publisher whose slice was clicked"""
+    if points.point_inds and trace.labels[points.point_inds[0]] in publish_data_dict:
+        set_cross_filter(
+            "Publishers",
+            (trace.labels[points.point_inds[0]],),
+            "proportional_breakdown",
+        )
+
+
+def filter_by_selected_months(trace, points, state):
+    """Narrow the other charts to the months clicked or brushed on the total over time"""
+    if not points.point_inds:
+        return
+    selected_months = [
+        pd.Timestamp(trace.x[each_index]) for each_index in points.point_inds
+    ]
+    set_cross_filter(
+        "Period",
+        (
+            min(selected_months).to_pydatetime(),
+            (max(selected_months) + pd.offsets.MonthEnd(0)).to_pydatetime(),
+        ),
+        "total_over_timespan",
+    )
+
+
+def clear_selected_months(trace, points):
+    """Drop the timespan brushed on the total over time once its selection is cleared"""
+    with reactive.isolate():
+        active_filter = cross_filter.get()
+    if active_filter["Period_Source"] == "total_over_timespan":
+        set_cross_filter("Period", None, "total_over_timespan")
+
+
+def register_cross_filter_handlers(figure_widget, pick_handler):
+    """Let every trace of a displayed chart narrow the other charts. Plotly calls the handler for every
+    trace, including those without a picked point, and each call replaces the trace's earlier handler
+    """
+    for each_trace in figure_widget.data:
+        each_trace.on_click(pick_handler)
+        each_trace.on_selection(pick_handler)
+        if pick_handler is filter_by_selected_months:
+            each_trace.on_deselect(clear_selected_months)
+
+
+@reactive.effect
+@reactive.event(input.clear_cross_filter, dataset_source)
+def clear_cross_filter():
+    """Drop every chart pick for the clear button or a new dataset"""
+    cross_filter.set(
+        {
+            "Publishers": None,
+            "Publishers_Source": None,
+            "Period": None,
+            "Period_Source": None,
+        }
+    )
+
+
+@reactive.effect
+def drop_stale_cross_filter():
+    """Drop chart picks the sidebar no longer includes, so no chart is narrowed to nothing"""
+    selected_keys = {each_name.split(",")[0] for each_name in input.selectauthor()}
+    req(input.daterange())
+    selected_start_time, selected_end_time = input.daterange()
+    req(selected_start_time, selected_end_time)
+    with reactive.isolate():
+        active_filter = cross_filter.get()
+    if active_filter["Publishers"] is not None and not (
+        selected_keys & set(active_filter["Publishers"])
+    ):
+        set_cross_filter("Publishers", None, active_filter["Publishers_Source"])
+    if active_filter["Period"] is not None and (
+        active_filter["Period"][0].date() > selected_end_time
+        or active_filter["Period"][1].date() < selected_start_time
+    ):
+        set_cross_filter("Period", None, active_filter["Period_Source"])
+
+
+def get_cross_filter_summary():
+    """Describe the chart picks and count the publications left in view straight from the attribution
+    matrices, so a click never materializes totals for a one-off selection"""
+    active_filter = cross_filter.get()
+    picked_parts = []
+    if active_filter["Publishers"] is not None:
+        picked_parts.append(
+            ", ".join(
+                publish_data_dict[each_publisher]["Display_Name"]
+                for each_publisher in active_filter["Publishers"]
+                if each_publisher in publish_data_dict
+            )
+        )
+    if active_filter["Period"] is not None:
+        picked_parts.append(
+            active_filter["Period"][0].strftime("%Y-%m-%d")
+            + " to "
+            + active_filter["Period"][1].strftime("%Y-%m-%d")
+        )
+    if not picked_parts:
+        return "Click a year's bar, a publisher's slice or a span of Total Over Time to filter the other charts"
+    period_count = count_view_totals(
+        get_selected_publishers(lname=True), get_selected_timespan_edges()
+    ).sum()
+    return (
+        f"**Filtered to:** {' | '.join(picked_parts)} &nbsp; "
+        f"**Publications:** {round(float(period_count), 2):g}"
+    )
+
+
+def open_author_drilldown(trace, points, state):
+    """Open the drilldown of the publisher whose bar was clicked. Plotly calls this for every trace,
+    including those without a clicked point"""
+    if points.point_inds and trace.name in publish_data_dict:
+        ui.update_select("drilldown_author", selected=trace.name)
+        ui.update_navs("tab", selected="Author Drilldown")
+
+
+@reactive.calc
+def drilldown_rows():
+    """Get the drilldown publisher's rows of the publication table, newest first"""
+    req(dataset_ready())
+    req(input.drilldown_author() in publish_data_dict)
+    return get_author_rows(
+        publish_data_dict,
+        load_session_dataset()["Publication_Table"],
+        input.drilldown_author(),
+    )
+
+
+@reactive.effect
+@reactive.event(input.drilldown_author)
+def reset_drilldown_page():
+    """Start a newly opened publisher's publication list on its first page"""
+    drilldown_page.set(0)
+
+
+@reactive.effect
+@reactive.event(input.drilldown_previous)
+def show_previous_drilldown_page():
+    """Move the publication list back a page"""
+    drilldown_page.set(max(drilldown_page.get() - 1, 0))
+
+
+@reactive.effect
+@reactive.event(input.drilldown_next)
+def show_next_drilldown_page():
+    """Move the publication list forward a page, stopping at the last one"""
+    last_page = max((len(drilldown_rows()) - 1) // DRILLDOWN_PAGE_SIZE, 0)
+    drilldown_page.set(min(drilldown_page.get() + 1, last_page))
+
+
+@timed()
+def build_drilldown_timeline_figure():
+    """Plot the drilldown publisher's publications per calendar year"""
+    timeline_years, timeline_counts = get_author_timeline(
+        load_session_dataset()["Publication_Table"], drilldown_rows()
+    )
+    fig = px.bar(
+        pd.DataFrame({"Year": timeline_years, "Publications": timeline_counts}),
+        x="Year",
+        y="Publications",
+    )
+    fig.update_xaxes(type="category", tickangle=90)
+    return fig
+
+
+@timed()
+def build_cohort_comparison_figure():
+    """Plot each compared cohort's publications per timespan from its materialized totals"""
+    compared_cohorts = input.compare_cohorts()
+    req(compared_cohorts)
+    cohort_members = get_cohort_members(load_session_dataset())
+    date_year_ranges = get_selected_timespan_year_bins()
+    period_labels = get_period_labels(date_year_ranges)
+    cohort_counts = [
+        get_cohort_period_counts(
+            get_view_cohort_totals(cohort_members[each_cohort]),
+            date_year_ranges,
+            get_count_mode(),
+        )
+        for each_cohort in compared_cohorts
+    ]
+    graph_df = pd.DataFrame(
+        {
+            "Year": period_labels * len(compared_cohorts),
+            "Publications": np.concatenate(cohort_counts),
+            "Cohort": np.repeat(list(compared_cohorts), len(period_labels)),
+        }
+    )
+    fig = px.line(graph_df, x="Year", y="Publications", color="Cohort", markers=True)
+    fig.update_xaxes(tickangle=90, type="category")
+    return fig
+
+
+@timed()
+def build_venue_breakdown_figure():
+    """Plot the venues the selected publishers published in over the selected timespan, most frequent first"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    publication_table = load_session_dataset()["Publication_Table"]
+    venue_weights = get_view_publication_weights(publication_table, selected_names)
+    venue_codes = publication_table["Venue_Codes"]
+    venue_counts = np.bincount(
+        venue_codes[venue_codes >= 0],
+        weights=venue_weights[venue_codes >= 0],
+        minlength=len(publication_table["Venue_Names"]),
+    )
+    top_venues = np.argsort(-venue_counts, kind="stable")[:VENUE_BREAKDOWN_LIMIT]
+    top_venues = top_venues[venue_counts[top_venues] > 0]
+    graph_df = pd.DataFrame(
+        {
+            "Venue": publication_table["Venue_Names"][top_venues],
+            "Publications": venue_counts[top_venues],
+        }
+    )
+    unparsed_count = venue_weights[venue_codes < 0].sum()
+    if unparsed_count:
+        graph_df.loc[len(graph_df)] = ["Unparsed Citation", unparsed_count]
+    fig = px.bar(graph_df, x="Publications", y="Venue", orientation="h")
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+@timed()
+def build_summary_report_tables():
+    """Collect the aggregates behind the charts for the selected publishers, range and designation,
+    as sheet title -> (header row, row generator)"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    display_names = [
+        publish_data_dict[each_name]["Display_Name"] for each_name in selected_names
+    ]
+    total_pubs_per_month = determine_pubcounts()
+    pub_counts_sums = determine_count_sums()
+    date_year_ranges = get_selected_timespan_year_bins()
+    pubs_per_range = determine_pubs_per_range(date_year_ranges, selected_names)
+    pubs_per_faculty_in_range = determine_pubs_per_faculty_range(
+        date_year_ranges, selected_names
+    )
+    faculty_pubs_by_faculty = determine_facultypubs_dicts(
+        pubs_per_faculty_in_range, selected_names
+    )
+    pubs_per_faculty_percent = determine_faculty_pubs_percents(
+        pubs_per_faculty_in_range, selected_names
+    )
+    pub_counts_per_publisher = determine_pubs_per_publisher()
+    report_tables = {
+        "Monthly Counts": (
+            ["Month", "Publications"],
+            iter_wide_rows(
+                total_pubs_per_month["Months"], [total_pubs_per_month["Pub_Counts"]]
+            ),
+        ),
+        "Monthly Counts Per Faculty": (
+            ["Month"] + display_names,
+            iter_wide_rows(
+                total_pubs_per_month["Months"],
+                [pub_counts_sums[each_name] for each_name in selected_names],
+            ),
+        ),
+        "Publications Per Faculty": (
+            ["Publisher", "Publications"],
+            iter_wide_rows(
+                display_names,
+                [[pub_counts_per_publisher[each_name] for each_name in selected_names]],
+            ),
+        ),
+        "Period Counts": (
+            ["Period", "Publications"],
+            iter_wide_rows(
+                list(pubs_per_range.keys()), [list(pubs_per_range.values())]
+            ),
+        ),
+        "Period Counts Per Faculty": (
+            ["Period"] + display_names,
+            iter_wide_rows(
+                list(pubs_per_faculty_in_range.keys()),
+                [faculty_pubs_by_faculty[each_name] for each_name in selected_names],
+            ),
+        ),
+        "Research Efficiency": (
+            ["Period"] + display_names,
+            iter_wide_rows(
+                list(pubs_per_faculty_in_range.keys()),
+                [pubs_per_faculty_percent[each_name] for each_name in selected_names],
+            ),
+        ),
+    }
+    if selected_names:
+        report_tables["Efficiency Median and Max"] = (
+            ["Period", "Median", "Maximum"],
+            iter_wide_rows(
+                list(pubs_per_faculty_in_range.keys()),
+                [
+                    determine_med_max_min("Median")["Median"],
+                    determine_med_max_min("Maximum")["Maximum"],
+                ],
+            ),
+        )
+    return report_tables
+
+
+@timed()
+def build_snapshot_html():
+    """Render every dashboard figure for the selected publishers, range and designation into one HTML page"""
+    selected_names = get_selected_publishers(lname=True, allnames=False)
+    figure_sections = [
+        (
+            "Total Over Time",
+            get_cached_figure("total_over_timespan", build_total_over_timespan_figure),
+        ),
+        (
+            "Author Contribution Over Time",
+            get_cached_figure(
+                "total_over_timespan_perfaculty",
+                build_total_over_timespan_perfaculty_figure,
+            ),
+        ),
+        (
+            "Proportional Breakdown",
+            get_cached_figure(
+                "proportional_breakdown", build_proportional_breakdown_figure
+            ),
+        ),
+        (
+            "Venue Breakdown",
+            get_cached_figure("venue_breakdown", build_venue_breakdown_figure),
+        ),
+        (
+            "Publication Frequency",
+            get_cached_figure(
+                "publication_frequency", build_publication_frequency_figure
+            ),
+        ),
+        (
+            "Publications Per Year",
+            get_cached_figure("plot_pub_per_year", build_plot_pub_per_year_figure),
+        ),
+        (
+            "Publications Per Year by Faculty",
+            get_cached_figure(
+                "plot_pubs_per_faculty", build_plot_pubs_per_faculty_figure
+            ),
+        ),
+        (
+            "Faculty Trends",
+            get_cached_figure("plot_faculty_trends", build_plot_faculty_trends_figure),
+        ),
+        (
+            "Growth Heatmap",
+            get_cached_figure(
+                "plot_growth_heatmap",
+                build_growth_heatmap_figure,
+                view_key=(str(input.heatmap_measure()), bool(input.heatmap_change())),
+            ),
+        ),
+        (
+            "Potential Productivity",
+            get_cached_figure(
+                "plot_faculty_productivity_stacked",
+                build_plot_faculty_productivity_stacked_figure,
+            ),
+        ),
+        (
+            "Rolling Publication Rate ("
+            + str(get_rolling_window_months())
+            + " Month Window)",
+            get_cached_figure(
+                "rolling_publication_rate",
+                build_rolling_publication_rate_figure,
+                view_key=(get_rolling_window_months(),),
+            ),
+        ),
+        (
+            "Potential Compare: "
+            + publish_data_dict[selected_names[0]]["Display_Name"],
+            get_cached_figure(
+                "plot_faculty_productivity_sidebyside",
+                build_plot_faculty_productivity_sidebyside_figure,
+            ),
+        ),
+    ]
+    summary_lines = [
+        "Publishers: "
+        + "; ".join(
+            publish_data_dict[each_name]["Display_Name"] for each_name in selected_names
+        ),
+        "Date Range: "
+        + get_selecteddate_timeextremes("Oldest").strftime("%Y-%m-%d")
+        + " to "
+        + get_selecteddate_timeextremes("Newest").strftime("%Y-%m-%d"),
+        "Year Designation: " + year_designation_choices[str(input.radio())],
+        "Counting: " + get_count_mode() + " publications",
+        "Author Credit: "
+        + ("Fractional (1/k)" if input.fractional_credit() else "Full"),
+        "Venues: " + ("; ".join(input.venue_filter()) or "All"),
+        "Generated: " + datetime.date.today().isoformat(),
+    ]
+    return build_dashboard_snapshot(
+        "Anatomy Department Publication Dashboard", summary_lines, figure_sections
+    )
+
+
 ################################## GUI CODE #################################
 ui.page_opts(title="Anatomy Department Publication Dashboard", fillable=True)
 
@@ -759,7 +1975,7 @@ with ui.sidebar(open="desktop", width=300):
     ui.input_date_range("daterange", "Date Range", start="2000-01-01")
     ui.input_checkbox_group(
         "groupselector",
-        "Group Selection",
+        "Cohort Selection",
         ["All", "Still at NYIT"],
         selected=[],
         inline=True,
@@ -771,9 +1987,36 @@ with ui.sidebar(open="desktop", width=300):
         selected=[],
         inline=True,
     )
+    with ui.layout_columns(col_widths=[8, 4], fill=False):
+        ui.input_text("cohort_name", None, placeholder="Save selection as cohort")
+        ui.input_action_button("save_cohort", "Save")
+    ui.input_radio_buttons(
+        "count_mode",
+        "Count Publications As",
+        {
+            "Unique": "Unique department publications",
+            "Attributed": "Author-attributed publications",
+        },
+        selected="Unique",
+    )
+    ui.input_switch(
+        "fractional_credit",
+        "Fractional co-author credit (1/k), overrides the count",
+        value=False,
+    )
+    ui.input_selectize(
+        "venue_filter",
+        "Venue Filter (all venues if empty)",
+        choices=[],
+        multiple=True,
+    )
 
 ui.input_file(
-    "file1", "Upload Master File", accept=[".xlsx"], multiple=False, width="100%"
+    "file1",
+    "Upload Master File(s)",
+    accept=[".xlsx"],
+    multiple=True,
+    width="100%",
 )
 
 with ui.accordion(open=False):
@@ -804,6 +2047,49 @@ with ui.accordion(open=False):
             write_csv_export()
             return path
 
+    with ui.accordion_panel("Download Summary Report"):
+        ui.markdown(
+            "Download an .xlsx workbook with a sheet for each table behind the charts, "
+            "for the selected Authors, Date Range and year designation."
+        )
+
+        @render.download(
+            label="Download Report",
+            filename=lambda: "publication_summary_"
+            + datetime.date.today().isoformat()
+            + ".xlsx",
+        )
+        def download_report():
+            """Stream the summary report workbook to the browser, removing the temporary file afterwards"""
+            req(dataset_ready())
+            report_file, report_path = tempfile.mkstemp(suffix=".xlsx")
+            os.close(report_file)
+            try:
+                write_summary_report(report_path, build_summary_report_tables())
+                with open(report_path, "rb") as report_stream:
+                    for each_block in iter(lambda: report_stream.read(64 * 1024), b""):
+                        yield each_block
+            finally:
+                os.remove(report_path)
+
+    with ui.accordion_panel("Download Dashboard Snapshot"):
+        ui.markdown(
+            "Download every dashboard chart for the selected Authors, Date Range and "
+            "year designation as a single read-only .html page that needs no live session."
+        )
+
+        @render.download(
+            label="Download Snapshot",
+            filename=lambda: "publication_dashboard_"
+            + datetime.date.today().isoformat()
+            + ".html",
+        )
+        def download_snapshot():
+            """Send the static snapshot of the current dashboard view"""
+            req(dataset_ready())
+            req(input.selectauthor())
+            yield build_snapshot_html().encode("utf-8")
+
 
 with ui.navset_pill(id="tab"):
     with ui.nav_panel("Dashboard"):
@@ -811,55 +2097,31 @@ with ui.navset_pill(id="tab"):
             with ui.card():
 
                 @render.ui
-                @reactive.event(input.file1, ignore_none=True)
+                @reactive.event(dataset_source, ingestion_progress)
                 def display_top_publishers():
-                    """Display the top 5 publishers ranked by amount of publications recorded"""
-                    publications_counts = {}
-                    for each_faculty, faculty_data in publish_data_dict.items():
-                        publications_counts[each_faculty] = faculty_data[
-                            "Publication_Amount"
-                        ]
-                    sorted_items = sorted(
-                        publications_counts.items(),
-                        key=lambda item: item[1],
-                        reverse=True,
-                    )
-                    ranked_list = [
-                        (rank + 1, key, value)
-                        for rank, (key, value) in enumerate(sorted_items)
-                    ]
-                    publisher_one = publish_data_dict[ranked_list[0][1]]["Display_Name"]
-                    publisher_two = publish_data_dict[ranked_list[1][1]]["Display_Name"]
-                    publisher_three = publish_data_dict[ranked_list[2][1]][
-                        "Display_Name"
-                    ]
-                    publisher_four = publish_data_dict[ranked_list[3][1]][
-                        "Display_Name"
-                    ]
-                    publisher_five = publish_data_dict[ranked_list[4][1]][
-                        "Display_Name"
-                    ]
-                    publications_one = ranked_list[0][2]
-                    publications_two = ranked_list[1][2]
-                    publications_three = ranked_list[2][2]
-                    publications_four = ranked_list[3][2]
-                    publications_five = ranked_list[4][2]
-
-                    top_5_string = f"""
+                    """Display the top 5 publishers ranked by amount of publications recorded,
+                    refining the ranking while an upload is still being attributed"""
+                    load_session_dataset()
+                    # Only the publishers that exist, so fewer than 5 still render
+                    top_5_string = """
                     ### **Top 5 Publishers**  
                     #### Rank
-                    **1 -** {publisher_one} : {publications_one}  
-                    **2 -** {publisher_two} : {publications_two}  
-                    **3 -** {publisher_three} : {publications_three}  
-                    **4 -** {publisher_four} : {publications_four}  
-                    **5 -** {publisher_five} : {publications_five} 
+                    """
+                    for rank, display_name, publications in get_top_publishers(
+                        publish_data_dict
+                    ):
+                        top_5_string += f"""**{rank} -** {display_name} : {publications}  
+                    """
+                    if ingestion_progress.get() < 1:
+                        top_5_string += f"""
+                    *Counting... {ingestion_progress.get():.0%} of publications attributed*
                     """
                     return ui.markdown(top_5_string)
 
             with ui.card():
 
                 @render.ui
-                @reactive.event(input.file1, ignore_none=True)
+                @reactive.event(dataset_source)
                 def display_publisher_stats():
                     # publish_data_dict = create_publisher_data()
                     selected_names = get_selected_publishers(True)
@@ -895,151 +2157,162 @@ with ui.navset_pill(id="tab"):
                     """
                     return ui.markdown(stats_string)
 
-        with ui.layout_columns(col_widths=[6, 6, 6, 6, 12]):
+        with ui.card(fill=False):
+            with ui.layout_columns(col_widths=[10, 2]):
+
+                @render.ui
+                def cross_filter_status():
+                    """Show the chart picks narrowing the other charts"""
+                    req(dataset_ready())
+                    return ui.markdown(get_cross_filter_summary())
+
+                ui.input_action_button("clear_cross_filter", "Clear Filter")
+
+        with ui.layout_columns(col_widths=[6, 6, 6, 6, 12, 12]):
             with ui.card(full_screen=True):
                 ui.card_header("Total Over Selected Timespan")
                 with ui.navset_card_tab(id="tab3"):
                     with ui.nav_panel("Total Over Time"):
 
                         @render_plotly
-                        @reactive.event(input.selectauthor, ignore_none=True)
+                        @reactive.event(dataset_source)
+                        @timed()
                         def total_over_timespan():
                             """Plot the total amount of publications published from the
                             selected publishers over the selected timespan"""
-                            req(input.file1())
-                            total_pubs_per_month = determine_pubcounts()
-                            running_count = 0
-                            for time_index in range(
-                                len(total_pubs_per_month["Pub_Counts"])
-                            ):
-                                total_pubs_per_month["Pub_Counts"][
-                                    time_index
-                                ] += running_count
-                                running_count = total_pubs_per_month["Pub_Counts"][
-                                    time_index
-                                ]
-
-                            graph_data = {
-                                "Months": total_pubs_per_month["Months"],
-                                "Publication Counts": total_pubs_per_month[
-                                    "Pub_Counts"
-                                ],
-                            }
-                            graph_df = pd.DataFrame(graph_data)
-                            fig = px.area(graph_df, x="Months", y="Publication Counts")
-                            return fig
+                            req(dataset_source())
+                            return get_cached_figure(
+                                "total_over_timespan", build_total_over_timespan_figure
+                            )
+
+                        @reactive.effect
+                        @reactive.event(
+                            input.selectauthor,
+                            cross_filter,
+                            input.count_mode,
+                            input.fractional_credit,
+                            input.venue_filter,
+                            ingestion_progress,
+                            ignore_none=True,
+                            ignore_init=True,
+                        )
+                        def update_total_over_timespan():
+                            """Update the displayed total in place for the new selection or attributed chunk"""
+                            req(dataset_source())
+                            sync_figure_widget(
+                                total_over_timespan.widget,
+                                get_cached_figure(
+                                    "total_over_timespan",
+                                    build_total_over_timespan_figure,
+                                ),
+                            )
+
+                        @reactive.effect
+                        def register_total_over_timespan_filter():
+                            """Let clicked or brushed months narrow the other charts each time the total is displayed"""
+                            register_cross_filter_handlers(
+                                total_over_timespan.widget, filter_by_selected_months
+                            )
 
                     with ui.nav_panel("Author Contribution Over Time"):
 
                         @render_plotly
-                        @reactive.event(input.selectauthor, ignore_none=True)
+                        @reactive.event(dataset_ready)
+                        @timed()
                         def total_over_timespan_perfaculty():
                             """Plot the total amount of publications published from the
                             selected publishers over the selected timespan, displaying the
                             individual contributions of each publisher stacked"""
-                            req(input.file1())
-                            pub_counts_sums = determine_count_sums()
-                            dt_start = get_selecteddate_timeextremes("Oldest")
-                            dt_end = get_selecteddate_timeextremes("Newest")
-                            x_axis_dates = pd.date_range(
-                                dt_start, dt_end, freq="MS"
-                            ).tolist()
-                            dt_months = x_axis_dates
-                            for each_publisher_sums in pub_counts_sums.values():
-                                running_count = 0
-                                for time_index in enumerate(each_publisher_sums):
-                                    each_publisher_sums[time_index[0]] += running_count
-                                    running_count = each_publisher_sums[time_index[0]]
-
-                            pub_month_list = []
-                            publisher_list = []
-                            pub_count_list = []
-                            for index, each_publisher in enumerate(
-                                list(pub_counts_sums.keys())
-                            ):
-                                temp_publisher_list = [each_publisher] * len(
-                                    list(pub_counts_sums.values())[0]
-                                )
-                                publisher_list = publisher_list + temp_publisher_list
-                                temp_pubcount_list = list(pub_counts_sums.values())[
-                                    index
-                                ]
-                                pub_count_list = pub_count_list + temp_pubcount_list
-                                temp_pubmonth_list = dt_months
-                                pub_month_list = pub_month_list + temp_pubmonth_list
-
-                            graph_data = {
-                                "Months": pub_month_list,
-                                "Publication Counts": pub_count_list,
-                                "Publisher": publisher_list,
-                            }
-
-                            graph_df = pd.DataFrame(graph_data)
-                            fig = px.area(
-                                graph_df,
-                                x="Months",
-                                y="Publication Counts",
-                                color="Publisher",
+                            req(dataset_ready())
+                            return get_cached_figure(
+                                "total_over_timespan_perfaculty",
+                                build_total_over_timespan_perfaculty_figure,
+                            )
+
+                        @reactive.effect
+                        @reactive.event(
+                            input.selectauthor,
+                            cross_filter,
+                            input.venue_filter,
+                            input.fractional_credit,
+                            ignore_none=True,
+                            ignore_init=True,
+                        )
+                        def update_total_over_timespan_perfaculty():
+                            """Add, remove or restyle only the publisher traces the new selection changed"""
+                            req(dataset_ready())
+                            sync_figure_widget(
+                                total_over_timespan_perfaculty.widget,
+                                get_cached_figure(
+                                    "total_over_timespan_perfaculty",
+                                    build_total_over_timespan_perfaculty_figure,
+                                ),
                             )
-                            return fig
 
             with ui.card(full_screen=True):
                 with ui.card_header("Proportional Breakdown"):
 
                     @render_plotly
-                    @reactive.event(input.selectauthor, ignore_none=True)
+                    @reactive.event(dataset_ready)
+                    @timed()
                     def proportional_breakdown():
                         """Plot the percentage proportional breakdown of the total amount of
                         publications published from the selected publishers over the selected timespan
                         """
-                        req(input.file1())
-                        labels = []
-                        sizes = []
-                        pub_counts_per_publisher = determine_pubs_per_publisher()
-                        for each_name, each_count in pub_counts_per_publisher.items():
-                            labels.append(each_name)
-                            sizes.append(each_count)
-
-                        graph_data = {"Publisher": labels, "Publications": sizes}
-                        graph_df = pd.DataFrame(graph_data)
-                        fig = px.pie(
-                            graph_df,
-                            values="Publications",
-                            names="Publisher",
+                        req(dataset_ready())
+                        return get_cached_figure(
+                            "proportional_breakdown",
+                            build_proportional_breakdown_figure,
+                        )
+
+                    @reactive.effect
+                    @reactive.event(
+                        input.selectauthor,
+                        cross_filter,
+                        input.venue_filter,
+                        input.fractional_credit,
+                        ignore_none=True,
+                        ignore_init=True,
+                    )
+                    def update_proportional_breakdown():
+                        """Update the displayed breakdown in place for the new selection"""
+                        req(dataset_ready())
+                        sync_figure_widget(
+                            proportional_breakdown.widget,
+                            get_cached_figure(
+                                "proportional_breakdown",
+                                build_proportional_breakdown_figure,
+                            ),
+                        )
+
+                    @reactive.effect
+                    def register_proportional_breakdown_filter():
+                        """Let a clicked slice narrow the other charts each time the breakdown is displayed"""
+                        register_cross_filter_handlers(
+                            proportional_breakdown.widget, filter_by_clicked_publisher
                         )
-                        return fig
 
             with ui.card(full_screen=True):
                 with ui.card_header("Publication Frequency"):
 
                     @render_plotly
-                    @reactive.event(input.selectauthor, ignore_none=True)
+                    @reactive.event(
+                        input.selectauthor,
+                        cross_filter,
+                        input.count_mode,
+                        input.fractional_credit,
+                        input.venue_filter,
+                        dataset_ready,
+                        ignore_none=True,
+                    )
+                    @timed()
                     def publication_frequency():
                         """Plot the frequency of publications published from the
                         selected publishers over the selected timespan"""
-                        req(input.file1())
-                        total_publication_list_datesonly = calculate_time_relevant_data(
-                            dates_only=True
+                        req(dataset_ready())
+                        return get_cached_figure(
+                            "publication_frequency", build_publication_frequency_figure
                         )
-                        x_axis_dates = get_selected_timespan_months_list()
-
-                        for list_index, each_month in enumerate(
-                            total_publication_list_datesonly
-                        ):
-                            total_publication_list_datesonly[list_index] = (
-                                each_month.strftime("%Y-%m")
-                            )
-
-                        graph_df = pd.DataFrame(
-                            {"Months": total_publication_list_datesonly}
-                        )
-                        fig = px.histogram(
-                            graph_df,
-                            x="Months",
-                            nbins=len(x_axis_dates),
-                            labels={"Months": "Month"},
-                        )
-                        return fig
 
             with ui.card(full_screen=True):
                 with ui.card_header(
@@ -1049,11 +2322,7 @@ with ui.navset_pill(id="tab"):
                 ui.input_radio_buttons(
                     "radio",
                     "",
-                    {
-                        "1": "Calendar Year (January 1st - December 31st)",
-                        "2": "Academic Year (August 1st - July 31st)",
-                        "3": "Fiscal Year (July 1st - June 30th)",
-                    },
+                    year_designation_choices,
                     inline=True,
                 )
 
@@ -1062,213 +2331,353 @@ with ui.navset_pill(id="tab"):
                     with ui.nav_panel("Publication/Year"):
 
                         @render_plotly
+                        @reactive.event(dataset_ready)
+                        @timed()
                         def plot_pub_per_year():
                             """plot each timespan's amount of publications"""
-                            req(input.file1())
-                            selected_names = get_selected_publishers(
-                                lname=True, allnames=False
+                            req(dataset_ready())
+                            return get_cached_figure(
+                                "plot_pub_per_year", build_plot_pub_per_year_figure
                             )
-                            date_year_ranges = get_selected_timespan_year_bins()
 
-                            pub_counts_per_publisher_over_time = (
-                                determine_pubs_per_publisher_overtime()
+                        @reactive.effect
+                        def update_plot_pub_per_year():
+                            """Update the displayed bars in place whenever the view changes"""
+                            req(dataset_ready())
+                            sync_figure_widget(
+                                plot_pub_per_year.widget,
+                                get_cached_figure(
+                                    "plot_pub_per_year", build_plot_pub_per_year_figure
+                                ),
                             )
-
-                            pubs_per_range = determine_pubs_per_range(
-                                date_year_ranges,
-                                selected_names,
-                                pub_counts_per_publisher_over_time,
+                            register_cross_filter_handlers(
+                                plot_pub_per_year.widget, filter_by_clicked_period
                             )
 
-                            years_list = list(pubs_per_range.keys())
-                            counts_list = list(pubs_per_range.values())
-                            graph_df = pd.DataFrame(
-                                {"Year": years_list, "Count": counts_list}
-                            )
-
-                            fig = px.bar(graph_df, x="Year", y="Count")
-                            fig.update_xaxes(tickangle=90)
-                            return fig
-
                     with ui.nav_panel("Publication/Faculty"):
 
                         @render_plotly
+                        @reactive.event(dataset_ready)
+                        @timed()
                         def plot_pubs_per_faculty():
                             """plot each timespan's amount of publications broken up by selected faculty"""
-                            req(input.file1())
-                            selected_names = get_selected_publishers(
-                                lname=True, allnames=False
+                            req(dataset_ready())
+                            return get_cached_figure(
+                                "plot_pubs_per_faculty",
+                                build_plot_pubs_per_faculty_figure,
                             )
-                            date_year_ranges = get_selected_timespan_year_bins()
 
-                            pubs_per_publisher_over_time = (
-                                determine_pubs_per_publisher_overtime()
-                            )
-                            pubs_per_faculty_in_range = (
-                                determine_pubs_per_faculty_range(
-                                    date_year_ranges,
-                                    selected_names,
-                                    pubs_per_publisher_over_time,
-                                )
+                        @reactive.effect
+                        def update_plot_pubs_per_faculty():
+                            """Add, remove or restyle only the faculty bars the view changed"""
+                            req(dataset_ready())
+                            sync_figure_widget(
+                                plot_pubs_per_faculty.widget,
+                                get_cached_figure(
+                                    "plot_pubs_per_faculty",
+                                    build_plot_pubs_per_faculty_figure,
+                                ),
                             )
+                            # Bars added by the sync need the handler too
+                            for each_trace in plot_pubs_per_faculty.widget.data:
+                                each_trace.on_click(open_author_drilldown)
 
-                            publishers_list = []
-                            year_count_list = []
-                            year_span_list = []
-
-                            for (
-                                each_timespan,
-                                counts_broken_down,
-                            ) in pubs_per_faculty_in_range.items():
-                                for each_publisher in counts_broken_down.keys():
-                                    publishers_list.append(each_publisher)
-                                    year_count_list.append(
-                                        counts_broken_down[each_publisher]
-                                    )
-                                    year_span_list.append(each_timespan)
+                    with ui.nav_panel("Faculty Trends"):
 
-                            graph_df = pd.DataFrame(
-                                {
-                                    "Year": year_span_list,
-                                    "Count": year_count_list,
-                                    "Publisher": publishers_list,
-                                }
+                        @render_plotly
+                        @timed()
+                        def plot_faculty_trends():
+                            """plot each selected faculty's publications per timespan with its trend and projection"""
+                            req(dataset_ready())
+                            return get_cached_figure(
+                                "plot_faculty_trends", build_plot_faculty_trends_figure
                             )
 
-                            fig = px.bar(
-                                graph_df, x="Year", y="Count", color="Publisher"
+                    with ui.nav_panel("Growth Heatmap"):
+                        with ui.layout_columns(col_widths=[6, 6], fill=False):
+                            ui.input_radio_buttons(
+                                "heatmap_measure",
+                                None,
+                                ["Count", "Efficiency"],
+                                selected="Count",
+                                inline=True,
+                            )
+                            ui.input_checkbox(
+                                "heatmap_change", "Show change from previous", False
                             )
-                            fig.update_xaxes(tickangle=90)
-                            return fig
-
-                    with ui.nav_panel("Potential Productivity"):
 
                         @render_plotly
-                        def plot_faculty_productivity_stacked():
-                            """Plot the efficiency of selected publishers in combination to display entire department productivity"""
-                            req(input.file1())
-                            selected_names = get_selected_publishers(True)
-                            date_year_ranges = get_selected_timespan_year_bins()
-                            pub_counts_per_publisher_over_time = (
-                                determine_pubs_per_publisher_overtime()
+                        @timed()
+                        def plot_growth_heatmap():
+                            """plot each selected faculty's publications or efficiency per timespan, or its change"""
+                            req(dataset_ready())
+                            return get_cached_figure(
+                                "plot_growth_heatmap",
+                                build_growth_heatmap_figure,
+                                view_key=(
+                                    str(input.heatmap_measure()),
+                                    bool(input.heatmap_change()),
+                                ),
                             )
 
-                            pubs_per_faculty_in_range = (
-                                determine_pubs_per_faculty_range(
-                                    date_year_ranges,
-                                    selected_names,
-                                    pub_counts_per_publisher_over_time,
-                                )
-                            )
-                            pubs_per_faculty_percent = determine_faculty_pubs_percents(
-                                pubs_per_faculty_in_range, selected_names
-                            )
+                    with ui.nav_panel("Cohort Comparison"):
+                        ui.input_selectize(
+                            "compare_cohorts",
+                            "Cohorts to compare",
+                            choices=[],
+                            multiple=True,
+                        )
 
-                            publishers_list = []
-                            year_efficiency_list = []
-                            year_span_list = []
-
-                            for (
-                                each_publisher,
-                                each_percent_list,
-                            ) in pubs_per_faculty_percent.items():
-                                for timespan_index, each_timespan in enumerate(
-                                    pubs_per_faculty_in_range.keys()
-                                ):
-                                    publishers_list.append(each_publisher)
-                                    year_efficiency_list.append(
-                                        each_percent_list[timespan_index]
+                        @render_plotly
+                        @timed()
+                        def plot_cohort_comparison():
+                            """plot the publications per timespan of every compared cohort"""
+                            req(dataset_ready())
+                            cohort_members = get_cohort_members(load_session_dataset())
+                            return get_cached_figure(
+                                "plot_cohort_comparison",
+                                build_cohort_comparison_figure,
+                                view_key=tuple(
+                                    (
+                                        each_cohort,
+                                        make_selection_hash(
+                                            cohort_members.get(each_cohort, [])
+                                        ),
                                     )
-                                    year_span_list.append(each_timespan)
-
-                            graph_df = pd.DataFrame(
-                                {
-                                    "Year": year_span_list,
-                                    "Efficiency": year_efficiency_list,
-                                    "Publisher": publishers_list,
-                                }
+                                    for each_cohort in input.compare_cohorts()
+                                ),
                             )
 
-                            fig = px.bar(
-                                graph_df, x="Year", y="Efficiency", color="Publisher"
+                    with ui.nav_panel("Potential Productivity"):
+
+                        @render_plotly
+                        @timed()
+                        def plot_faculty_productivity_stacked():
+                            """Plot the efficiency of selected publishers in combination to display entire department productivity"""
+                            req(dataset_ready())
+                            return get_cached_figure(
+                                "plot_faculty_productivity_stacked",
+                                build_plot_faculty_productivity_stacked_figure,
                             )
-                            fig.update_xaxes(tickangle=90)
-                            return fig
 
                     with ui.nav_panel("Potential Compare (Select up to 1)"):
 
                         @render_plotly
+                        @timed()
                         def plot_faculty_productivity_sidebyside():
                             """Plot the efficiency of selected publishers side-by-side for comparison purposes"""
-                            req(input.file1())
-                            selected_names = get_selected_publishers(True)
-                            if len(selected_names) > 1:
-                                selected_names = selected_names[0:1]
-                            date_year_ranges = get_selected_timespan_year_bins()
-                            pub_counts_per_publisher_over_time = (
-                                determine_pubs_per_publisher_overtime()
+                            req(dataset_ready())
+                            return get_cached_figure(
+                                "plot_faculty_productivity_sidebyside",
+                                build_plot_faculty_productivity_sidebyside_figure,
                             )
 
-                            pubs_per_faculty_in_range = (
-                                determine_pubs_per_faculty_range(
-                                    date_year_ranges,
-                                    selected_names,
-                                    pub_counts_per_publisher_over_time,
-                                )
-                            )
-                            pubs_per_faculty_percent = determine_faculty_pubs_percents(
-                                pubs_per_faculty_in_range, selected_names
-                            )
+            with ui.card(full_screen=True):
+                with ui.card_header(
+                    class_="d-flex justify-content-between align-items-center"
+                ):
+                    "Rolling Publication Rate"
+                ui.input_numeric(
+                    "rolling_months", "Window (months)", value=12, min=1, max=120
+                )
 
-                            pubs_per_faculty_percent.update(
-                                determine_med_max_min("Median")
-                            )
+                @render_plotly
+                @timed()
+                def rolling_publication_rate():
+                    """Plot the average monthly publication rate over the selected
+                    window for the department and each selected publisher"""
+                    req(dataset_ready())
+                    return get_cached_figure(
+                        "rolling_publication_rate",
+                        build_rolling_publication_rate_figure,
+                        view_key=(get_rolling_window_months(),),
+                    )
 
-                            pubs_per_faculty_percent.update(
-                                determine_med_max_min("Maximum")
-                            )
+            with ui.card(full_screen=True):
+                with ui.card_header("Venue Breakdown"):
 
-                            publishers_list = []
-                            year_efficiency_list = []
-                            year_span_list = []
-
-                            for (
-                                each_publisher,
-                                each_percent_list,
-                            ) in pubs_per_faculty_percent.items():
-                                for timespan_index, each_timespan in enumerate(
-                                    pubs_per_faculty_in_range.keys()
-                                ):
-                                    publishers_list.append(each_publisher)
-                                    year_efficiency_list.append(
-                                        each_percent_list[timespan_index]
-                                    )
-                                    year_span_list.append(each_timespan)
+                    @render_plotly
+                    @timed()
+                    def venue_breakdown():
+                        """Plot the venues the selected publishers published in over the selected timespan"""
+                        req(dataset_ready())
+                        return get_cached_figure(
+                            "venue_breakdown", build_venue_breakdown_figure
+                        )
+
+    with ui.nav_panel("Compare"):
+        with ui.layout_columns(col_widths=[6, 6], fill=False):
+            for each_side in ["a", "b"]:
+                with ui.card():
+                    ui.card_header("Selection " + each_side.upper())
+                    ui.input_selectize(
+                        "compare_authors_" + each_side,
+                        "Authors (sidebar selection if empty)",
+                        choices=[],
+                        multiple=True,
+                    )
+                    ui.input_date_range(
+                        "compare_daterange_" + each_side,
+                        "Date Range",
+                        start=datetime.date.today()
+                        - datetime.timedelta(days=365 * (6 if each_side == "a" else 3)),
+                        end=datetime.date.today()
+                        - datetime.timedelta(days=365 * (3 if each_side == "a" else 0)),
+                    )
+
+        @render.ui
+        def comparison_summary():
+            """Summarize both sides' publications and the change from A to B"""
+            req(dataset_ready())
+            side_totals = {
+                each_side: round(float(side_data["Period_Counts"].sum()), 2)
+                for each_side, side_data in get_comparison_sides().items()
+            }
+            total_change = round(side_totals["b"] - side_totals["a"], 2)
+            change_text = f"{total_change:+g}"
+            if side_totals["a"]:
+                change_text += f" ({total_change / side_totals['a']:+.0%})"
+            return ui.markdown(
+                f"**A:** {side_totals['a']:g} publications &nbsp; "
+                f"**B:** {side_totals['b']:g} publications &nbsp; "
+                f"**Change:** {change_text}"
+            )
+
+        with ui.card(full_screen=True):
+            ui.card_header("Publications per Timespan")
+
+            @render_plotly
+            @timed()
+            def plot_comparison_periods():
+                """plot both sides' publications per timespan and the change between them"""
+                req(dataset_ready())
+                return get_cached_figure(
+                    "plot_comparison_periods",
+                    build_comparison_periods_figure,
+                    view_key=get_comparison_view_key(),
+                )
+
+        @render.data_frame
+        def comparison_authors_df():
+            """Display each publisher's publications and efficiency on both sides"""
+            req(dataset_ready())
+            return render.DataGrid(
+                get_comparison_author_table(), filters=True, width="100%"
+            )
 
-                            graph_df = pd.DataFrame(
+    with ui.nav_panel("Author Drilldown"):
+        ui.input_select(
+            "drilldown_author",
+            "Author (or click a bar in Publication/Faculty)",
+            choices=[],
+        )
+        with ui.layout_columns(col_widths=[4, 8], fill=False):
+            with ui.card():
+                ui.card_header("Summary")
+
+                @render.ui
+                def drilldown_summary():
+                    """Summarize the drilldown publisher's whole record"""
+                    author_summary = get_author_summary(
+                        publish_data_dict,
+                        load_session_dataset()["Publication_Table"],
+                        input.drilldown_author(),
+                        drilldown_rows(),
+                    )
+                    return ui.markdown(
+                        f"**Position:** {author_summary['Position'] or 'Unrecorded'}  \n"
+                        f"**Hire Year:** {author_summary['Hire_Year'] or 'Unrecorded'}  \n"
+                        f"**Still at NYIT:** {'Yes' if author_summary['Currently_at_NYIT'] else 'No'}  \n"
+                        f"**Publications:** {author_summary['Publications']}  \n"
+                        f"**First / Latest:** {author_summary['First_Publication']} / "
+                        f"{author_summary['Latest_Publication']}  \n"
+                        f"**Per Year:** {author_summary['Publications_Per_Year']:.2f}  \n"
+                        f"**With Department Co-Authors:** {author_summary['Co_Authored']}  \n"
+                        f"**Top Venue:** {author_summary['Top_Venue'] or 'Unparsed'}"
+                    )
+
+            with ui.card(full_screen=True):
+                ui.card_header("Timeline")
+
+                @render_plotly
+                @timed()
+                def plot_drilldown_timeline():
+                    """plot the drilldown publisher's publications per calendar year"""
+                    req(drilldown_rows() is not None)
+                    # Only depends on the publisher, not on the sidebar selections
+                    return get_or_build_figure(
+                        (
+                            load_session_dataset()["Dataset_Hash"],
+                            "plot_drilldown_timeline",
+                            input.drilldown_author(),
+                        ),
+                        build_drilldown_timeline_figure,
+                    )
+
+        with ui.layout_columns(col_widths=[4, 8], fill=False):
+            with ui.card():
+                ui.card_header("Department Co-Authors")
+
+                @render.data_frame
+                def drilldown_coauthors_df():
+                    """Display how many publications the drilldown publisher shares with each co-author"""
+                    coauthor_counts = get_coauthor_counts(
+                        load_session_dataset()["Publication_Table"],
+                        drilldown_rows(),
+                        input.drilldown_author(),
+                    )
+                    return render.DataGrid(
+                        pd.DataFrame(
+                            [
                                 {
-                                    "Year": year_span_list,
-                                    "Efficiency": year_efficiency_list,
-                                    "Publisher": publishers_list,
+                                    "Co-Author": publish_data_dict[each_key][
+                                        "Display_Name"
+                                    ],
+                                    "Shared Publications": each_count,
                                 }
-                            )
+                                for each_key, each_count in coauthor_counts
+                            ],
+                            columns=["Co-Author", "Shared Publications"],
+                        ),
+                        width="100%",
+                    )
 
-                            fig = px.bar(
-                                graph_df,
-                                x="Year",
-                                y="Efficiency",
-                                color="Publisher",
-                                barmode="group",
+            with ui.card():
+                with ui.card_header():
+                    with ui.layout_columns(col_widths=[2, 8, 2], fill=False):
+                        ui.input_action_button("drilldown_previous", "Previous")
+
+                        @render.text
+                        def drilldown_page_label():
+                            """Show which page of the publication list is displayed"""
+                            page_count = max(
+                                -(-len(drilldown_rows()) // DRILLDOWN_PAGE_SIZE), 1
                             )
-                            fig.update_xaxes(tickangle=90)
-                            return fig
+                            return f"Publications, page {drilldown_page.get() + 1} of {page_count}"
+
+                        ui.input_action_button("drilldown_next", "Next")
+
+                @render.ui
+                def drilldown_publications():
+                    """Display one page of the drilldown publisher's publications, loading only that page"""
+                    publication_page = get_publication_page(
+                        load_session_dataset()["Publication_Table"],
+                        drilldown_rows(),
+                        drilldown_page.get(),
+                    )
+                    return ui.HTML(
+                        pd.DataFrame(
+                            publication_page,
+                            columns=["Date", "DOI", "Venue", "Citation"],
+                        ).to_html(index=False, classes="table table-sm", border=0)
+                    )
 
     with ui.nav_panel("Raw Data"):
 
         @render.data_frame
         def raw_publication_data_df():
             """Display raw data in a grid for observing and filtering"""
-            req(input.file1())
+            req(dataset_ready())
             raw_data = read_in_file_all_data()
             if raw_data is not None:
                 return render.DataGrid(
@@ -1279,20 +2688,131 @@ with ui.navset_pill(id="tab"):
                     styles=df_data_styles,
                 )
 
+        @render.ui
+        def duplicate_summary():
+            """Summarize how many sheet rows were merged as duplicates during ingestion"""
+            req(dataset_ready())
+            duplicate_report = read_in_file_duplicate_report()
+            merged_rows = sum(
+                len(each_merge["Merged Sheet Rows"].split(", ")) - 1
+                for each_merge in duplicate_report
+            )
+            return ui.markdown(
+                f"**Merged Duplicates:** {merged_rows} duplicate rows collapsed into "
+                f"{len(duplicate_report)} publications"
+            )
+
+        @render.data_frame
+        def duplicate_report_df():
+            """Display which sheet rows were merged into each publication"""
+            req(dataset_ready())
+            duplicate_report = read_in_file_duplicate_report()
+            if duplicate_report:
+                return render.DataGrid(
+                    pd.DataFrame(duplicate_report), width="100%", height="300px"
+                )
+
     with ui.nav_panel("Publisher Data"):
 
         @render.data_frame
         def raw_publisher_data_df():
             """Display publisher data in a grid for observing and filtering"""
-            req(input.file1())
+            req(dataset_ready())
             raw_publisher_data = read_in_file_publisher_data()
             if raw_publisher_data is not None:
                 df = raw_publisher_data.copy()
-                temp_cols = []
-                top_headers = 5
-                for i in range(top_headers):
-                    temp_cols.append(df.columns[i][0])
-                for j in range(top_headers, len(df.columns)):
-                    temp_cols.append(str(df.columns[j][1]) + " Research %")
-                df.columns = temp_cols
+                df.columns = get_publisher_column_labels(raw_publisher_data)
                 return render.DataGrid(df, filters=True, width="100%", height="600px")
+
+    if SHOW_PERFORMANCE_PANEL:
+        with ui.nav_panel("Performance"):
+            ui.markdown(
+                "Latency of the instrumented functions across every session on this worker. "
+                "Refreshes every 5 seconds."
+            )
+            with ui.layout_columns(col_widths=[4, 4, 4], fill=False):
+                ui.input_select("timing_function", "Latency Histogram For", choices=[])
+                ui.input_action_button("reset_timings_button", "Reset Timings")
+
+                @render.download(
+                    label="Download Timings .JSON", filename="dashboard_timings.json"
+                )
+                def download_timings():
+                    """Export the timing records so deployments can be compared"""
+                    yield export_timings_json()
+
+            @reactive.effect
+            @reactive.event(input.reset_timings_button)
+            def clear_timings():
+                """Clear the timing records for every session on this worker"""
+                reset_timings()
+
+            @reactive.effect
+            def refresh_timing_function_choices():
+                """Keep the histogram selector in sync with the instrumented functions"""
+                reactive.invalidate_later(5)
+                function_names = [row["Function"] for row in get_timing_summary()]
+                with reactive.isolate():
+                    current_function = input.timing_function()
+                ui.update_select(
+                    "timing_function",
+                    choices=function_names,
+                    selected=(
+                        current_function if current_function in function_names else None
+                    ),
+                )
+
+            @render.data_frame
+            def timing_summary_df():
+                """Display call counts and latency statistics per function"""
+                reactive.invalidate_later(5)
+                input.reset_timings_button()
+                return render.DataGrid(
+                    pd.DataFrame(get_timing_summary()), width="100%", height="400px"
+                )
+
+            @render_plotly
+            def timing_histogram():
+                """Plot the latency histogram of the selected function"""
+                reactive.invalidate_later(5)
+                req(input.timing_function())
+                bucket_labels, bucket_counts = get_timing_histogram(
+                    input.timing_function()
+                )
+                graph_df = pd.DataFrame(
+                    {"Latency": bucket_labels, "Calls": bucket_counts}
+                )
+                fig = px.bar(graph_df, x="Latency", y="Calls")
+                fig.update_xaxes(tickangle=90)
+                return fig
+
+            @render.ui
+            def memory_summary():
+                """Display the memory held by every session's dataset against the server cap"""
+                reactive.invalidate_later(5)
+                total_mb = get_total_dataset_bytes() / (1024 * 1024)
+                cap_mb = MEMORY_CAP_BYTES / (1024 * 1024)
+                return ui.markdown(
+                    f"**Session Datasets:** {total_mb:.1f} MB of {cap_mb:.0f} MB cap"
+                )
+
+            @render.ui
+            def figure_cache_summary():
+                """Display how often rendered figures were served from the shared cache"""
+                reactive.invalidate_later(5)
+                cache_stats = get_figure_cache_stats()
+                lookups = cache_stats["Hits"] + cache_stats["Misses"]
+                hit_rate = cache_stats["Hits"] / lookups * 100 if lookups else 0
+                return ui.markdown(
+                    f"**Figure Cache:** {cache_stats['Entries']} of {cache_stats['Capacity']} entries, "
+                    f"{hit_rate:.0f}% hit rate ({cache_stats['Hits']} hits, "
+                    f"{cache_stats['Misses']} misses, {cache_stats['Evictions']} evictions)"
+                )
+
+            @render.data_frame
+            def memory_report_df():
+                """Display the dataset memory, idle time and eviction state of each session"""
+                reactive.invalidate_later(5)
+                return render.DataGrid(
+                    pd.DataFrame(get_memory_report()), width="100%", height="300px"
+                )
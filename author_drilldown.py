@@ -0,0 +1,105 @@
+## Author Drilldown
+
+# One publisher's record read only from their own rows of the publication table, found through the
+# Publication_IDs index built during attribution, so opening an author never scans the whole sheet
+
+from lazy_imports import np
+from performance_metrics import timed
+
+DRILLDOWN_PAGE_SIZE = 25
+
+
+def get_author_rows(publish_data_dict, publication_table, publisher_key):
+    """Get the publication table rows attributed to a publisher, newest first and undated last"""
+    author_rows = np.asarray(
+        publish_data_dict[publisher_key]["Publication_IDs"], dtype=np.int64
+    )
+    author_dates = publication_table["Dates"][author_rows]
+    author_rows = author_rows[np.argsort(author_dates, kind="stable")[::-1]]
+    undated_rows = np.isnat(publication_table["Dates"][author_rows])
+    return np.concatenate([author_rows[~undated_rows], author_rows[undated_rows]])
+
+
+@timed()
+def get_author_summary(
+    publish_data_dict, publication_table, publisher_key, author_rows
+):
+    """Summarize a publisher's record from their rows alone"""
+    publisher_data = publish_data_dict[publisher_key]
+    author_dates = publication_table["Dates"][author_rows]
+    author_dates = author_dates[~np.isnat(author_dates)]
+    venue_codes = publication_table["Venue_Codes"][author_rows]
+    venue_codes = venue_codes[venue_codes >= 0]
+    author_summary = {
+        "Publications": len(author_rows),
+        "First_Publication": None,
+        "Latest_Publication": None,
+        "Publications_Per_Year": 0.0,
+        "Co_Authored": int(
+            (publication_table["Author_Matrix"][author_rows].sum(axis=1) > 1).sum()
+        ),
+        "Top_Venue": None,
+        "Position": publisher_data.get("Position"),
+        "Hire_Year": publisher_data.get("Hire_Year"),
+        "Currently_at_NYIT": publisher_data["Currently_at_NYIT"],
+    }
+    if len(author_dates):
+        author_years = author_dates.astype("datetime64[Y]").astype(int)
+        author_summary["First_Publication"] = str(author_dates.min())[:10]
+        author_summary["Latest_Publication"] = str(author_dates.max())[:10]
+        author_summary["Publications_Per_Year"] = len(author_dates) / (
+            author_years.max() - author_years.min() + 1
+        )
+    if len(venue_codes):
+        author_summary["Top_Venue"] = publication_table["Venue_Names"][
+            np.bincount(venue_codes).argmax()
+        ]
+    return author_summary
+
+
+def get_author_timeline(publication_table, author_rows):
+    """Count a publisher's publications per calendar year, including the years without any"""
+    author_dates = publication_table["Dates"][author_rows]
+    author_years = (
+        author_dates[~np.isnat(author_dates)].astype("datetime64[Y]").astype(int) + 1970
+    )
+    if not len(author_years):
+        return np.array([], dtype=int), np.array([], dtype=int)
+    return (
+        np.arange(author_years.min(), author_years.max() + 1),
+        np.bincount(author_years - author_years.min()),
+    )
+
+
+def get_coauthor_counts(publication_table, author_rows, publisher_key):
+    """Count the publications a publisher shares with each other publisher, most shared first"""
+    shared_counts = publication_table["Author_Matrix"][author_rows].sum(axis=0)
+    return [
+        (publication_table["Author_Keys"][each_column], int(shared_counts[each_column]))
+        for each_column in np.argsort(-shared_counts, kind="stable")
+        if shared_counts[each_column]
+        and publication_table["Author_Keys"][each_column] != publisher_key
+    ]
+
+
+def get_publication_page(
+    publication_table, author_rows, page_number, page_size=DRILLDOWN_PAGE_SIZE
+):
+    """Get one page of a publisher's publications, reading only that page's rows"""
+    page_rows = author_rows[page_number * page_size : (page_number + 1) * page_size]
+    venue_codes = publication_table["Venue_Codes"][page_rows]
+    return [
+        {
+            "Date": (
+                ""
+                if np.isnat(publication_table["Dates"][each_row])
+                else str(publication_table["Dates"][each_row])[:10]
+            ),
+            "DOI": publication_table["DOIs"][each_row],
+            "Venue": (
+                publication_table["Venue_Names"][each_code] if each_code >= 0 else ""
+            ),
+            "Citation": publication_table["Citations"][each_row],
+        }
+        for each_row, each_code in zip(page_rows, venue_codes)
+    ]
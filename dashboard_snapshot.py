@@ -0,0 +1,45 @@
+## Dashboard Snapshot Export
+
+# Renders the dashboard figures into one self-contained, read-only HTML page that can be served statically
+
+import html
+
+from lazy_imports import pio, plotly_offline
+from performance_metrics import timed
+
+SNAPSHOT_STYLE = """
+body { font-family: sans-serif; margin: 2rem; }
+section { margin-bottom: 2rem; }
+"""
+
+
+@timed()
+def build_dashboard_snapshot(page_title, summary_lines, figure_sections):
+    """Render (section title, figure) pairs into one HTML page, embedding plotly.js once
+    in the head so every figure shares it"""
+    snapshot_parts = [
+        "<!DOCTYPE html>",
+        "<html>",
+        "<head>",
+        '<meta charset="utf-8">',
+        "<title>" + html.escape(page_title) + "</title>",
+        '<script type="text/javascript">' + plotly_offline.get_plotlyjs() + "</script>",
+        "<style>" + SNAPSHOT_STYLE + "</style>",
+        "</head>",
+        "<body>",
+        "<h1>" + html.escape(page_title) + "</h1>",
+    ]
+    for each_line in summary_lines:
+        snapshot_parts.append("<p>" + html.escape(each_line) + "</p>")
+    for section_title, fig in figure_sections:
+        snapshot_parts.append("<section>")
+        snapshot_parts.append("<h2>" + html.escape(section_title) + "</h2>")
+        snapshot_parts.append(
+            pio.to_html(
+                fig, full_html=False, include_plotlyjs=False, default_width="100%"
+            )
+        )
+        snapshot_parts.append("</section>")
+    snapshot_parts.append("</body>")
+    snapshot_parts.append("</html>")
+    return "\n".join(snapshot_parts)
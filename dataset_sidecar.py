@@ -0,0 +1,221 @@
+## Parsed Dataset Sidecars
+
+# Parsed and attributed datasets saved under their workbook hash, so a restarted worker memory-maps them
+# instead of reading the Excel file and attributing every row again. Only arrays and JSON are written,
+# never pickles, so a planted sidecar cannot run code when it is read
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import datetime
+import tempfile
+
+from lazy_imports import np, pd
+from performance_metrics import timed
+
+# Off unless a directory is configured, which should be one only the server's user can write to
+SIDECAR_DIRECTORY = os.environ.get("DASHBOARD_SIDECAR_DIRECTORY", "")
+# Bumped whenever the dataset layout changes so older sidecars are ignored
+SIDECAR_FORMAT_VERSION = 5
+# Publication_Table arrays stored as .npy files and memory-mapped on load, the rest is stored as JSON
+# with its other numeric arrays in one .npz file
+MAPPED_TABLE_ARRAYS = [
+    "Publication_IDs",
+    "Dates",
+    "Venue_Codes",
+    "Citation_Years",
+    "Author_Matrix",
+    "Credit_Matrix",
+    "Membership_Bits",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def encode_sidecar_value(value, sidecar_arrays):
+    """Turn part of a dataset into JSON, tagging the types JSON cannot hold.
+    Numeric arrays are moved to sidecar_arrays and referred to by name"""
+    if isinstance(value, pd.DataFrame):
+        return {
+            "Frame": {
+                "Columns": encode_sidecar_value(list(value.columns), sidecar_arrays),
+                "Index": (
+                    None
+                    if value.index.equals(pd.RangeIndex(len(value)))
+                    else encode_sidecar_value(value.index.to_numpy(), sidecar_arrays)
+                ),
+                "Index_Name": value.index.name,
+                "Values": [
+                    encode_sidecar_value(
+                        value.iloc[:, column_position].to_numpy(), sidecar_arrays
+                    )
+                    for column_position in range(value.shape[1])
+                ],
+            }
+        }
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return {
+                "Object_Array": encode_sidecar_value(value.tolist(), sidecar_arrays)
+            }
+        array_name = "array_" + str(len(sidecar_arrays))
+        sidecar_arrays[array_name] = value
+        return {"Array": array_name}
+    if isinstance(value, dict):
+        return {
+            "Dict": [
+                [
+                    encode_sidecar_value(each_key, sidecar_arrays),
+                    encode_sidecar_value(each_value, sidecar_arrays),
+                ]
+                for each_key, each_value in value.items()
+            ]
+        }
+    if isinstance(value, tuple):
+        return {
+            "Tuple": [
+                encode_sidecar_value(each_value, sidecar_arrays) for each_value in value
+            ]
+        }
+    if isinstance(value, list):
+        return [
+            encode_sidecar_value(each_value, sidecar_arrays) for each_value in value
+        ]
+    if isinstance(value, datetime.datetime):
+        return {"Timestamp": pd.Timestamp(value).isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    raise TypeError("Not a valid sidecar value: " + type(value).__name__)
+
+
+def decode_sidecar_value(value, sidecar_arrays):
+    """Rebuild part of a dataset from its JSON form"""
+    if isinstance(value, list):
+        return [
+            decode_sidecar_value(each_value, sidecar_arrays) for each_value in value
+        ]
+    if not isinstance(value, dict):
+        return value
+    [(value_type, encoded_value)] = value.items()
+    if value_type == "Frame":
+        columns = decode_sidecar_value(encoded_value["Columns"], sidecar_arrays)
+        frame = pd.DataFrame(
+            {
+                column_position: decode_sidecar_value(each_column, sidecar_arrays)
+                for column_position, each_column in enumerate(encoded_value["Values"])
+            },
+            index=(
+                None
+                if encoded_value["Index"] is None
+                else decode_sidecar_value(encoded_value["Index"], sidecar_arrays)
+            ),
+        )
+        frame.columns = (
+            pd.MultiIndex.from_tuples(columns)
+            if columns
+            and all(isinstance(each_column, tuple) for each_column in columns)
+            else pd.Index(columns, dtype=object)
+        )
+        frame.index.name = encoded_value["Index_Name"]
+        return frame
+    if value_type == "Array":
+        return sidecar_arrays[encoded_value]
+    if value_type == "Object_Array":
+        object_values = decode_sidecar_value(encoded_value, sidecar_arrays)
+        # Filled one by one so tuples stay elements instead of becoming a second dimension
+        object_array = np.empty(len(object_values), dtype=object)
+        for position, each_value in enumerate(object_values):
+            object_array[position] = each_value
+        return object_array
+    if value_type == "Dict":
+        return {
+            decode_sidecar_value(each_key, sidecar_arrays): decode_sidecar_value(
+                each_value, sidecar_arrays
+            )
+            for each_key, each_value in encoded_value
+        }
+    if value_type == "Tuple":
+        return tuple(decode_sidecar_value(encoded_value, sidecar_arrays))
+    if value_type == "Timestamp":
+        return pd.Timestamp(encoded_value)
+    raise ValueError("Not a valid sidecar value type: " + value_type)
+
+
+def get_sidecar_path(dataset_hash, workbook_names):
+    """Get the sidecar directory for a dataset, or None if sidecars are disabled.
+    Several workbooks are also keyed by their names, which label the merged sheet rows
+    """
+    if not SIDECAR_DIRECTORY:
+        return None
+    sidecar_key = str(SIDECAR_FORMAT_VERSION) + "\n" + dataset_hash
+    if len(workbook_names) > 1:
+        sidecar_key += "\n" + "\n".join(workbook_names)
+    return os.path.join(
+        SIDECAR_DIRECTORY, hashlib.sha256(sidecar_key.encode("utf-8")).hexdigest()
+    )
+
+
+@timed()
+def read_dataset_sidecar(sidecar_path):
+    """Load a saved dataset with its large arrays memory-mapped read-only, or None if there is no usable sidecar"""
+    if sidecar_path is None or not os.path.isdir(sidecar_path):
+        return None
+    try:
+        with np.load(
+            os.path.join(sidecar_path, "arrays.npz"), allow_pickle=False
+        ) as array_file:
+            sidecar_arrays = {
+                array_name: array_file[array_name] for array_name in array_file.files
+            }
+        with open(
+            os.path.join(sidecar_path, "dataset.json"), encoding="utf-8"
+        ) as sidecar_file:
+            dataset = decode_sidecar_value(json.load(sidecar_file), sidecar_arrays)
+        for each_array in MAPPED_TABLE_ARRAYS:
+            dataset["Publication_Table"][each_array] = np.load(
+                os.path.join(sidecar_path, each_array + ".npy"), mmap_mode="r"
+            )
+    except Exception:
+        logger.exception("Reading sidecar %s failed", sidecar_path)
+        return None
+    return dataset
+
+
+@timed()
+def write_dataset_sidecar(sidecar_path, dataset):
+    """Save a fully attributed dataset, writing to a temporary directory first so readers
+    never see a partial sidecar"""
+    if sidecar_path is None or os.path.isdir(sidecar_path):
+        return
+    publication_table = dict(dataset["Publication_Table"])
+    stored_dataset = dict(dataset)
+    stored_dataset["Publication_Table"] = publication_table
+    staging_path = None
+    try:
+        os.makedirs(SIDECAR_DIRECTORY, mode=0o700, exist_ok=True)
+        staging_path = tempfile.mkdtemp(dir=SIDECAR_DIRECTORY, prefix=".staging-")
+        for each_array in MAPPED_TABLE_ARRAYS:
+            np.save(
+                os.path.join(staging_path, each_array + ".npy"),
+                np.ascontiguousarray(publication_table.pop(each_array)),
+                allow_pickle=False,
+            )
+        sidecar_arrays = {}
+        encoded_dataset = encode_sidecar_value(stored_dataset, sidecar_arrays)
+        np.savez(os.path.join(staging_path, "arrays.npz"), **sidecar_arrays)
+        with open(
+            os.path.join(staging_path, "dataset.json"), "w", encoding="utf-8"
+        ) as sidecar_file:
+            json.dump(encoded_dataset, sidecar_file)
+        os.rename(staging_path, sidecar_path)
+    except (OSError, TypeError) as e:
+        # Another worker finished the same sidecar first, the directory is not writable,
+        # or the dataset holds a value the sidecar cannot store
+        if staging_path is not None:
+            shutil.rmtree(staging_path, ignore_errors=True)
+        if not os.path.isdir(sidecar_path):
+            logger.warning("Writing sidecar %s failed: %s", sidecar_path, e)
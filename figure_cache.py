@@ -0,0 +1,58 @@
+## Figure Cache
+
+# Rendered figures shared by every session on the worker, so identical views are only built once
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+FIGURE_CACHE_ENTRIES = int(os.environ.get("DASHBOARD_FIGURE_CACHE_ENTRIES", "256"))
+
+# Least recently used figure first
+figure_cache: OrderedDict = OrderedDict()
+figure_cache_lock = threading.Lock()
+figure_cache_stats = {"Hits": 0, "Misses": 0, "Evictions": 0}
+
+
+def make_selection_hash(selected_names):
+    """Hash the selected author names into a short, order-preserving cache key part"""
+    joined_names = "\n".join(str(each_name) for each_name in selected_names)
+    return hashlib.sha1(joined_names.encode("utf-8")).hexdigest()
+
+
+def get_or_build_figure(cache_key, build_figure):
+    """Return the cached figure for a key, building and caching it on a miss.
+    Cached figures are shared between sessions and must not be modified after they are returned
+    """
+    with figure_cache_lock:
+        if cache_key in figure_cache:
+            figure_cache.move_to_end(cache_key)
+            figure_cache_stats["Hits"] += 1
+            return figure_cache[cache_key]
+        figure_cache_stats["Misses"] += 1
+    fig = build_figure()
+    if FIGURE_CACHE_ENTRIES <= 0:
+        return fig
+    with figure_cache_lock:
+        figure_cache[cache_key] = fig
+        figure_cache.move_to_end(cache_key)
+        while len(figure_cache) > FIGURE_CACHE_ENTRIES:
+            figure_cache.popitem(last=False)
+            figure_cache_stats["Evictions"] += 1
+    return fig
+
+
+def get_figure_cache_stats():
+    """Return the hit, miss and eviction counts along with the current cache size"""
+    with figure_cache_lock:
+        cache_stats = dict(figure_cache_stats)
+        cache_stats["Entries"] = len(figure_cache)
+    cache_stats["Capacity"] = FIGURE_CACHE_ENTRIES
+    return cache_stats
+
+
+def clear_figure_cache():
+    """Drop every cached figure"""
+    with figure_cache_lock:
+        figure_cache.clear()
@@ -0,0 +1,90 @@
+## Figure Widget Updates
+
+# Brings a displayed figure widget in line with a newly built figure by sending only what changed,
+# e.g. the one trace of an author added to the selection, instead of re-sending the whole figure
+
+import json
+
+from lazy_imports import pio
+from performance_metrics import timed
+
+# Assigned by the widget itself and never part of a built figure
+WIDGET_ONLY_PROPERTIES = {"uid"}
+
+
+def get_trace_keys(trace_specs):
+    """Key each trace by its type and name, numbering repeats so every key is unique"""
+    key_counts = {}
+    trace_keys = []
+    for each_spec in trace_specs:
+        base_key = (each_spec.get("type"), each_spec.get("name"))
+        trace_keys.append(base_key + (key_counts.get(base_key, 0),))
+        key_counts[base_key] = key_counts.get(base_key, 0) + 1
+    return trace_keys
+
+
+def get_plain_value(property_value):
+    """Convert a property value, including any arrays in it, to plain JSON values for comparison"""
+    return json.loads(pio.json.to_json_plotly(property_value))
+
+
+def get_changed_properties(current_spec, new_spec):
+    """Get the top-level properties whose values differ, with None for properties the new spec drops"""
+    changed_properties = {}
+    for each_property in set(current_spec) | set(new_spec):
+        if each_property in WIDGET_ONLY_PROPERTIES:
+            continue
+        if each_property not in new_spec:
+            changed_properties[each_property] = None
+        elif each_property not in current_spec or get_plain_value(
+            current_spec[each_property]
+        ) != get_plain_value(new_spec[each_property]):
+            changed_properties[each_property] = new_spec[each_property]
+    return changed_properties
+
+
+@timed()
+def sync_figure_widget(figure_widget, fig):
+    """Update a displayed figure widget in place to match a built figure. Traces are matched by type and name:
+    missing ones are deleted, new ones added, and matched ones only restyled where their data changed.
+    The built figure is only read, so it can come from the shared figure cache"""
+    new_specs = [each_trace.to_plotly_json() for each_trace in fig.data]
+    new_keys = get_trace_keys(new_specs)
+    current_keys = get_trace_keys(
+        [each_trace.to_plotly_json() for each_trace in figure_widget.data]
+    )
+    if set(current_keys) - set(new_keys):
+        figure_widget.data = tuple(
+            each_trace
+            for each_key, each_trace in zip(current_keys, figure_widget.data)
+            if each_key in set(new_keys)
+        )
+    added_specs = [
+        each_spec
+        for each_key, each_spec in zip(new_keys, new_specs)
+        if each_key not in set(current_keys)
+    ]
+    if added_specs:
+        figure_widget.add_traces(added_specs)
+    current_traces = dict(
+        zip(
+            get_trace_keys(
+                [each_trace.to_plotly_json() for each_trace in figure_widget.data]
+            ),
+            figure_widget.data,
+        )
+    )
+    if list(current_traces) != new_keys:
+        figure_widget.data = tuple(current_traces[each_key] for each_key in new_keys)
+    with figure_widget.batch_update():
+        for each_key, each_spec in zip(new_keys, new_specs):
+            restyled_properties = get_changed_properties(
+                current_traces[each_key].to_plotly_json(), each_spec
+            )
+            if restyled_properties:
+                current_traces[each_key].update(restyled_properties, overwrite=True)
+        relayout_properties = get_changed_properties(
+            figure_widget.layout.to_plotly_json(), fig.layout.to_plotly_json()
+        )
+        if relayout_properties:
+            figure_widget.layout.update(relayout_properties, overwrite=True)
@@ -0,0 +1,45 @@
+## Lazy Imports
+
+# pandas, numpy, plotly.express and openpyxl are only imported the first time one of their attributes is used,
+# so a worker can serve the page before any data has been loaded
+
+import time
+import importlib
+
+from performance_metrics import record_timing
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, module_name):
+        self.module_name = module_name
+        self.module = None
+
+    def load_module(self):
+        """Import the real module, recording how long the import took.
+        Not named load, which would shadow e.g. numpy.load"""
+        if self.module is None:
+            start_time = time.perf_counter()
+            self.module = importlib.import_module(self.module_name)
+            record_timing(
+                "import " + self.module_name, (time.perf_counter() - start_time) * 1000
+            )
+        return self.module
+
+    def __getattr__(self, attribute_name):
+        return getattr(self.load_module(), attribute_name)
+
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+px = LazyModule("plotly.express")
+openpyxl = LazyModule("openpyxl")
+pio = LazyModule("plotly.io")
+plotly_offline = LazyModule("plotly.offline")
+
+
+def warm_lazy_modules():
+    """Import every deferred module, e.g. from a background thread before the first upload"""
+    for each_module in (np, pd, px, openpyxl):
+        each_module.load_module()
@@ -0,0 +1,526 @@
+## Dashboard Load Test
+
+# Starts the dashboard locally and drives simulated browser sessions over the Shiny websocket protocol.
+# Run with 'python load_test.py --workbook master.xlsx --sessions 10 --actions 25' in Terminal when in the directory
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import socket
+import asyncio
+import argparse
+import datetime
+import statistics
+import subprocess
+import urllib.request
+from html.parser import HTMLParser
+
+import websockets
+
+# Inputs the browser reports when a session starts, keyed as "id" or "id:type" like the Shiny client sends them
+DEFAULT_INPUTS = {
+    "file1:shiny.file": None,
+    "alltime": False,
+    "daterange:shiny.date": ["2000-01-01", datetime.date.today().isoformat()],
+    "groupselector": [],
+    "selectauthor": [],
+    "radio": "1",
+    "count_mode": "Unique",
+    "fractional_credit": False,
+    "heatmap_measure": "Count",
+    "heatmap_change": False,
+    "compare_cohorts": [],
+    "cohort_name": "",
+    "compare_authors_a": [],
+    "compare_authors_b": [],
+    "compare_daterange_a:shiny.date": ["2015-08-01", "2018-07-31"],
+    "compare_daterange_b:shiny.date": ["2018-08-01", "2021-07-31"],
+    "drilldown_author": "",
+    "rolling_months": 12,
+    "venue_filter": [],
+    "csv_export_name": "",
+}
+
+ACTION_WEIGHTS = {
+    "toggle_author": 5,
+    "group_select": 1,
+    "date_range": 2,
+    "year_designation": 1,
+    "count_mode": 1,
+    "fractional_credit": 1,
+    "tab_switch": 2,
+}
+
+
+class DashboardPageParser(HTMLParser):
+    """Find every output on the page, the tab panes that contain it and each navset's active tab"""
+
+    def __init__(self):
+        super().__init__()
+        self.open_tags = []  # (tag, pane requirement or None) for each open element
+        self.navset_ids = {}  # data-tabsetid -> navset input id
+        self.navset_values = {}  # navset input id -> list of tab values
+        self.active_tabs = {}  # navset input id -> initially active tab value
+        self.output_panes = (
+            {}
+        )  # output id -> list of (navset id, tab value) it is nested in
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        css_classes = (attributes.get("class") or "").split()
+        pane_requirement = None
+        if "shiny-tab-input" in css_classes and attributes.get("id"):
+            self.navset_ids[attributes.get("data-tabsetid")] = attributes["id"]
+            self.navset_values.setdefault(attributes["id"], [])
+        if "tab-pane" in css_classes and attributes.get("data-value") is not None:
+            # Pane ids look like "tab-<data-tabsetid>-<index>"
+            pane_id_parts = (attributes.get("id") or "").split("-")
+            navset_id = None
+            if len(pane_id_parts) == 3:
+                navset_id = self.navset_ids.get(pane_id_parts[1])
+            if navset_id is not None:
+                pane_requirement = (navset_id, attributes["data-value"])
+                self.navset_values[navset_id].append(attributes["data-value"])
+                if "active" in css_classes:
+                    self.active_tabs[navset_id] = attributes["data-value"]
+        if attributes.get("id") and re.search(
+            r"shiny-[\w-]*output|shiny-data-frame|shiny-download-link|shinywidgets",
+            attributes.get("class") or "",
+        ):
+            self.output_panes[attributes["id"]] = [
+                requirement for _, requirement in self.open_tags if requirement
+            ]
+        if tag not in ("input", "br", "img", "meta", "link", "hr", "col", "source"):
+            self.open_tags.append((tag, pane_requirement))
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.open_tags) - 1, -1, -1):
+            if self.open_tags[index][0] == tag:
+                del self.open_tags[index:]
+                break
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of a list of values"""
+    if not values:
+        return None
+    sorted_values = sorted(values)
+    rank = math.ceil(percent / 100 * len(sorted_values)) - 1
+    rank = max(0, min(len(sorted_values) - 1, rank))
+    return sorted_values[rank]
+
+
+def summarize_latencies(latencies_ms):
+    """Return count and p50/p95/p99/max for a list of latencies"""
+    return {
+        "Count": len(latencies_ms),
+        "p50 (ms)": round(percentile(latencies_ms, 50), 1) if latencies_ms else None,
+        "p95 (ms)": round(percentile(latencies_ms, 95), 1) if latencies_ms else None,
+        "p99 (ms)": round(percentile(latencies_ms, 99), 1) if latencies_ms else None,
+        "Max (ms)": round(max(latencies_ms), 1) if latencies_ms else None,
+        "Mean (ms)": round(statistics.mean(latencies_ms), 1) if latencies_ms else None,
+    }
+
+
+class SimulatedSession:
+    """One simulated browser tab driving the dashboard"""
+
+    def __init__(self, session_number, base_url, page, options, results):
+        self.session_number = session_number
+        self.base_url = base_url
+        self.page = page
+        self.options = options
+        self.results = results
+        self.random = random.Random(options.seed + session_number)
+        self.active_tabs = dict(page.active_tabs)
+        self.author_choices = []
+        self.selected_authors = []
+        self.websocket = None
+        self.next_tag = 1
+
+    def output_visibility(self):
+        """Return the hidden flag of every output given the currently active tabs"""
+        visibility = {}
+        for output_id, pane_requirements in self.page.output_panes.items():
+            hidden = any(
+                self.active_tabs.get(navset_id) != tab_value
+                for navset_id, tab_value in pane_requirements
+            )
+            visibility[".clientdata_output_" + output_id + "_hidden"] = hidden
+        return visibility
+
+    async def receive_until_idle(self, sent_time, render_times):
+        """Wait for the server to finish reacting, echoing input updates back like a browser would.
+        Flushes that render nothing, such as timer ticks, do not count as activity"""
+        busy = False
+        rendered = False
+        last_message_time = None
+        quiet_start = time.perf_counter()
+        while True:
+            if busy:
+                timeout = self.options.render_timeout
+            else:
+                timeout = self.options.quiet - (time.perf_counter() - quiet_start)
+                if timeout <= 0:
+                    return last_message_time
+            try:
+                message = json.loads(
+                    await asyncio.wait_for(self.websocket.recv(), timeout)
+                )
+            except asyncio.TimeoutError:
+                if busy:
+                    raise
+                return last_message_time
+            now = time.perf_counter()
+            if message.get("busy") == "busy":
+                busy = True
+                rendered = False
+            elif message.get("busy") == "idle":
+                busy = False
+                if rendered:
+                    last_message_time = now
+                    quiet_start = now
+            if "values" in message and (
+                message["values"]
+                or message.get("errors")
+                or message.get("inputMessages")
+            ):
+                rendered = True
+                last_message_time = now
+                quiet_start = now
+                for output_id in list(message["values"]) + list(
+                    message.get("errors", {})
+                ):
+                    render_times.setdefault(output_id, []).append(
+                        (now - sent_time) * 1000
+                    )
+                    if output_id in message.get("errors", {}):
+                        self.results["Errors"][output_id] = message["errors"][
+                            output_id
+                        ].get("message")
+                echo_data = self.handle_input_messages(message.get("inputMessages", []))
+                if echo_data:
+                    await self.websocket.send(
+                        json.dumps({"method": "update", "data": echo_data})
+                    )
+
+    def handle_input_messages(self, input_messages):
+        """Apply server-side input updates and return what the browser would send back"""
+        echo_data = {}
+        for input_message in input_messages or []:
+            message = input_message["message"]
+            if input_message["id"] == "selectauthor" and "options" in message:
+                self.author_choices = re.findall(r'value="([^"]*)"', message["options"])
+            if "value" in message:
+                echo_data[input_message["id"]] = message["value"]
+                if input_message["id"] == "selectauthor":
+                    self.selected_authors = list(message["value"])
+            elif "start" in message and "end" in message:
+                echo_data[input_message["id"] + ":shiny.date"] = [
+                    str(message["start"])[:10],
+                    str(message["end"])[:10],
+                ]
+        return echo_data
+
+    async def perform(self, action_name, update_data):
+        """Send one input change and record how long the dashboard took to re-render"""
+        render_times = {}
+        sent_time = time.perf_counter()
+        await self.websocket.send(json.dumps({"method": "update", "data": update_data}))
+        finished_time = await self.receive_until_idle(sent_time, render_times)
+        self.results["Actions"].append(
+            {
+                "Action": action_name,
+                "Session": self.session_number,
+                "Latency_ms": (
+                    (finished_time - sent_time) * 1000
+                    if finished_time is not None
+                    else None
+                ),
+                "Renders": render_times,
+            }
+        )
+
+    async def upload_workbook(self):
+        """Upload the master file through the same endpoints as the file input"""
+        file_infos = [
+            {
+                "name": os.path.basename(self.options.workbook),
+                "size": os.path.getsize(self.options.workbook),
+                "type": "",
+            }
+        ]
+        await self.websocket.send(
+            json.dumps(
+                {"method": "uploadInit", "args": [file_infos], "tag": self.next_tag}
+            )
+        )
+        self.next_tag += 1
+        while True:
+            message = json.loads(await self.websocket.recv())
+            if "response" in message:
+                break
+        upload_url = self.base_url + message["response"]["value"]["uploadUrl"]
+        with open(self.options.workbook, "rb") as workbook_file:
+            workbook_bytes = workbook_file.read()
+        await asyncio.to_thread(
+            lambda: urllib.request.urlopen(
+                urllib.request.Request(upload_url, data=workbook_bytes, method="POST")
+            ).read()
+        )
+        render_times = {}
+        sent_time = time.perf_counter()
+        await self.websocket.send(
+            json.dumps(
+                {
+                    "method": "uploadEnd",
+                    "args": [message["response"]["value"]["jobId"], "file1"],
+                    "tag": self.next_tag,
+                }
+            )
+        )
+        self.next_tag += 1
+        finished_time = await self.receive_until_idle(sent_time, render_times)
+        self.results["Actions"].append(
+            {
+                "Action": "upload",
+                "Session": self.session_number,
+                "Latency_ms": (
+                    (finished_time - sent_time) * 1000 if finished_time else None
+                ),
+                "Renders": render_times,
+            }
+        )
+
+    def choose_action(self):
+        """Pick a random user interaction and the input update it sends"""
+        action_name = self.random.choices(
+            list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values())
+        )[0]
+        if action_name == "toggle_author" and self.author_choices:
+            author = self.random.choice(self.author_choices)
+            if author in self.selected_authors:
+                self.selected_authors.remove(author)
+            else:
+                self.selected_authors.append(author)
+            return action_name, {"selectauthor": list(self.selected_authors)}
+        if action_name == "group_select":
+            return action_name, {
+                "groupselector": [self.random.choice(["All", "Still at NYIT"])]
+            }
+        if action_name == "date_range":
+            start_year = self.random.randint(2000, 2015)
+            end_year = self.random.randint(start_year + 3, datetime.date.today().year)
+            return action_name, {
+                "daterange:shiny.date": [
+                    str(start_year) + "-01-01",
+                    str(end_year) + "-12-31",
+                ]
+            }
+        if action_name == "year_designation":
+            return action_name, {"radio": self.random.choice(["1", "2", "3"])}
+        if action_name == "count_mode":
+            return action_name, {
+                "count_mode": self.random.choice(["Unique", "Attributed"])
+            }
+        if action_name == "fractional_credit":
+            return action_name, {"fractional_credit": self.random.random() < 0.5}
+        navset_id = self.random.choice(sorted(self.page.navset_values))
+        self.active_tabs[navset_id] = self.random.choice(
+            self.page.navset_values[navset_id]
+        )
+        update_data = {navset_id: self.active_tabs[navset_id]}
+        update_data.update(self.output_visibility())
+        return "tab_switch", update_data
+
+    async def run(self):
+        """Connect, upload the workbook and perform the configured number of actions"""
+        websocket_url = self.base_url.replace("http://", "ws://") + "websocket/"
+        async with websockets.connect(websocket_url, max_size=None) as websocket:
+            self.websocket = websocket
+            json.loads(await websocket.recv())
+            init_data = dict(DEFAULT_INPUTS)
+            init_data.update(self.active_tabs)
+            init_data.update(self.output_visibility())
+            await websocket.send(json.dumps({"method": "init", "data": init_data}))
+            await self.receive_until_idle(time.perf_counter(), {})
+            await self.upload_workbook()
+            await self.perform("group_select", {"groupselector": ["Still at NYIT"]})
+            for _ in range(self.options.actions):
+                await asyncio.sleep(self.random.uniform(0, self.options.think_time))
+                action_name, update_data = self.choose_action()
+                await self.perform(action_name, update_data)
+
+
+def find_free_port():
+    """Ask the OS for an unused localhost port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_dashboard(app_path, port):
+    """Start the dashboard with 'shiny run' and wait until it serves the page"""
+    server_process = subprocess.Popen(
+        [sys.executable, "-m", "shiny", "run", "--port", str(port), app_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen("http://127.0.0.1:" + str(port) + "/").read()
+            return server_process
+        except OSError:
+            time.sleep(0.2)
+    server_process.terminate()
+    raise RuntimeError("Dashboard did not start on port " + str(port))
+
+
+def build_report(results, wall_seconds, options):
+    """Aggregate the recorded actions into latency percentiles and throughput"""
+    action_latencies = {}
+    render_latencies = {}
+    for each_action in results["Actions"]:
+        if each_action["Latency_ms"] is not None:
+            action_latencies.setdefault(each_action["Action"], []).append(
+                each_action["Latency_ms"]
+            )
+        for output_id, latencies in each_action["Renders"].items():
+            render_latencies.setdefault(output_id, []).extend(latencies)
+    interaction_latencies = [
+        latency
+        for action_name, latencies in action_latencies.items()
+        if action_name != "upload"
+        for latency in latencies
+    ]
+    total_renders = sum(len(latencies) for latencies in render_latencies.values())
+    return {
+        "Sessions": options.sessions,
+        "Actions_Per_Session": options.actions,
+        "Wall_Time_s": round(wall_seconds, 2),
+        "Throughput_Actions_per_s": round(len(results["Actions"]) / wall_seconds, 2),
+        "Throughput_Renders_per_s": round(total_renders / wall_seconds, 2),
+        "Interactions": summarize_latencies(interaction_latencies),
+        "By_Action": {
+            action_name: summarize_latencies(latencies)
+            for action_name, latencies in sorted(action_latencies.items())
+        },
+        "By_Output": {
+            output_id: summarize_latencies(latencies)
+            for output_id, latencies in sorted(render_latencies.items())
+        },
+        "Errors": results["Errors"],
+    }
+
+
+def print_report(report):
+    """Print the load test report as aligned tables"""
+    print()
+    print(
+        "Sessions: "
+        + str(report["Sessions"])
+        + "   Wall time: "
+        + str(report["Wall_Time_s"])
+        + " s   Throughput: "
+        + str(report["Throughput_Actions_per_s"])
+        + " actions/s, "
+        + str(report["Throughput_Renders_per_s"])
+        + " renders/s"
+    )
+    for title, rows in (
+        ("All interactions", {"interactions": report["Interactions"]}),
+        ("By action", report["By_Action"]),
+        ("By output (time from input change to value)", report["By_Output"]),
+    ):
+        print()
+        print(title)
+        print(
+            "  {:<40} {:>7} {:>10} {:>10} {:>10} {:>10}".format(
+                "", "count", "p50 ms", "p95 ms", "p99 ms", "max ms"
+            )
+        )
+        for name, row in rows.items():
+            print(
+                "  {:<40} {:>7} {:>10} {:>10} {:>10} {:>10}".format(
+                    name[:40],
+                    row["Count"],
+                    str(row["p50 (ms)"]),
+                    str(row["p95 (ms)"]),
+                    str(row["p99 (ms)"]),
+                    str(row["Max (ms)"]),
+                )
+            )
+    if report["Errors"]:
+        print()
+        print("Output errors")
+        for output_id, error_message in report["Errors"].items():
+            print("  " + output_id + ": " + str(error_message))
+
+
+async def run_sessions(base_url, page, options):
+    """Run every simulated session concurrently"""
+    results = {"Actions": [], "Errors": {}}
+    sessions = [
+        SimulatedSession(session_number, base_url, page, options, results)
+        for session_number in range(options.sessions)
+    ]
+    start_time = time.perf_counter()
+    await asyncio.gather(*(each_session.run() for each_session in sessions))
+    return results, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive simulated dashboard sessions against a local server"
+    )
+    parser.add_argument("--workbook", required=True, help="Master .xlsx to upload")
+    parser.add_argument("--sessions", type=int, default=5, help="Concurrent sessions")
+    parser.add_argument("--actions", type=int, default=20, help="Actions per session")
+    parser.add_argument(
+        "--think-time", type=float, default=0.5, help="Max seconds between actions"
+    )
+    parser.add_argument(
+        "--quiet",
+        type=float,
+        default=1.0,
+        help="Seconds without a busy message before an action counts as finished",
+    )
+    parser.add_argument(
+        "--render-timeout", type=float, default=120, help="Seconds to wait for idle"
+    )
+    parser.add_argument("--app", default="app.py", help="Dashboard file to start")
+    parser.add_argument(
+        "--port", type=int, default=None, help="Use an already running local dashboard"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="Also write the report here")
+    options = parser.parse_args()
+
+    server_process = None
+    port = options.port
+    if port is None:
+        port = find_free_port()
+        server_process = start_dashboard(options.app, port)
+    base_url = "http://127.0.0.1:" + str(port) + "/"
+    try:
+        page = DashboardPageParser()
+        page.feed(urllib.request.urlopen(base_url).read().decode("utf-8"))
+        results, wall_seconds = asyncio.run(run_sessions(base_url, page, options))
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.wait()
+    report = build_report(results, wall_seconds, options)
+    print_report(report)
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as json_file:
+            json.dump(report, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+## Normalized Name Index
+
+# Every way a publisher can be cited (their name with or without hyphens and accents, plus any aliases from the
+# workbook's "Aliases" sheet) compiled into one lookup, so attribution is a single pass over each citation
+# however many variants there are
+
+import re
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from performance_metrics import timed
+
+# Compiled indexes kept per worker, so later uploads with the same publishers and aliases reuse them
+NAME_INDEX_CACHE_ENTRIES = 16
+# Letters and digits in any script, so "O'Brien-Núñez" splits into "o", "brien", "nunez"
+NAME_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+name_index_cache: OrderedDict = OrderedDict()
+name_index_lock = threading.Lock()
+
+
+def normalize_name_text(text):
+    """Lowercase text with diacritics removed, e.g. 'Müller' to 'muller'"""
+    decomposed_text = unicodedata.normalize("NFKD", str(text))
+    return "".join(
+        each_character
+        for each_character in decomposed_text
+        if not unicodedata.combining(each_character)
+    ).lower()
+
+
+def tokenize_name_text(text):
+    """Split normalized text into its words, dropping punctuation, hyphens and spaces"""
+    return tuple(NAME_TOKEN_PATTERN.findall(normalize_name_text(text)))
+
+
+def get_name_keys(last_name, first_name):
+    """Get the lookup keys a cited name can appear under: the surname's words followed by a word starting
+    with the first initial, as in "Smith J", "Smith JM" or "Smith, J.". Multi-word surnames also match
+    written as one word, e.g. "Smith-Jones" as "SmithJones" """
+    surname_tokens = tokenize_name_text(last_name)
+    first_tokens = tokenize_name_text(first_name)
+    if not surname_tokens or not first_tokens:
+        return []
+    first_initial = first_tokens[0][0]
+    name_keys = [(surname_tokens, first_initial)]
+    if len(surname_tokens) > 1:
+        name_keys.append((("".join(surname_tokens),), first_initial))
+    return name_keys
+
+
+@timed()
+def build_name_index(name_variants):
+    """Compile (publisher key, last name, first name) variants into a lookup from cited name to publishers"""
+    name_lookup = {}
+    for each_publisher, last_name, first_name in name_variants:
+        for each_key in get_name_keys(last_name, first_name):
+            name_lookup.setdefault(each_key, set()).add(each_publisher)
+    return {
+        "Lookup": {
+            each_key: tuple(sorted(publishers))
+            for each_key, publishers in name_lookup.items()
+        },  # (Surname words, first initial) -> publisher keys - Dictionary
+        "Surname_Starts": {
+            each_key[0][0] for each_key in name_lookup
+        },  # First word of every surname - Set of Strings
+        "Surname_Lengths": sorted(
+            {len(each_key[0]) for each_key in name_lookup}
+        ),  # Words per surname - List of Integers
+    }
+
+
+def get_name_index(name_variants):
+    """Return the compiled index for a set of name variants, building it only if no upload has yet"""
+    variants_hash = hashlib.sha1(
+        "\n".join(
+            "\t".join(str(each_part) for each_part in each_variant)
+            for each_variant in sorted(name_variants)
+        ).encode("utf-8")
+    ).hexdigest()
+    with name_index_lock:
+        if variants_hash in name_index_cache:
+            name_index_cache.move_to_end(variants_hash)
+            return name_index_cache[variants_hash]
+    name_index = build_name_index(name_variants)
+    with name_index_lock:
+        name_index_cache[variants_hash] = name_index
+        while len(name_index_cache) > NAME_INDEX_CACHE_ENTRIES:
+            name_index_cache.popitem(last=False)
+    return name_index
+
+
+def find_cited_publishers(name_index, citation):
+    """Find every indexed publisher named in a citation with one pass over its words"""
+    citation_tokens = tokenize_name_text(citation)
+    cited_publishers = set()
+    for token_index, each_token in enumerate(citation_tokens):
+        if each_token not in name_index["Surname_Starts"]:
+            continue
+        for surname_length in name_index["Surname_Lengths"]:
+            initial_index = token_index + surname_length
+            if initial_index >= len(citation_tokens):
+                break
+            cited_publishers.update(
+                name_index["Lookup"].get(
+                    (
+                        citation_tokens[token_index:initial_index],
+                        citation_tokens[initial_index][0],
+                    ),
+                    (),
+                )
+            )
+    return cited_publishers
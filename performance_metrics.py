@@ -0,0 +1,143 @@
+## Performance Metrics
+
+# Shared by every session on the worker, so it lives outside app.py (which Shiny Express re-runs per session)
+
+import json
+import time
+import socket
+import datetime
+import functools
+import threading
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+timing_records: dict = {}
+timing_lock = threading.Lock()
+metrics_started = datetime.datetime.now()
+
+
+def record_timing(function_name, elapsed_ms):
+    """Add one call of a function to its latency histogram and call count"""
+    with timing_lock:
+        if function_name not in timing_records:
+            timing_records[function_name] = {
+                "Calls": 0,  # Number of timed calls - Integer
+                "Total_ms": 0.0,  # Sum of all call latencies - Float
+                "Min_ms": None,  # Fastest call - Float
+                "Max_ms": 0.0,  # Slowest call - Float
+                "Bucket_Counts": [0] * (len(LATENCY_BUCKETS_MS) + 1),  # Calls per latency bucket, last is overflow - List of Integers
+            }
+        record = timing_records[function_name]
+        record["Calls"] += 1
+        record["Total_ms"] += elapsed_ms
+        if record["Min_ms"] is None or elapsed_ms < record["Min_ms"]:
+            record["Min_ms"] = elapsed_ms
+        if elapsed_ms > record["Max_ms"]:
+            record["Max_ms"] = elapsed_ms
+        bucket_index = len(LATENCY_BUCKETS_MS)
+        for index, bucket_upper in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bucket_upper:
+                bucket_index = index
+                break
+        record["Bucket_Counts"][bucket_index] += 1
+
+
+def timed(function_name=None):
+    """Decorator that records the wall time of every call to the wrapped function"""
+
+    def decorator(func):
+        record_name = function_name if function_name is not None else func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_timing(record_name, (time.perf_counter() - start_time) * 1000)
+
+        return wrapper
+
+    return decorator
+
+
+def get_bucket_labels():
+    """Return a display label for each latency bucket, including the overflow bucket"""
+    bucket_labels = []
+    lower_bound = 0
+    for bucket_upper in LATENCY_BUCKETS_MS:
+        bucket_labels.append(str(lower_bound) + "-" + str(bucket_upper) + " ms")
+        lower_bound = bucket_upper
+    bucket_labels.append(">" + str(LATENCY_BUCKETS_MS[-1]) + " ms")
+    return bucket_labels
+
+
+def estimate_percentile(bucket_counts, percentile):
+    """Estimate a latency percentile as the upper bound of the bucket it falls in"""
+    total_calls = sum(bucket_counts)
+    if total_calls == 0:
+        return None
+    running_count = 0
+    for index, each_count in enumerate(bucket_counts):
+        running_count += each_count
+        if running_count >= total_calls * percentile / 100:
+            if index < len(LATENCY_BUCKETS_MS):
+                return float(LATENCY_BUCKETS_MS[index])
+            return float("inf")
+    return float("inf")
+
+
+def get_timing_summary():
+    """Return one row per instrumented function, slowest mean first"""
+    with timing_lock:
+        records_copy = {
+            name: dict(record, Bucket_Counts=list(record["Bucket_Counts"]))
+            for name, record in timing_records.items()
+        }
+    summary_rows = []
+    for function_name, record in records_copy.items():
+        summary_rows.append(
+            {
+                "Function": function_name,
+                "Calls": record["Calls"],
+                "Mean (ms)": round(record["Total_ms"] / record["Calls"], 2),
+                "Min (ms)": round(record["Min_ms"], 2),
+                "Max (ms)": round(record["Max_ms"], 2),
+                "p50 (ms)": estimate_percentile(record["Bucket_Counts"], 50),
+                "p95 (ms)": estimate_percentile(record["Bucket_Counts"], 95),
+                "Total (ms)": round(record["Total_ms"], 2),
+            }
+        )
+    return sorted(summary_rows, key=lambda row: row["Mean (ms)"], reverse=True)
+
+
+def get_timing_histogram(function_name):
+    """Return the bucket labels and call counts recorded for one function"""
+    with timing_lock:
+        if function_name not in timing_records:
+            return get_bucket_labels(), [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        bucket_counts = list(timing_records[function_name]["Bucket_Counts"])
+    return get_bucket_labels(), bucket_counts
+
+
+def export_timings_json():
+    """Serialize all timing records as JSON so deployments can be compared"""
+    with timing_lock:
+        records_copy = {
+            name: dict(record, Bucket_Counts=list(record["Bucket_Counts"]))
+            for name, record in timing_records.items()
+        }
+    export_data = {
+        "Host": socket.gethostname(),
+        "Metrics_Started": metrics_started.isoformat(timespec="seconds"),
+        "Exported": datetime.datetime.now().isoformat(timespec="seconds"),
+        "Bucket_Upper_Bounds_ms": list(LATENCY_BUCKETS_MS),
+        "Functions": records_copy,
+    }
+    return json.dumps(export_data, indent=2)
+
+
+def reset_timings():
+    """Clear every timing record"""
+    with timing_lock:
+        timing_records.clear()
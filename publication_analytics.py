@@ -0,0 +1,125 @@
+## Publication Analytics
+
+# Vectorized aggregates over the publication table, computed for every selected publisher at once
+
+from lazy_imports import np
+from publication_data import get_selected_publication_mask
+
+
+def get_publisher_columns(publication_table, selected_publishers):
+    """Get the Author_Matrix column of each selected publisher, in selection order"""
+    author_positions = {
+        each_key: position
+        for position, each_key in enumerate(publication_table["Author_Keys"])
+    }
+    return np.array(
+        [author_positions[each_publisher] for each_publisher in selected_publishers],
+        dtype=np.int64,
+    )
+
+
+def get_period_count_matrix(
+    publication_table,
+    selected_publishers,
+    period_edges,
+    publication_filter=None,
+    fractional_credit=False,
+):
+    """Count publications per period as a periods x publishers matrix, along with the department's
+    unique publications per period. Period i covers period_edges[i] <= date < period_edges[i + 1],
+    publication_filter optionally flags the only publications to count, and fractional_credit
+    counts each publication as 1/k for each of its k department co-authors
+    """
+    edges = np.array(period_edges, dtype="datetime64[ns]")
+    period_count = max(len(edges) - 1, 0)
+    # Publications outside the edges (or without a date) fall at index -1 or period_count
+    period_index = np.searchsorted(edges, publication_table["Dates"], side="right") - 1
+    in_periods = (period_index >= 0) & (period_index < period_count)
+    if publication_filter is not None:
+        in_periods &= publication_filter
+    publisher_columns = get_publisher_columns(publication_table, selected_publishers)
+    author_credit = publication_table["Author_Matrix"]
+    if fractional_credit:
+        author_credit = publication_table["Credit_Matrix"]
+    author_counts = np.zeros(
+        (period_count, len(publisher_columns)),
+        dtype=np.float64 if fractional_credit else np.int64,
+    )
+    np.add.at(
+        author_counts,
+        period_index[in_periods],
+        author_credit[np.ix_(in_periods, publisher_columns)],
+    )
+    selected_publications = get_selected_publication_mask(
+        publication_table, selected_publishers
+    )
+    department_counts = np.bincount(
+        period_index[in_periods & selected_publications], minlength=period_count
+    )
+    return author_counts, department_counts
+
+
+def rolling_window_rate(period_counts, window_periods):
+    """Average count per period over a trailing window, for every column at once by differencing
+    the cumulative sums. The first periods average over however many periods are available
+    """
+    period_counts = np.asarray(period_counts, dtype=float)
+    period_count = period_counts.shape[0]
+    cumulative_counts = np.concatenate(
+        [np.zeros((1,) + period_counts.shape[1:]), np.cumsum(period_counts, axis=0)]
+    )
+    window_ends = np.arange(1, period_count + 1)
+    window_starts = np.maximum(window_ends - window_periods, 0)
+    window_sums = cumulative_counts[window_ends] - cumulative_counts[window_starts]
+    window_lengths = (window_ends - window_starts).reshape(
+        (-1,) + (1,) * (period_counts.ndim - 1)
+    )
+    return window_sums / window_lengths
+
+
+def get_efficiency_matrix(period_counts, research_percents):
+    """Divide a periods x publishers count matrix by the matching research percents,
+    with 0 wherever a publisher has no research percent for the period"""
+    period_counts = np.asarray(period_counts, dtype=float)
+    return np.divide(
+        period_counts,
+        research_percents,
+        out=np.zeros_like(period_counts),
+        where=research_percents != 0,
+    )
+
+
+def get_mean_efficiency(period_counts, research_percents):
+    """Average each publisher's per-period efficiency over the periods with a recorded research percent,
+    0 for publishers with none"""
+    research_percents = np.asarray(research_percents, dtype=float)
+    recorded_periods = (research_percents != 0).sum(axis=0)
+    return np.divide(
+        get_efficiency_matrix(period_counts, research_percents).sum(axis=0),
+        recorded_periods,
+        out=np.zeros(research_percents.shape[1:]),
+        where=recorded_periods != 0,
+    )
+
+
+def get_period_changes(period_values):
+    """Change of every column from each period to the next as one whole-matrix difference,
+    so the result has one period fewer than the values"""
+    return np.diff(np.asarray(period_values, dtype=float), axis=0)
+
+
+def fit_linear_trends(period_counts, projection_periods=0):
+    """Fit a least-squares line through every column of a periods x publishers count matrix in one solve,
+    returning each column's slope and its trend values over the periods plus the projected ones
+    """
+    period_counts = np.asarray(period_counts, dtype=float)
+    period_count = period_counts.shape[0]
+    design_matrix = np.column_stack(
+        [np.ones(period_count), np.arange(period_count, dtype=float)]
+    )
+    coefficients = np.linalg.lstsq(design_matrix, period_counts, rcond=None)[0]
+    trend_positions = np.arange(period_count + projection_periods, dtype=float)
+    trend_values = (
+        np.column_stack([np.ones(len(trend_positions)), trend_positions]) @ coefficients
+    )
+    return coefficients[1], trend_values
@@ -0,0 +1,743 @@
+## Publication Data Ingestion
+
+# Session-independent workbook parsing and attribution, importable by app.py and by the shared preload
+
+import os
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy_imports import np, pd
+from performance_metrics import timed
+from workbook_validation import (
+    WorkbookValidationError,
+    validate_workbook,
+    validate_publication_dates,
+)
+from name_index import get_name_index, find_cited_publishers
+from dataset_sidecar import (
+    get_sidecar_path,
+    read_dataset_sidecar,
+    write_dataset_sidecar,
+)
+
+INGEST_CHUNK_ROWS = int(os.environ.get("DASHBOARD_INGEST_CHUNK_ROWS", "250"))
+# Optional sheet of "Last Name", "First Name", "Alias Last Name" and "Alias First Name" columns
+ALIAS_SHEET = "Aliases"
+PERCENT_SUPER_HEADER = "Research %, Based on fall semester (e.g. 2003/2004 academic year is considered 2003)"
+# "Authors. Title. Venue. Year Month;Volume(Issue):Pages." as in the Citation column
+CITATION_PATTERN = re.compile(
+    r"(?:^|\.\s+)(?P<Venue>[^.]+?)\.\s+(?P<Year>(?:19|20)\d{2})[^;.]*;\s*(?P<Volume>[^(:;.\s]+)?"
+)
+DOI_PREFIX_PATTERN = re.compile(
+    r"^(https?://)?(dx\.)?doi\.org/|^doi:\s*", re.IGNORECASE
+)
+
+
+@timed()
+def read_excel_all_data(datapath):
+    """Read in the raw publication data that includes all the publications"""
+    all_raw_data = pd.read_excel(datapath, sheet_name="All Data", index_col=None)
+    return all_raw_data
+
+
+@timed()
+def read_excel_publisher_data(datapath):
+    """Read in the raw publisher data detailing names and research percentages"""
+    publisher_raw_data = pd.read_excel(
+        datapath, sheet_name="Publishers", index_col=None, header=[0, 1]
+    )
+    return publisher_raw_data
+
+
+@timed()
+def read_excel_alias_data(datapath):
+    """Read in the other names publishers are cited under, None if the workbook has no "Aliases" sheet"""
+    if ALIAS_SHEET not in datapath.sheet_names:
+        return None
+    alias_raw_data = pd.read_excel(datapath, sheet_name=ALIAS_SHEET, index_col=None)
+    return alias_raw_data
+
+
+def normalize_doi(doi):
+    """Reduce a DOI to its lowercase bare form, e.g. 'https://doi.org/10.1/ABC' to '10.1/abc'"""
+    if doi is None or pd.isna(doi):
+        return None
+    normalized_doi = DOI_PREFIX_PATTERN.sub("", str(doi).strip()).strip().lower()
+    return normalized_doi if normalized_doi else None
+
+
+def normalize_citation(citation):
+    """Reduce a citation to lowercase single-spaced text for matching repeated entries without a DOI"""
+    if citation is None or pd.isna(citation):
+        return None
+    normalized_citation = " ".join(str(citation).lower().split())
+    return normalized_citation if normalized_citation else None
+
+
+def get_sheet_row_label(position, sheet_row_labels):
+    """Label a row of the merged "All Data" sheets by its workbook row"""
+    if sheet_row_labels is not None:
+        return sheet_row_labels[position]
+    # Header is on the first sheet row
+    return str(position + 2)
+
+
+@timed()
+def deduplicate_publications(all_raw_data, sheet_row_labels=None):
+    """Collapse rows describing the same publication in one pass over the sheet, keyed by normalized DOI
+    (or citation text when there is no DOI), and index the remaining publications by Publication_ID.
+    Also returns the sheet rows of publications that still have no print date
+    """
+    dedup_index = {}  # ("DOI" or "Citation", normalized value) -> Publication_ID
+    doi_index = {}  # Normalized DOI -> Publication_ID
+    matched_on = []  # Publication_ID -> "DOI" or "Citation"
+    sheet_positions = []  # Publication_ID -> sheet row positions describing it
+    publication_ids = []
+    for position, (doi, citation) in enumerate(
+        zip(all_raw_data["DOI"], all_raw_data["Citation"])
+    ):
+        normalized_doi = normalize_doi(doi)
+        if normalized_doi is not None:
+            dedup_key = ("DOI", normalized_doi)
+        elif normalize_citation(citation) is not None:
+            dedup_key = ("Citation", normalize_citation(citation))
+        else:
+            dedup_key = ("Row", position)
+        publication_id = dedup_index.get(dedup_key)
+        if publication_id is None:
+            publication_id = len(sheet_positions)
+            dedup_index[dedup_key] = publication_id
+            matched_on.append(dedup_key[0])
+            sheet_positions.append([])
+            if normalized_doi is not None:
+                doi_index[normalized_doi] = publication_id
+        sheet_positions[publication_id].append(position)
+        publication_ids.append(publication_id)
+    # Keep the first row of each publication, filling its gaps (e.g. a missing print date) from the duplicates
+    deduplicated_data = all_raw_data.groupby(
+        np.array(publication_ids, dtype=np.int64), sort=True
+    ).first()
+    deduplicated_data = deduplicated_data[all_raw_data.columns]
+    deduplicated_data.index.name = "Publication_ID"
+    # A print date none of the duplicates had falls back to the online date
+    missing_print_dates = deduplicated_data["Print Published"].isna()
+    if missing_print_dates.any() and "Online published" in deduplicated_data.columns:
+        deduplicated_data.loc[missing_print_dates, "Print Published"] = pd.to_datetime(
+            deduplicated_data.loc[missing_print_dates, "Online published"],
+            errors="coerce",
+        )
+    undated_sheet_rows = [
+        get_sheet_row_label(each_position, sheet_row_labels)
+        for publication_id in np.flatnonzero(
+            deduplicated_data["Print Published"].isna().to_numpy()
+        )
+        for each_position in sheet_positions[publication_id]
+    ]
+    duplicate_report = []
+    for publication_id, positions in enumerate(sheet_positions):
+        if len(positions) > 1:
+            duplicate_report.append(
+                {
+                    "Publication ID": publication_id,
+                    "Matched On": matched_on[publication_id],
+                    "DOI": deduplicated_data.at[publication_id, "DOI"],
+                    "Merged Sheet Rows": ", ".join(
+                        get_sheet_row_label(each_position, sheet_row_labels)
+                        for each_position in positions
+                    ),
+                    "Citation": deduplicated_data.at[publication_id, "Citation"],
+                }
+            )
+    return deduplicated_data, doi_index, duplicate_report, undated_sheet_rows
+
+
+def check_publisher_repeats(publisher_names_full):
+    """Check for publisher name repeats and assign numbers to names if
+    a name appears more than once"""
+    publisher_list = []
+    for each_name in publisher_names_full:
+        publisher_list.append(each_name[1])
+    name_counts = []
+    for each_name in publisher_list:
+        if publisher_list.count(each_name) > 1:
+            if each_name not in name_counts:
+                name_counts.append(each_name)
+    if len(name_counts) > 0:
+        for each_repeat_name in name_counts:
+            repeat_count = 1
+            for index, each_name in enumerate(publisher_list):
+                if publisher_list[index] == each_repeat_name:
+                    publisher_list[index] = each_name + "_" + str(repeat_count)
+                    repeat_count += 1
+    return publisher_list, name_counts
+
+
+def create_publisher_tuplelist(publisher_raw_data, first_last=True):
+    """Create a tuple with each publisher name as ('first name','last name') or ('last name','first name')"""
+    if first_last is True:
+        publisher_names_full = tuple(
+            zip(
+                list(publisher_raw_data[publisher_raw_data.columns[0]]),
+                list(publisher_raw_data[publisher_raw_data.columns[1]]),
+            )
+        )
+    elif first_last is False:
+        publisher_names_full = tuple(
+            zip(
+                list(publisher_raw_data[publisher_raw_data.columns[1]]),
+                list(publisher_raw_data[publisher_raw_data.columns[0]]),
+            )
+        )
+    else:
+        raise ValueError("Not a valid option. Need true or false for first_last")
+    return publisher_names_full
+
+
+def get_publisher_column_labels(publisher_raw_data):
+    """Flatten the two header rows of the publisher sheet into one label per column, keeping the name of
+    each info column and labeling each research percent column by its year"""
+    return [
+        (
+            str(each_column[1]) + " Research %"
+            if each_column[0] == PERCENT_SUPER_HEADER
+            else each_column[0]
+        )
+        for each_column in publisher_raw_data.columns
+    ]
+
+
+def get_newest_publication_date(publish_data_dict):
+    """Get the date of the newest publication attributed to any publisher"""
+    newest_publication_date = None
+    for each_publisher_data in publish_data_dict.values():
+        for each_publication in each_publisher_data["Author_Publications"]:
+            if (
+                newest_publication_date is None
+                or each_publication[0] > newest_publication_date
+            ):
+                newest_publication_date = each_publication[0]
+    return newest_publication_date
+
+
+def get_top_publishers(publish_data_dict, top_count=5):
+    """Rank the publishers by publications attributed so far, returning up to top_count
+    (rank, display name, publications) tuples, fewer if there are fewer publishers"""
+    sorted_publishers = sorted(
+        publish_data_dict.values(),
+        key=lambda publisher_data: publisher_data["Publication_Amount"],
+        reverse=True,
+    )
+    return [
+        (rank + 1, publisher_data["Display_Name"], publisher_data["Publication_Amount"])
+        for rank, publisher_data in enumerate(sorted_publishers[:top_count])
+    ]
+
+
+def get_name_variants(publish_data_dict, indexed_publishers, alias_raw_data):
+    """List every (publisher key, last name, first name) a publisher may be cited under: their own name
+    and each row of the "Aliases" sheet naming them. Alias rows without a first name keep the publisher's
+    """
+    name_variants = [
+        (
+            each_publisher,
+            publish_data_dict[each_publisher]["Search_Name_Last"],
+            publish_data_dict[each_publisher]["Search_Name_First"],
+        )
+        for each_publisher in indexed_publishers
+    ]
+    if alias_raw_data is None:
+        return name_variants
+    publisher_keys = {
+        (
+            str(publish_data_dict[each_publisher]["Search_Name_Last"]).strip().lower(),
+            str(publish_data_dict[each_publisher]["Search_Name_First"]).strip().lower(),
+        ): each_publisher
+        for each_publisher in indexed_publishers
+    }
+    for last_name, first_name, alias_last_name, alias_first_name in zip(
+        alias_raw_data["Last Name"],
+        alias_raw_data["First Name"],
+        alias_raw_data["Alias Last Name"],
+        alias_raw_data["Alias First Name"],
+    ):
+        each_publisher = publisher_keys.get(
+            (str(last_name).strip().lower(), str(first_name).strip().lower())
+        )
+        if each_publisher is None:
+            continue
+        if pd.isna(alias_first_name) or not str(alias_first_name).strip():
+            alias_first_name = first_name
+        name_variants.append((each_publisher, alias_last_name, alias_first_name))
+    return name_variants
+
+
+@timed()
+def attribute_publication_chunk(
+    data_chunk, name_index, attributed_publications, attributed_publication_ids
+):
+    """Attribute one chunk of "All Data" rows to every publisher named in each citation"""
+    for index, print_published, doi, citation in zip(
+        data_chunk.index,
+        data_chunk["Print Published"],
+        data_chunk["DOI"],
+        data_chunk["Citation"],
+    ):
+        for each_publisher in find_cited_publishers(name_index, citation):
+            attributed_publications[each_publisher].append(
+                (print_published, doi, citation)
+            )
+            attributed_publication_ids[each_publisher].append(index)
+
+
+def get_optional_cell(row, column):
+    """Read a publisher's cell in an optional "Publishers" column, or None if the sheet has no such column"""
+    if column not in row.index.get_level_values(0):
+        return None
+    return row[column].tolist()[0]
+
+
+def iter_publish_data(
+    all_raw_data, publisher_raw_data, chunk_rows=None, alias_raw_data=None
+):
+    """Create a dictionary with all publishers and their corresponding publications and other assigned information,
+    yielding it with the number of rows attributed so far after each chunk of rows.
+    Research percents are only filled in on the final yield, once every row is attributed
+    """
+    publish_data_dict = {}
+    publisher_names_full = create_publisher_tuplelist(publisher_raw_data)
+    if all_raw_data is not None:
+        if publisher_raw_data is not None:
+            all_data = all_raw_data.drop(
+                ["Online published", "Number of NYIT \nStudent Authors"], axis=1
+            )
+            publisher_data = publisher_raw_data.sort_index(axis=1).drop(
+                [PERCENT_SUPER_HEADER],
+                axis=1,
+            )
+            publisher_list, name_counts = check_publisher_repeats(publisher_names_full)
+            indexed_publishers = []
+
+            for index, each_publisher in enumerate(publisher_list):
+                # Use Default Dictionary Values to replace this
+                publish_data_dict[each_publisher] = {
+                    "Search_Name_Last": publisher_names_full[index][
+                        1
+                    ],  # Publisher Last Name - String
+                    "Search_Name_First": publisher_names_full[index][
+                        0
+                    ],  # Publisher First Name - String
+                    "Search_Name_Middle_I": None,  # Publisher Middle Initial - String
+                    "Display_Name": publisher_names_full[index][1]
+                    + ", "
+                    + publisher_names_full[index][0],  # Whole Display Name - String
+                    "Publication_IDs": np.array(
+                        [], dtype=np.int64
+                    ),  # Publication_IDs of the attributed publications - Array of Integers
+                    "Author_Publications": (),  # All Publications attributed to Publisher - Tuple of Tuples that include Date,DOI, & Citation((date,doi,citation),())
+                    "Publication_Amount": 0,  # Amount of Publications attributed to Publisher - Integer
+                    "Currently_at_NYIT": False,  # Still at NYIT or Not - Boolean
+                    "Position": None,  # Rank from the "Position" column - String
+                    "Hire_Year": None,  # Year the publisher was hired - Integer
+                    "Research_Percents": {},  # Percentage of Work as Research - Dictionary {Fall Semester Year:Percent - Float,}
+                }
+                if publish_data_dict[each_publisher]["Search_Name_Last"] in name_counts:
+                    # Look for last name & First Initial
+                    # If First Initial is the same, look for first name
+                    # If first name is the same, look for middle initial if it exists
+                    pass
+                else:
+                    indexed_publishers.append(each_publisher)
+                    regex_name_search_last = (
+                        r"(\W|\A)"
+                        + publish_data_dict[each_publisher]["Search_Name_Last"]
+                        + r"(\W|\Z)"
+                    )
+                    name_match_last = re.compile(regex_name_search_last, re.IGNORECASE)
+                    for index, row in publisher_data.iterrows():
+                        if (
+                            re.search(name_match_last, row["Last Name"].tolist()[0])
+                            is not None
+                        ):
+                            publish_data_dict[each_publisher]["Currently_at_NYIT"] = (
+                                row["Currently at NYIT"].tolist()[0]
+                            )
+                            position = get_optional_cell(row, "Position")
+                            if isinstance(position, str) and position.strip():
+                                publish_data_dict[each_publisher][
+                                    "Position"
+                                ] = position.strip()
+                            hire_year = pd.to_numeric(
+                                get_optional_cell(row, "Hire Year"), errors="coerce"
+                            )
+                            if not pd.isna(hire_year):
+                                publish_data_dict[each_publisher]["Hire_Year"] = int(
+                                    hire_year
+                                )
+
+            if chunk_rows is None:
+                chunk_rows = max(len(all_data), 1)
+            elif len(all_data) > 0:
+                # Publishers are known before any row is attributed
+                yield publish_data_dict, 0
+            name_index = get_name_index(
+                get_name_variants(publish_data_dict, indexed_publishers, alias_raw_data)
+            )
+            attributed_publications = {
+                each_publisher: [] for each_publisher in indexed_publishers
+            }
+            attributed_publication_ids = {
+                each_publisher: [] for each_publisher in indexed_publishers
+            }
+            for chunk_start in range(0, len(all_data), chunk_rows):
+                chunk_stop = min(chunk_start + chunk_rows, len(all_data))
+                attribute_publication_chunk(
+                    all_data.iloc[chunk_start:chunk_stop],
+                    name_index,
+                    attributed_publications,
+                    attributed_publication_ids,
+                )
+                for each_publisher in indexed_publishers:
+                    publish_data_dict[each_publisher]["Author_Publications"] = tuple(
+                        attributed_publications[each_publisher]
+                    )
+                    publish_data_dict[each_publisher]["Publication_Amount"] = len(
+                        attributed_publications[each_publisher]
+                    )
+                    publish_data_dict[each_publisher]["Publication_IDs"] = np.array(
+                        attributed_publication_ids[each_publisher], dtype=np.int64
+                    )
+                if chunk_stop < len(all_data):
+                    yield publish_data_dict, chunk_stop
+
+            newest_publication_date = get_newest_publication_date(publish_data_dict)
+
+            recorded_year_range = range(
+                min(list(publisher_raw_data[PERCENT_SUPER_HEADER].columns)),
+                newest_publication_date.year + 1,
+            )
+
+            for index, each_publisher in enumerate(publisher_list):
+                year_dict = {}
+                name_match = re.compile(
+                    publish_data_dict[each_publisher]["Search_Name_Last"], re.IGNORECASE
+                )
+                for index, row in publisher_raw_data.iterrows():
+                    if re.search(name_match, row["Last Name"].tolist()[0]) is not None:
+                        for each_year in recorded_year_range:
+                            research_percent = publisher_raw_data[
+                                PERCENT_SUPER_HEADER, each_year
+                            ].iloc[index]
+                            if np.isnan(research_percent.item()):
+                                year_dict[each_year] = 0
+                            else:
+                                year_dict[each_year] = research_percent.item()
+
+                publish_data_dict[each_publisher]["Research_Percents"] = year_dict
+    yield publish_data_dict, 0 if all_raw_data is None else len(all_raw_data)
+
+
+@timed()
+def build_publish_data(all_raw_data, publisher_raw_data):
+    """Create a dictionary with all publishers and their corresponding publications and other assigned information"""
+    for publish_data_dict, _ in iter_publish_data(all_raw_data, publisher_raw_data):
+        pass
+    return publish_data_dict
+
+
+@timed()
+def parse_citations(citations):
+    """Parse every citation once into its venue, year and volume, leaving missing fields empty"""
+    citation_fields = (
+        pd.Series(citations, dtype=object).astype(str).str.extract(CITATION_PATTERN)
+    )
+    citation_fields["Venue"] = citation_fields["Venue"].str.strip()
+    return citation_fields
+
+
+def create_publication_table(all_raw_data, author_keys, doi_index, citation_fields):
+    """Store every publication once, in Publication_ID order, with room for a packed bitmask row
+    of the publishers it is attributed to. No publisher is attributed until add_attributed_rows
+    """
+    venues = pd.Categorical(citation_fields["Venue"])
+    author_matrix = np.zeros((len(all_raw_data), len(author_keys)), dtype=bool)
+    publication_table = {
+        "Publication_IDs": all_raw_data.index.to_numpy(),  # Array of Integers
+        "DOI_Index": doi_index,  # Normalized DOI to Publication_ID - Dictionary
+        "Dates": all_raw_data["Print Published"].to_numpy(
+            dtype="datetime64[ns]"
+        ),  # Print publication date of each publication - Array of Datetimes
+        "DOIs": all_raw_data["DOI"].to_numpy(dtype=object),  # Array of Strings
+        "Citations": all_raw_data["Citation"].to_numpy(
+            dtype=object
+        ),  # Array of Strings
+        "Venue_Codes": venues.codes.astype(
+            np.int32
+        ),  # Position of each publication's venue in Venue_Names, -1 if unparsed - Array of Integers
+        "Venue_Names": np.asarray(
+            venues.categories, dtype=object
+        ),  # Every parsed venue - Array of Strings
+        "Citation_Years": pd.to_numeric(
+            citation_fields["Year"]
+        ).to_numpy(),  # Year in the citation - Array of Floats (NaN if unparsed)
+        "Volumes": citation_fields["Volume"].to_numpy(
+            dtype=object
+        ),  # Volume in the citation - Array of Strings
+        "Author_Keys": np.array(
+            author_keys, dtype=object
+        ),  # Publisher key of each bit position - Array of Strings
+        "Author_Matrix": author_matrix,  # Publication x publisher attribution - 2D Array of Booleans
+        "Credit_Matrix": np.zeros(
+            author_matrix.shape, dtype=np.float32
+        ),  # Author_Matrix rows normalized to 1/k for k department co-authors - 2D Array of Floats
+        "Membership_Bits": np.packbits(
+            author_matrix, axis=1
+        ),  # Author_Matrix packed 8 publishers per byte - 2D Array of Unsigned Bytes
+    }
+    return publication_table
+
+
+def add_attributed_rows(publication_table, publish_data_dict, row_start, row_stop):
+    """Fill in the publishers of the publications from row_start up to row_stop, leaving the other rows
+    untouched. Each publisher's Publication_IDs are in ascending order, so only the new ones are read
+    """
+    if row_stop <= row_start:
+        return
+    author_matrix = publication_table["Author_Matrix"]
+    for author_index, each_publisher in enumerate(publication_table["Author_Keys"]):
+        publication_ids = publish_data_dict[each_publisher]["Publication_IDs"]
+        author_matrix[
+            publication_ids[
+                np.searchsorted(publication_ids, row_start) : np.searchsorted(
+                    publication_ids, row_stop
+                )
+            ],
+            author_index,
+        ] = True
+    added_rows = author_matrix[row_start:row_stop]
+    publication_table["Credit_Matrix"][row_start:row_stop] = added_rows / np.maximum(
+        added_rows.sum(axis=1, keepdims=True), 1
+    )
+    publication_table["Membership_Bits"][row_start:row_stop] = np.packbits(
+        added_rows, axis=1
+    )
+
+
+def build_publication_table(
+    all_raw_data, publish_data_dict, doi_index, citation_fields=None
+):
+    """Store every publication once with the publishers it is attributed to, parsing the citations
+    unless citation_fields are given"""
+    if citation_fields is None:
+        citation_fields = parse_citations(
+            all_raw_data["Citation"].to_numpy(dtype=object)
+        )
+    publication_table = create_publication_table(
+        all_raw_data, list(publish_data_dict), doi_index, citation_fields
+    )
+    add_attributed_rows(publication_table, publish_data_dict, 0, len(all_raw_data))
+    return publication_table
+
+
+def get_selection_bits(publication_table, selected_publishers):
+    """Pack the selected publishers into a bitmask aligned with the Membership_Bits columns"""
+    selected_columns = np.isin(
+        publication_table["Author_Keys"], list(selected_publishers)
+    )
+    return np.packbits(selected_columns)
+
+
+def get_selected_publication_mask(publication_table, selected_publishers):
+    """Flag every publication with at least one selected publisher using one bitwise test"""
+    selection_bits = get_selection_bits(publication_table, selected_publishers)
+    return np.bitwise_and(publication_table["Membership_Bits"], selection_bits).any(
+        axis=1
+    )
+
+
+def get_venue_mask(publication_table, selected_venues):
+    """Flag every publication in one of the selected venues by comparing integer venue codes"""
+    selected_codes = np.flatnonzero(
+        np.isin(publication_table["Venue_Names"], list(selected_venues))
+    )
+    return np.isin(publication_table["Venue_Codes"], selected_codes)
+
+
+def count_selected_authors(publication_table, selected_publishers):
+    """Count how many of the selected publishers each publication is attributed to"""
+    selected_columns = np.isin(
+        publication_table["Author_Keys"], list(selected_publishers)
+    )
+    return publication_table["Author_Matrix"][:, selected_columns].sum(axis=1)
+
+
+def hash_workbook(datapath):
+    """Hash the workbook bytes so identical uploads can share cached results"""
+    workbook_hash = hashlib.sha256()
+    with open(datapath, "rb") as workbook_file:
+        for each_block in iter(lambda: workbook_file.read(1024 * 1024), b""):
+            workbook_hash.update(each_block)
+    return workbook_hash.hexdigest()
+
+
+def read_workbook(datapath):
+    """Read the sheets of one master workbook, opening the file once"""
+    with pd.ExcelFile(datapath) as excel_file:
+        workbook = {
+            "All_Data": read_excel_all_data(
+                excel_file
+            ),  # Raw "All Data" sheet - DataFrame
+            "Publisher_Data": read_excel_publisher_data(
+                excel_file
+            ),  # Raw "Publishers" sheet - DataFrame
+            "Alias_Data": read_excel_alias_data(
+                excel_file
+            ),  # Raw "Aliases" sheet, None if there is none - DataFrame
+        }
+    return workbook
+
+
+@timed()
+def read_workbooks(datapaths):
+    """Read several master workbooks concurrently, keeping them in upload order"""
+    if len(datapaths) == 1:
+        return [read_workbook(datapaths[0])]
+    with ThreadPoolExecutor(
+        max_workers=min(len(datapaths), os.cpu_count() or 1)
+    ) as executor:
+        return list(executor.map(read_workbook, datapaths))
+
+
+def merge_publisher_data(publisher_frames):
+    """Union the "Publishers" sheets, merging a publisher listed in several workbooks into one row"""
+    if len(publisher_frames) == 1:
+        return publisher_frames[0]
+    combined_data = pd.concat(publisher_frames, ignore_index=True, sort=False)
+    name_key = (
+        combined_data[combined_data.columns[0]].astype(str).str.strip().str.lower()
+        + "\n"
+        + combined_data[combined_data.columns[1]].astype(str).str.strip().str.lower()
+    )
+    # Research percents missing from one workbook are filled from the others
+    combined_data = (
+        combined_data.groupby(name_key.to_numpy(), sort=False)
+        .first()
+        .reset_index(drop=True)
+    )
+    info_columns = [
+        each_column
+        for each_column in combined_data.columns
+        if each_column[0] != PERCENT_SUPER_HEADER
+    ]
+    percent_columns = sorted(
+        (
+            each_column
+            for each_column in combined_data.columns
+            if each_column[0] == PERCENT_SUPER_HEADER
+        ),
+        key=lambda each_column: str(each_column[1]),
+    )
+    return combined_data[info_columns + percent_columns]
+
+
+def iter_workbook_dataset(*datapaths, workbook_names=None, chunk_rows=None):
+    """Parse one or more master workbooks into a single dataset and attribute its publications,
+    yielding everything the charts are built from after each chunk of attributed rows"""
+    if not datapaths:
+        raise ValueError("Not a valid upload. Need at least one workbook")
+    if workbook_names is None:
+        workbook_names = [os.path.basename(each_path) for each_path in datapaths]
+    workbook_hashes = [hash_workbook(each_path) for each_path in datapaths]
+    dataset_hash = workbook_hashes[0]
+    if len(workbook_hashes) > 1:
+        dataset_hash = hashlib.sha256(
+            "\n".join(workbook_hashes).encode("utf-8")
+        ).hexdigest()
+    # A workbook parsed before, even by an earlier run of the server, is mapped from its sidecar
+    sidecar_path = get_sidecar_path(dataset_hash, workbook_names)
+    dataset = read_dataset_sidecar(sidecar_path)
+    if dataset is not None:
+        yield dataset
+        return
+    workbooks = read_workbooks(datapaths)
+    validation_report = []
+    for workbook_name, each_workbook in zip(workbook_names, workbooks):
+        for each_problem in validate_workbook(
+            each_workbook["All_Data"],
+            each_workbook["Publisher_Data"],
+            PERCENT_SUPER_HEADER,
+            each_workbook["Alias_Data"],
+        ):
+            validation_report.append({"Workbook": workbook_name, **each_problem})
+    if validation_report:
+        raise WorkbookValidationError(validation_report)
+    sheet_row_labels = None
+    if len(workbooks) > 1:
+        sheet_row_labels = [
+            workbook_names[workbook_index] + " row " + str(each_position + 2)
+            for workbook_index, each_workbook in enumerate(workbooks)
+            for each_position in range(len(each_workbook["All_Data"]))
+        ]
+    all_raw_data, doi_index, duplicate_report, undated_sheet_rows = (
+        deduplicate_publications(
+            pd.concat(
+                [each_workbook["All_Data"] for each_workbook in workbooks],
+                ignore_index=True,
+            ),
+            sheet_row_labels,
+        )
+    )
+    for each_problem in validate_publication_dates(undated_sheet_rows):
+        validation_report.append(
+            {"Workbook": ", ".join(workbook_names), **each_problem}
+        )
+    if validation_report:
+        raise WorkbookValidationError(validation_report)
+    publisher_raw_data = merge_publisher_data(
+        [each_workbook["Publisher_Data"] for each_workbook in workbooks]
+    )
+    alias_frames = [
+        each_workbook["Alias_Data"]
+        for each_workbook in workbooks
+        if each_workbook["Alias_Data"] is not None
+    ]
+    alias_raw_data = None
+    if alias_frames:
+        alias_raw_data = pd.concat(alias_frames, ignore_index=True)
+    # Parsed once for the whole upload, not again for every chunk
+    citation_fields = parse_citations(all_raw_data["Citation"].to_numpy(dtype=object))
+    publication_table = None
+    for publish_data_dict, rows_attributed in iter_publish_data(
+        all_raw_data, publisher_raw_data, chunk_rows, alias_raw_data
+    ):
+        if publication_table is None:
+            # Built once, each chunk then only fills in its own rows
+            publication_table = create_publication_table(
+                all_raw_data, list(publish_data_dict), doi_index, citation_fields
+            )
+            rows_in_table = 0
+        add_attributed_rows(
+            publication_table, publish_data_dict, rows_in_table, rows_attributed
+        )
+        rows_in_table = rows_attributed
+        dataset = {
+            "Dataset_Hash": dataset_hash,  # SHA-256 of the workbook, or of each workbook's hash in upload order - String
+            "All_Data": all_raw_data,  # "All Data" sheets indexed by Publication_ID, duplicates merged - DataFrame
+            "Duplicate_Report": duplicate_report,  # Sheet rows merged into each publication - List of Dictionaries
+            "Publisher_Data": publisher_raw_data,  # "Publishers" sheets, one row per publisher - DataFrame
+            "Publish_Data": publish_data_dict,  # Attributed publications per publisher - Dictionary
+            "Publication_Table": publication_table,  # Each publication once with its publisher bitmask - Dictionary
+            "Rows_Attributed": rows_attributed,  # Publications attributed so far - Integer
+            "Rows_Total": len(all_raw_data),  # Publications to attribute - Integer
+        }
+        if rows_attributed == len(all_raw_data):
+            write_dataset_sidecar(sidecar_path, dataset)
+        yield dataset
+
+
+def load_workbook_dataset(*datapaths, workbook_names=None):
+    """Parse one or more master workbooks into a single dataset and attribute its publications,
+    returning everything the charts are built from"""
+    for dataset in iter_workbook_dataset(*datapaths, workbook_names=workbook_names):
+        pass
+    return dataset
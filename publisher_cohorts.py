@@ -0,0 +1,250 @@
+## Publisher Cohorts
+
+# Named groups of publishers (everyone, those still at NYIT, each rank, each hire-year band and any saved group)
+# with their publication totals materialized once per dataset, so choosing or comparing cohorts is a lookup
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from lazy_imports import np
+from performance_metrics import timed
+from publication_analytics import get_publisher_columns
+from publication_data import get_selected_publication_mask
+
+HIRE_YEAR_BAND_YEARS = 5
+# Saved cohorts are kept in memory per worker, and also in this JSON file when it is set
+SAVED_COHORTS_FILE = os.environ.get("DASHBOARD_COHORTS_FILE", "")
+# Datasets whose cohorts stay materialized, least recently used dropped first
+COHORT_CACHE_DATASETS = 4
+# Publisher selections whose totals stay materialized per dataset, least recently used dropped first
+COHORT_TOTALS_ENTRIES = int(os.environ.get("DASHBOARD_COHORT_TOTALS_ENTRIES", "32"))
+BUILT_IN_COHORTS = ["All", "Still at NYIT"]
+COUNT_TOTALS = {
+    "Attributed": "Attributed_Totals",
+    "Fractional": "Fractional_Totals",
+}
+
+saved_cohorts = {}  # Cohort name -> publisher display names
+saved_cohorts_state = {"Loaded": False, "Version": 0}
+cohort_cache: OrderedDict = OrderedDict()
+cohort_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+def read_saved_cohorts():
+    """Read the saved cohorts file once per worker, must be called holding the cohort lock"""
+    if saved_cohorts_state["Loaded"]:
+        return
+    saved_cohorts_state["Loaded"] = True
+    if not SAVED_COHORTS_FILE or not os.path.isfile(SAVED_COHORTS_FILE):
+        return
+    try:
+        with open(SAVED_COHORTS_FILE, encoding="utf-8") as cohorts_file:
+            saved_cohorts.update(json.load(cohorts_file))
+    except (OSError, ValueError) as e:
+        logger.warning("Reading cohorts %s failed: %s", SAVED_COHORTS_FILE, e)
+
+
+def get_saved_cohorts():
+    """Return every saved cohort's publisher display names along with a version that changes on each save"""
+    with cohort_lock:
+        read_saved_cohorts()
+        return dict(saved_cohorts), saved_cohorts_state["Version"]
+
+
+def save_cohort(cohort_name, display_names):
+    """Save publishers as a named cohort, replacing any saved cohort of the same name"""
+    cohort_name = cohort_name.strip()
+    if not cohort_name or cohort_name in BUILT_IN_COHORTS:
+        raise ValueError(
+            "Not a valid cohort name. Need a name other than 'All' or 'Still at NYIT'"
+        )
+    if not display_names:
+        raise ValueError("Not a valid cohort. Need at least one publisher")
+    with cohort_lock:
+        read_saved_cohorts()
+        saved_cohorts[cohort_name] = list(display_names)
+        saved_cohorts_state["Version"] += 1
+        if not SAVED_COHORTS_FILE:
+            return
+        try:
+            temporary_path = SAVED_COHORTS_FILE + ".tmp"
+            with open(temporary_path, "w", encoding="utf-8") as cohorts_file:
+                json.dump(saved_cohorts, cohorts_file, indent=2)
+            os.replace(temporary_path, SAVED_COHORTS_FILE)
+        except OSError as e:
+            logger.warning("Writing cohorts %s failed: %s", SAVED_COHORTS_FILE, e)
+
+
+def get_hire_year_band(hire_year):
+    """Label the hire-year band a year falls in, e.g. 'Hired 2005-2009'"""
+    band_start = hire_year - hire_year % HIRE_YEAR_BAND_YEARS
+    return "Hired " + str(band_start) + "-" + str(band_start + HIRE_YEAR_BAND_YEARS - 1)
+
+
+def get_dataset_cohorts(publish_data_dict):
+    """Group the publishers into the built-in, rank and hire-year cohorts, returning
+    cohort name -> publisher keys in the order they are offered"""
+    dataset_cohorts = {
+        "All": list(publish_data_dict),
+        "Still at NYIT": [
+            each_publisher
+            for each_publisher, publisher_data in publish_data_dict.items()
+            if publisher_data["Currently_at_NYIT"] is True
+        ],
+    }
+    rank_cohorts = {}
+    hire_year_cohorts = {}
+    for each_publisher, publisher_data in publish_data_dict.items():
+        if publisher_data.get("Position"):
+            rank_cohorts.setdefault("Rank: " + publisher_data["Position"], []).append(
+                each_publisher
+            )
+        if publisher_data.get("Hire_Year") is not None:
+            hire_year_cohorts.setdefault(
+                get_hire_year_band(publisher_data["Hire_Year"]), []
+            ).append(each_publisher)
+    for each_cohort in sorted(rank_cohorts):
+        dataset_cohorts[each_cohort] = rank_cohorts[each_cohort]
+    for each_cohort in sorted(hire_year_cohorts):
+        dataset_cohorts[each_cohort] = hire_year_cohorts[each_cohort]
+    return dataset_cohorts
+
+
+def get_cohort_cache_entry(dataset):
+    """Get the cohorts materialized for a dataset, creating an empty entry on first use.
+    Must be called holding the cohort lock"""
+    dataset_hash = dataset["Dataset_Hash"]
+    if dataset_hash not in cohort_cache:
+        cohort_cache[dataset_hash] = {
+            "Members": None,  # Cohort name -> publisher keys - Dictionary
+            "Saved_Version": None,  # Saved cohorts version the members include - Integer
+            "Totals": OrderedDict(),  # Sorted publisher keys -> publication totals, least recently used first - OrderedDict
+        }
+    cohort_cache.move_to_end(dataset_hash)
+    while len(cohort_cache) > COHORT_CACHE_DATASETS:
+        cohort_cache.popitem(last=False)
+    return cohort_cache[dataset_hash]
+
+
+def get_cohort_members(dataset):
+    """Return cohort name -> publisher keys for a dataset, built-in cohorts first and saved ones last.
+    Saved cohorts only keep the publishers that are in this dataset, and are left out if none are
+    """
+    saved_cohort_names, saved_version = get_saved_cohorts()
+    with cohort_lock:
+        cache_entry = get_cohort_cache_entry(dataset)
+        if (
+            cache_entry["Members"] is not None
+            and cache_entry["Saved_Version"] == saved_version
+        ):
+            return cache_entry["Members"]
+    publish_data_dict = dataset["Publish_Data"]
+    cohort_members = get_dataset_cohorts(publish_data_dict)
+    publisher_keys = {
+        publisher_data["Display_Name"]: each_publisher
+        for each_publisher, publisher_data in publish_data_dict.items()
+    }
+    for each_cohort, display_names in saved_cohort_names.items():
+        saved_members = [
+            publisher_keys[each_name]
+            for each_name in display_names
+            if each_name in publisher_keys
+        ]
+        if saved_members and each_cohort not in cohort_members:
+            cohort_members[each_cohort] = saved_members
+    with cohort_lock:
+        cache_entry = get_cohort_cache_entry(dataset)
+        cache_entry["Members"] = cohort_members
+        cache_entry["Saved_Version"] = saved_version
+    return cohort_members
+
+
+@timed()
+def build_author_totals(publication_table, publisher_keys, publication_filter=None):
+    """Sort the publishers' publications by date once and take running totals of every publisher's
+    counts with one cumulative sum per matrix, so each publisher's count between any two dates is the
+    difference of two looked-up rows. publication_filter optionally flags the only publications to count
+    """
+    selected_publications = get_selected_publication_mask(
+        publication_table, publisher_keys
+    ) & ~np.isnat(publication_table["Dates"])
+    if publication_filter is not None:
+        selected_publications &= publication_filter
+    publication_rows = np.flatnonzero(selected_publications)
+    publication_rows = publication_rows[
+        np.argsort(publication_table["Dates"][publication_rows], kind="stable")
+    ]
+    publisher_columns = get_publisher_columns(publication_table, publisher_keys)
+    author_totals = {"Dates": publication_table["Dates"][publication_rows]}
+    for each_matrix, each_totals in [
+        ("Author_Matrix", "Attributed_Totals"),
+        ("Credit_Matrix", "Fractional_Totals"),
+    ]:
+        author_totals[each_totals] = np.zeros(
+            (len(publication_rows) + 1, len(publisher_columns))
+        )
+        np.cumsum(
+            publication_table[each_matrix][np.ix_(publication_rows, publisher_columns)],
+            axis=0,
+            dtype=np.float64,
+            out=author_totals[each_totals][1:],
+        )
+    return author_totals
+
+
+def build_cohort_totals(publication_table, publisher_keys, publication_filter=None):
+    """Take running totals of a cohort's publications by date for each count mode, so the count
+    between any two dates is the difference of two looked-up totals. publication_filter optionally
+    flags the only publications to count"""
+    cohort_totals = build_author_totals(
+        publication_table, publisher_keys, publication_filter
+    )
+    for each_totals in COUNT_TOTALS.values():
+        cohort_totals[each_totals] = cohort_totals[each_totals].sum(axis=1)
+    return cohort_totals
+
+
+def get_cohort_totals(dataset, publisher_keys):
+    """Return a cohort's running publication totals, materializing them the first time any session asks
+    and keeping the most recently used ones. Only datasets with every row attributed may be passed,
+    since the totals are kept for the dataset hash
+    """
+    totals_key = tuple(sorted(publisher_keys))
+    with cohort_lock:
+        cached_totals = get_cohort_cache_entry(dataset)["Totals"]
+        if totals_key in cached_totals:
+            cached_totals.move_to_end(totals_key)
+            return cached_totals[totals_key]
+    cohort_totals = build_cohort_totals(dataset["Publication_Table"], totals_key)
+    if COHORT_TOTALS_ENTRIES <= 0:
+        return cohort_totals
+    with cohort_lock:
+        cached_totals = get_cohort_cache_entry(dataset)["Totals"]
+        cached_totals[totals_key] = cohort_totals
+        cached_totals.move_to_end(totals_key)
+        while len(cached_totals) > COHORT_TOTALS_ENTRIES:
+            cached_totals.popitem(last=False)
+    return cohort_totals
+
+
+def get_cohort_period_counts(cohort_totals, period_edges, count_mode="Unique"):
+    """Count a cohort's publications per period from its running totals, or each publisher's from
+    author totals as a periods x publishers array. Period i covers
+    period_edges[i] <= date < period_edges[i + 1], the same as the per-publisher period counts
+    """
+    edge_positions = np.searchsorted(
+        cohort_totals["Dates"],
+        np.array(period_edges, dtype="datetime64[ns]"),
+        side="left",
+    )
+    if count_mode == "Unique":
+        return np.diff(edge_positions)
+    if count_mode not in COUNT_TOTALS:
+        raise ValueError(
+            "Not a valid count mode. Need 'Unique', 'Attributed' or 'Fractional'"
+        )
+    return np.diff(cohort_totals[COUNT_TOTALS[count_mode]][edge_positions], axis=0)
@@ -0,0 +1,154 @@
+## Session Dataset Memory Accounting
+
+# Shared by every session on the worker, so it lives outside app.py (which Shiny Express re-runs per session)
+
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+MEMORY_CAP_BYTES = int(
+    float(os.environ.get("DASHBOARD_MEMORY_CAP_MB", "1024")) * 1024 * 1024
+)
+IDLE_EVICT_SECONDS = float(os.environ.get("DASHBOARD_IDLE_EVICT_MINUTES", "60")) * 60
+
+# Least recently used session first
+session_datasets: OrderedDict = OrderedDict()
+session_datasets_lock = threading.RLock()
+eviction_count = 0
+
+
+def estimate_object_bytes(each_object, seen_ids=None):
+    """Estimate the memory held by a dataset object, counting shared objects only once"""
+    if seen_ids is None:
+        seen_ids = set()
+    if id(each_object) in seen_ids:
+        return 0
+    seen_ids.add(id(each_object))
+    if hasattr(each_object, "memory_usage") and hasattr(each_object, "columns"):
+        # DataFrame
+        return int(each_object.memory_usage(deep=True).sum())
+    if hasattr(each_object, "nbytes") and hasattr(each_object, "dtype"):
+        return int(each_object.nbytes)
+    object_bytes = sys.getsizeof(each_object)
+    if isinstance(each_object, dict):
+        for key, value in each_object.items():
+            object_bytes += estimate_object_bytes(key, seen_ids)
+            object_bytes += estimate_object_bytes(value, seen_ids)
+    elif isinstance(each_object, (list, tuple, set, frozenset)):
+        for value in each_object:
+            object_bytes += estimate_object_bytes(value, seen_ids)
+    return object_bytes
+
+
+def register_session_dataset(
+    session_id,
+    source,
+    dataset,
+    evict_callback,
+    shared_objects=None,
+    estimate_bytes=True,
+):
+    """Record a freshly loaded session dataset and evict idle ones if the server is over its cap.
+    Anything reachable from shared_objects is held by the worker, not the session, so it is not counted.
+    Without estimate_bytes the dataset keeps the size last estimated for the same source, so a partly
+    attributed upload is only measured once its last chunk lands
+    """
+    shared_ids = set()
+    if shared_objects is not None and estimate_bytes:
+        estimate_object_bytes(shared_objects, shared_ids)
+    with session_datasets_lock:
+        previous_entry = session_datasets.get(session_id)
+        reload_count = 0
+        dataset_bytes = 0
+        if previous_entry is not None and previous_entry["Source"] == source:
+            reload_count = previous_entry["Reloads"]
+            dataset_bytes = previous_entry["Bytes"]
+            if previous_entry["Dataset"] is None:
+                reload_count += 1
+        if estimate_bytes:
+            dataset_bytes = estimate_object_bytes(dataset, shared_ids)
+        session_datasets[session_id] = {
+            "Source": source,  # What the dataset was loaded from, used to detect new uploads - Tuple of Strings
+            "Dataset": dataset,  # Parsed DataFrames and attribution structures, None once evicted - Dictionary
+            "Bytes": dataset_bytes,  # Estimated memory held by the dataset - Integer
+            "Last_Used": time.monotonic(),  # Time of the last interaction - Float
+            "Evict_Callback": evict_callback,  # Releases the session's own references - Callable
+            "Reloads": reload_count,  # Times the dataset was reloaded after eviction - Integer
+        }
+        session_datasets.move_to_end(session_id)
+        enforce_memory_cap(protected_session_id=session_id)
+
+
+def get_session_dataset(session_id, source):
+    """Return a session's dataset if it is still loaded from the same source, marking it as recently used"""
+    with session_datasets_lock:
+        entry = session_datasets.get(session_id)
+        if entry is None or entry["Dataset"] is None or entry["Source"] != source:
+            return None
+        entry["Last_Used"] = time.monotonic()
+        session_datasets.move_to_end(session_id)
+        return entry["Dataset"]
+
+
+def evict_session_dataset(session_id):
+    """Drop a session's dataset while keeping its entry so it can be reloaded later"""
+    global eviction_count
+    with session_datasets_lock:
+        entry = session_datasets.get(session_id)
+        if entry is None or entry["Dataset"] is None:
+            return
+        entry["Dataset"] = None
+        entry["Bytes"] = 0
+        eviction_count += 1
+        evict_callback = entry["Evict_Callback"]
+    if evict_callback is not None:
+        evict_callback()
+
+
+def release_session_dataset(session_id):
+    """Forget a session entirely, e.g. when its connection closes"""
+    with session_datasets_lock:
+        session_datasets.pop(session_id, None)
+
+
+def get_total_dataset_bytes():
+    """Return the memory held by every loaded session dataset"""
+    with session_datasets_lock:
+        return sum(entry["Bytes"] for entry in session_datasets.values())
+
+
+def enforce_memory_cap(protected_session_id=None):
+    """Evict idle datasets, then least recently used ones until the server is under its cap"""
+    now = time.monotonic()
+    with session_datasets_lock:
+        for session_id, entry in list(session_datasets.items()):
+            if session_id == protected_session_id or entry["Dataset"] is None:
+                continue
+            if IDLE_EVICT_SECONDS > 0 and now - entry["Last_Used"] > IDLE_EVICT_SECONDS:
+                evict_session_dataset(session_id)
+        for session_id, entry in list(session_datasets.items()):
+            if get_total_dataset_bytes() <= MEMORY_CAP_BYTES:
+                break
+            if session_id == protected_session_id or entry["Dataset"] is None:
+                continue
+            evict_session_dataset(session_id)
+
+
+def get_memory_report():
+    """Return one row per session with its dataset size, idle time and state"""
+    now = time.monotonic()
+    report_rows = []
+    with session_datasets_lock:
+        for session_id, entry in reversed(session_datasets.items()):
+            report_rows.append(
+                {
+                    "Session": session_id[:8],
+                    "State": "Loaded" if entry["Dataset"] is not None else "Evicted",
+                    "Dataset (MB)": round(entry["Bytes"] / (1024 * 1024), 2),
+                    "Idle (min)": round((now - entry["Last_Used"]) / 60, 1),
+                    "Reloads": entry["Reloads"],
+                }
+            )
+    return report_rows
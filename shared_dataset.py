@@ -0,0 +1,158 @@
+## Shared Preloaded Dataset
+
+# Loaded once per worker in the background so sessions can show charts before anyone uploads a file,
+# either from one configured workbook or from the newest workbook in a watched directory
+
+import os
+import time
+import logging
+import threading
+
+from lazy_imports import warm_lazy_modules
+from publication_data import hash_workbook, load_workbook_dataset
+
+PRELOAD_WORKBOOK = os.environ.get("DASHBOARD_PRELOAD_WORKBOOK", "")
+DATA_DIRECTORY = os.environ.get("DASHBOARD_DATA_DIRECTORY", "")
+DATA_POLL_SECONDS = float(os.environ.get("DASHBOARD_DATA_POLL_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+shared_dataset_state = {
+    "Dataset": None,  # Preloaded dataset once parsed - Dictionary
+    "Source": None,  # Workbook path and hash the dataset was parsed from - Tuple of Strings
+    "Error": None,  # Message if the latest load failed - String
+    "Thread": None,  # Background loading or watching thread - Thread
+}
+shared_dataset_lock = threading.Lock()
+
+
+def load_shared_workbook(workbook_path, workbook_hash=None):
+    """Parse a workbook and swap it in as the shared dataset, keeping the current one if it fails"""
+    try:
+        if workbook_hash is None:
+            workbook_hash = hash_workbook(workbook_path)
+        dataset = load_workbook_dataset(workbook_path)
+    except Exception as e:
+        with shared_dataset_lock:
+            shared_dataset_state["Error"] = str(e)
+        logger.exception("Preloading %s failed", workbook_path)
+        return
+    # Sessions pick up the new dataset when they see its source change, never a half-built one
+    with shared_dataset_lock:
+        shared_dataset_state["Dataset"] = dataset
+        shared_dataset_state["Source"] = (workbook_path, workbook_hash)
+        shared_dataset_state["Error"] = None
+
+
+def preload_workbook():
+    """Import the deferred modules and parse the configured workbook"""
+    warm_lazy_modules()
+    load_shared_workbook(PRELOAD_WORKBOOK)
+
+
+def find_newest_workbook(directory):
+    """Return the most recently modified workbook in a directory along with its modification time and size,
+    or None if there is none. Excel's "~$" lock files are skipped"""
+    newest_workbook = None
+    try:
+        directory_entries = list(os.scandir(directory))
+    except OSError as e:
+        logger.warning("Watching %s failed: %s", directory, e)
+        return None
+    for each_entry in directory_entries:
+        # A workbook removed or replaced since the scan is skipped until the next poll
+        try:
+            if (
+                not each_entry.name.lower().endswith(".xlsx")
+                or each_entry.name.startswith("~$")
+                or not each_entry.is_file()
+            ):
+                continue
+            entry_stat = each_entry.stat()
+        except OSError:
+            continue
+        workbook_signature = (entry_stat.st_mtime_ns, entry_stat.st_size)
+        if newest_workbook is None or workbook_signature > newest_workbook[1]:
+            newest_workbook = (each_entry.path, workbook_signature)
+    return newest_workbook
+
+
+def watch_data_directory():
+    """Load the newest workbook in the watched directory, then poll it and reload whenever it changes.
+    Saving the same bytes again is detected by the hash and does not reload"""
+    warm_lazy_modules()
+    checked_workbook = None
+    while True:
+        # An unexpected failure is reported and the next poll tries again, so the watcher never dies
+        try:
+            checked_workbook = check_data_directory(checked_workbook)
+        except Exception:
+            logger.exception("Watching %s failed", DATA_DIRECTORY)
+        time.sleep(DATA_POLL_SECONDS)
+
+
+def check_data_directory(checked_workbook):
+    """Reload the shared dataset if the newest workbook in the watched directory changed since the
+    last poll, returning the workbook checked"""
+    newest_workbook = find_newest_workbook(DATA_DIRECTORY)
+    if newest_workbook is not None and newest_workbook != checked_workbook:
+        workbook_path = newest_workbook[0]
+        try:
+            workbook_source = (workbook_path, hash_workbook(workbook_path))
+        except OSError as e:
+            logger.warning("Hashing %s failed: %s", workbook_path, e)
+            # Hashed again on the next poll
+            return checked_workbook
+        if workbook_source != get_shared_dataset_source():
+            load_shared_workbook(*workbook_source)
+    elif newest_workbook is None:
+        with shared_dataset_lock:
+            if shared_dataset_state["Dataset"] is None:
+                shared_dataset_state["Error"] = "No workbook in " + DATA_DIRECTORY
+    return newest_workbook
+
+
+def start_preload():
+    """Start loading the configured workbook, or watching the configured directory, in the background
+    once per worker"""
+    if DATA_DIRECTORY:
+        background_target = watch_data_directory
+    elif PRELOAD_WORKBOOK:
+        background_target = preload_workbook
+    else:
+        return
+    with shared_dataset_lock:
+        if shared_dataset_state["Thread"] is not None:
+            return
+        shared_dataset_state["Thread"] = threading.Thread(
+            target=background_target, name="dashboard-preload", daemon=True
+        )
+        shared_dataset_state["Thread"].start()
+
+
+def is_shared_dataset_configured():
+    """Check whether a preload workbook or a watched directory is configured"""
+    return bool(DATA_DIRECTORY or PRELOAD_WORKBOOK)
+
+
+def is_preload_pending():
+    """Check whether a configured preload is still running"""
+    with shared_dataset_lock:
+        return (
+            bool(PRELOAD_WORKBOOK or DATA_DIRECTORY)
+            and shared_dataset_state["Dataset"] is None
+            and shared_dataset_state["Error"] is None
+        )
+
+
+def get_shared_dataset_source():
+    """Return the path and hash of the workbook behind the shared dataset, None until one is loaded.
+    Cheap enough to poll from every session"""
+    with shared_dataset_lock:
+        return shared_dataset_state["Source"]
+
+
+def get_preloaded_dataset():
+    """Return the shared dataset along with its source, or (None, None) if it is disabled, pending or failed"""
+    with shared_dataset_lock:
+        return shared_dataset_state["Dataset"], shared_dataset_state["Source"]
@@ -0,0 +1,28 @@
+## Summary Report Export
+
+# Streams the aggregate tables behind the dashboard charts into one workbook, a sheet per table
+
+from lazy_imports import openpyxl
+from performance_metrics import timed
+
+# Excel rejects longer sheet titles
+SHEET_TITLE_LIMIT = 31
+
+
+def iter_wide_rows(row_labels, column_values):
+    """Yield one row per label holding the matching entry of every column, e.g. each faculty's count per period"""
+    for row_index, each_label in enumerate(row_labels):
+        yield [each_label] + [each_column[row_index] for each_column in column_values]
+
+
+@timed()
+def write_summary_report(report_path, report_tables):
+    """Write every table to its own sheet in openpyxl's write-only mode, so rows are streamed
+    to disk as they are produced instead of being held as cells in memory"""
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_title, (header_row, table_rows) in report_tables.items():
+        worksheet = workbook.create_sheet(title=sheet_title[:SHEET_TITLE_LIMIT])
+        worksheet.append(header_row)
+        for each_row in table_rows:
+            worksheet.append(each_row)
+    workbook.save(report_path)
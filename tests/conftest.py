@@ -0,0 +1,107 @@
+## Shared Test Fixtures
+
+# Small master workbooks written on the fly, so the ingestion tests need no files checked in
+
+import os
+import sys
+import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataset_sidecar  # noqa: E402
+from publication_data import PERCENT_SUPER_HEADER  # noqa: E402
+
+RECORDED_YEARS = [2003, 2004, 2005]
+DEFAULT_PUBLISHERS = [
+    # First Name, Last Name, Currently at NYIT, Position, Hire Year
+    ("John", "Smith", True, "Professor", 2001),
+    ("Mary", "Jones", True, "Associate Professor", 2008),
+    ("Ada", "Lovelace", False, "Assistant Professor", 2012),
+]
+
+
+def write_workbook(
+    workbook_path,
+    publications,
+    publishers=DEFAULT_PUBLISHERS,
+    aliases=None,
+    publisher_columns=("Position", "Hire Year"),
+):
+    """Write a master workbook of (print date, DOI, citation) publications and publisher rows.
+    publisher_columns are the optional "Publishers" columns to include"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    all_data_sheet = workbook.active
+    all_data_sheet.title = "All Data"
+    all_data_sheet.append(
+        [
+            "Print Published",
+            "Online published",
+            "Number of NYIT \nStudent Authors",
+            "DOI",
+            "Citation",
+        ]
+    )
+    for print_published, doi, citation in publications:
+        all_data_sheet.append([print_published, print_published, 0, doi, citation])
+    publisher_sheet = workbook.create_sheet("Publishers")
+    info_columns = ["First Name", "Last Name", "Currently at NYIT"] + list(
+        publisher_columns
+    )
+    publisher_sheet.append(info_columns + [PERCENT_SUPER_HEADER] * len(RECORDED_YEARS))
+    publisher_sheet.append([None] * len(info_columns) + RECORDED_YEARS)
+    for first_name, last_name, at_nyit, position, hire_year in publishers:
+        optional_values = {"Position": position, "Hire Year": hire_year}
+        publisher_sheet.append(
+            [first_name, last_name, at_nyit]
+            + [optional_values[each_column] for each_column in publisher_columns]
+            + [20] * len(RECORDED_YEARS)
+        )
+    if aliases is not None:
+        alias_sheet = workbook.create_sheet("Aliases")
+        alias_sheet.append(
+            ["Last Name", "First Name", "Alias Last Name", "Alias First Name"]
+        )
+        for each_alias in aliases:
+            alias_sheet.append(list(each_alias))
+    workbook.save(workbook_path)
+    return str(workbook_path)
+
+
+def make_publications(publication_count):
+    """Build publications cycling through the default publishers and a few venues"""
+    venues = ["J Anat", "Nature", "PLoS One"]
+    publications = []
+    for index in range(publication_count):
+        print_published = datetime.datetime(2003 + index % 3, index % 12 + 1, 15)
+        first_author = DEFAULT_PUBLISHERS[index % 3]
+        second_author = DEFAULT_PUBLISHERS[(index + 1) % 3]
+        authors = first_author[1] + " " + first_author[0][0]
+        if index % 4 == 0:
+            authors += ", " + second_author[1] + " " + second_author[0][0]
+        publications.append(
+            (
+                print_published,
+                "10.1000/test" + str(index),
+                authors
+                + ", Other X. A study of thing "
+                + str(index)
+                + ". "
+                + venues[index % 3]
+                + ". "
+                + str(print_published.year)
+                + ";"
+                + str(index % 40 + 1)
+                + "(2):1-9.",
+            )
+        )
+    return publications
+
+
+@pytest.fixture(autouse=True)
+def no_sidecars(monkeypatch):
+    """Keep every test from reading or writing parsed dataset sidecars"""
+    monkeypatch.setattr(dataset_sidecar, "SIDECAR_DIRECTORY", "")
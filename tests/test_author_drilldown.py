@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import publication_data
+from author_drilldown import (
+    get_author_rows,
+    get_author_summary,
+    get_author_timeline,
+    get_coauthor_counts,
+    get_publication_page,
+)
+from conftest import make_publications, write_workbook
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    # Smith is first author of publications 0, 3, 6 and 9 and second author of publication 8
+    workbook_path = write_workbook(tmp_path / "master.xlsx", make_publications(12))
+    return publication_data.load_workbook_dataset(workbook_path)
+
+
+def test_author_rows_are_newest_first_with_undated_last():
+    publication_table = {
+        "Dates": np.array(
+            ["2004-01-15", "NaT", "2006-03-15", "2005-07-15"], dtype="datetime64[ns]"
+        )
+    }
+    publish_data_dict = {"Smith": {"Publication_IDs": [0, 1, 2, 3]}}
+    assert get_author_rows(publish_data_dict, publication_table, "Smith").tolist() == [
+        2,
+        3,
+        0,
+        1,
+    ]
+
+
+def test_author_summary(dataset):
+    publication_table = dataset["Publication_Table"]
+    author_rows = get_author_rows(dataset["Publish_Data"], publication_table, "Smith")
+    assert author_rows.tolist() == [8, 9, 6, 3, 0]
+    author_summary = get_author_summary(
+        dataset["Publish_Data"], publication_table, "Smith", author_rows
+    )
+    assert author_summary["Publications"] == 5
+    assert author_summary["First_Publication"] == "2003-01-15"
+    assert author_summary["Latest_Publication"] == "2005-09-15"
+    assert author_summary["Publications_Per_Year"] == pytest.approx(5 / 3)
+    assert author_summary["Co_Authored"] == 2
+    assert author_summary["Top_Venue"] == "J Anat"
+    assert author_summary["Position"] == "Professor"
+
+
+def test_author_timeline_includes_years_without_publications(dataset):
+    publication_table = dataset["Publication_Table"]
+    author_rows = get_author_rows(dataset["Publish_Data"], publication_table, "Smith")
+    years, year_counts = get_author_timeline(publication_table, author_rows)
+    assert years.tolist() == [2003, 2004, 2005]
+    assert year_counts.tolist() == [4, 0, 1]
+    years, year_counts = get_author_timeline(
+        publication_table, np.array([], dtype=np.int64)
+    )
+    assert len(years) == 0 and len(year_counts) == 0
+
+
+def test_coauthor_counts_leave_out_the_author(dataset):
+    publication_table = dataset["Publication_Table"]
+    author_rows = get_author_rows(dataset["Publish_Data"], publication_table, "Smith")
+    assert get_coauthor_counts(publication_table, author_rows, "Smith") == [
+        ("Jones", 1),
+        ("Lovelace", 1),
+    ]
+
+
+def test_publication_pages(dataset):
+    publication_table = dataset["Publication_Table"]
+    author_rows = get_author_rows(dataset["Publish_Data"], publication_table, "Smith")
+    first_page = get_publication_page(publication_table, author_rows, 0, page_size=2)
+    assert [each_row["Date"] for each_row in first_page] == [
+        "2005-09-15",
+        "2003-10-15",
+    ]
+    assert first_page[0]["DOI"] == "10.1000/test8"
+    assert first_page[0]["Venue"] == "PLoS One"
+    assert (
+        len(get_publication_page(publication_table, author_rows, 2, page_size=2)) == 1
+    )
+    assert get_publication_page(publication_table, author_rows, 3, page_size=2) == []
@@ -0,0 +1,24 @@
+import plotly.graph_objects as go
+
+from dashboard_snapshot import build_dashboard_snapshot
+
+
+def test_snapshot_is_one_self_contained_page():
+    snapshot_html = build_dashboard_snapshot(
+        "Publications <Anatomy>",
+        ["Publishers: Smith, John; Jones, Mary", "Counting: Unique publications"],
+        [
+            ("Total Over Time", go.Figure(go.Scatter(x=[1, 2], y=[3, 4]))),
+            ("Venues & Journals", go.Figure(go.Bar(x=[5], y=["Nature"]))),
+        ],
+    )
+    assert snapshot_html.startswith("<!DOCTYPE html>")
+    assert snapshot_html.rstrip().endswith("</html>")
+    assert "<title>Publications &lt;Anatomy&gt;</title>" in snapshot_html
+    assert "<p>Publishers: Smith, John; Jones, Mary</p>" in snapshot_html
+    assert "<h2>Venues &amp; Journals</h2>" in snapshot_html
+    assert snapshot_html.count("<section>") == 2
+    assert snapshot_html.count('class="plotly-graph-div"') == 2
+    # plotly.js is inlined once and shared, so the page needs no network access
+    assert snapshot_html.count("plotly.js v") == 1
+    assert "<script src=" not in snapshot_html
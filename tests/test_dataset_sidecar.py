@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_sidecar
+import publication_data
+from conftest import make_publications, write_workbook
+
+
+def test_sidecar_round_trip(tmp_path, monkeypatch):
+    sidecar_directory = tmp_path / "sidecars"
+    monkeypatch.setattr(dataset_sidecar, "SIDECAR_DIRECTORY", str(sidecar_directory))
+    workbook_path = write_workbook(tmp_path / "master.xlsx", make_publications(30))
+    parsed = publication_data.load_workbook_dataset(workbook_path)
+    assert os.stat(sidecar_directory).st_mode & 0o777 == 0o700
+    [sidecar_name] = os.listdir(sidecar_directory)
+    assert "dataset.json" in os.listdir(sidecar_directory / sidecar_name)
+    mapped = publication_data.load_workbook_dataset(workbook_path)
+    pd.testing.assert_frame_equal(mapped["All_Data"], parsed["All_Data"])
+    pd.testing.assert_frame_equal(mapped["Publisher_Data"], parsed["Publisher_Data"])
+    for each_array, array_values in parsed["Publication_Table"].items():
+        if each_array in dataset_sidecar.MAPPED_TABLE_ARRAYS:
+            assert isinstance(mapped["Publication_Table"][each_array], np.memmap)
+        if isinstance(array_values, np.ndarray):
+            np.testing.assert_array_equal(
+                mapped["Publication_Table"][each_array], array_values
+            )
+        else:
+            assert mapped["Publication_Table"][each_array] == array_values
+    for each_publisher, publisher_data in parsed["Publish_Data"].items():
+        for each_field, field_value in publisher_data.items():
+            mapped_value = mapped["Publish_Data"][each_publisher][each_field]
+            if isinstance(field_value, np.ndarray):
+                np.testing.assert_array_equal(mapped_value, field_value)
+            else:
+                assert mapped_value == field_value
+
+
+def test_sidecar_is_not_unpickled(tmp_path, caplog):
+    sidecar_path = tmp_path / "planted"
+    sidecar_path.mkdir()
+    np.savez(sidecar_path / "arrays.npz", planted=np.array([object()], dtype=object))
+    (sidecar_path / "dataset.json").write_text("{}")
+    assert dataset_sidecar.read_dataset_sidecar(str(sidecar_path)) is None
+    assert caplog.records[0].levelname == "ERROR"
+    assert str(sidecar_path) in caplog.records[0].getMessage()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {2003: 20.0, "Name": None, "Rate": float("nan")},
+        (pd.Timestamp("2004-03-15"), "10.1000/a", ("Smith", "J")),
+        np.array(["a", None, ("b", "c")], dtype=object),
+        np.array(["2004-03-15"], dtype="datetime64[ns]"),
+    ],
+)
+def test_sidecar_values_survive_encoding(value):
+    sidecar_arrays = {}
+    decoded_value = dataset_sidecar.decode_sidecar_value(
+        dataset_sidecar.encode_sidecar_value(value, sidecar_arrays), sidecar_arrays
+    )
+    if isinstance(value, np.ndarray):
+        assert decoded_value.dtype == value.dtype
+        assert decoded_value.tolist() == value.tolist()
+    elif isinstance(value, dict):
+        assert decoded_value.keys() == value.keys()
+        assert decoded_value[2003] == 20.0 and np.isnan(decoded_value["Rate"])
+    else:
+        assert decoded_value == value
@@ -0,0 +1,76 @@
+import plotly.graph_objects as go
+
+from figure_widgets import sync_figure_widget
+
+
+def make_figure(*traces, title=None):
+    """Build a figure of (type, name, y values) traces"""
+    trace_types = {"bar": go.Bar, "scatter": go.Scatter}
+    fig = go.Figure(
+        [
+            trace_types[trace_type](name=trace_name, x=list(range(len(y))), y=y)
+            for trace_type, trace_name, y in traces
+        ]
+    )
+    fig.update_layout(title=title)
+    return fig
+
+
+def get_widget_traces(figure_widget):
+    """List the widget's traces as (type, name, y values)"""
+    return [
+        (each_trace.type, each_trace.name, list(each_trace.y))
+        for each_trace in figure_widget.data
+    ]
+
+
+def test_sync_adds_and_removes_traces():
+    figure_widget = go.FigureWidget()
+    sync_figure_widget(
+        figure_widget, make_figure(("bar", "Smith", [1, 2]), ("bar", "Jones", [3, 4]))
+    )
+    assert get_widget_traces(figure_widget) == [
+        ("bar", "Smith", [1, 2]),
+        ("bar", "Jones", [3, 4]),
+    ]
+    sync_figure_widget(
+        figure_widget,
+        make_figure(("bar", "Jones", [3, 4]), ("bar", "Lovelace", [5, 6])),
+    )
+    assert get_widget_traces(figure_widget) == [
+        ("bar", "Jones", [3, 4]),
+        ("bar", "Lovelace", [5, 6]),
+    ]
+    sync_figure_widget(figure_widget, make_figure())
+    assert get_widget_traces(figure_widget) == []
+
+
+def test_sync_reorders_and_restyles_matched_traces():
+    figure_widget = go.FigureWidget()
+    sync_figure_widget(
+        figure_widget,
+        make_figure(("bar", "Smith", [1, 2]), ("scatter", "Smith", [3, 4])),
+    )
+    kept_trace = figure_widget.data[0]
+    sync_figure_widget(
+        figure_widget,
+        make_figure(
+            ("scatter", "Smith", [3, 4]), ("bar", "Smith", [7, 8]), title="Updated"
+        ),
+    )
+    assert get_widget_traces(figure_widget) == [
+        ("scatter", "Smith", [3, 4]),
+        ("bar", "Smith", [7, 8]),
+    ]
+    # The matched trace is restyled in place rather than replaced
+    assert figure_widget.data[1] is kept_trace
+    assert figure_widget.layout.title.text == "Updated"
+
+
+def test_sync_keeps_repeated_names_apart():
+    figure_widget = go.FigureWidget()
+    sync_figure_widget(
+        figure_widget, make_figure(("bar", "Smith", [1]), ("bar", "Smith", [2]))
+    )
+    sync_figure_widget(figure_widget, make_figure(("bar", "Smith", [1])))
+    assert get_widget_traces(figure_widget) == [("bar", "Smith", [1])]
@@ -0,0 +1,63 @@
+import datetime
+
+import numpy as np
+
+import publication_data
+from conftest import write_workbook
+from name_index import build_name_index, find_cited_publishers
+
+
+def test_cited_names_match_across_accents_hyphens_and_initials():
+    name_index = build_name_index(
+        [("Muller", "Müller", "Anna"), ("Smith-Jones", "Smith-Jones", "John")]
+    )
+    assert find_cited_publishers(name_index, "Muller A, Other X. A study.") == {
+        "Muller"
+    }
+    assert find_cited_publishers(name_index, "SmithJones JM. A study.") == {
+        "Smith-Jones"
+    }
+    assert find_cited_publishers(name_index, "Smith Jones, J. A study.") == {
+        "Smith-Jones"
+    }
+
+
+def test_cited_names_need_the_whole_surname_and_initial():
+    name_index = build_name_index([("Smith", "Smith", "John")])
+    assert find_cited_publishers(name_index, "Smithson J. A study.") == set()
+    assert find_cited_publishers(name_index, "Smith K. A study.") == set()
+    assert find_cited_publishers(name_index, "Goldsmith J. A study.") == set()
+
+
+def test_aliases_attribute_publications(tmp_path):
+    publications = [
+        (
+            datetime.datetime(2004, 3, 15),
+            "10.1000/a",
+            "Smith J. Own name. Nature. 2004;1:1-9.",
+        ),
+        (
+            datetime.datetime(2004, 4, 15),
+            "10.1000/b",
+            "Byron AA. Maiden name. Nature. 2004;1:1-9.",
+        ),
+        (
+            datetime.datetime(2005, 4, 15),
+            "10.1000/c",
+            "Lovelace A, Smith J. Both. Nature. 2005;1:1-9.",
+        ),
+    ]
+    workbook_path = write_workbook(
+        tmp_path / "master.xlsx",
+        publications,
+        aliases=[("Lovelace", "Ada", "Byron", None)],
+    )
+    dataset = publication_data.load_workbook_dataset(workbook_path)
+    publish_data_dict = dataset["Publish_Data"]
+    assert publish_data_dict["Lovelace"]["Publication_IDs"].tolist() == [1, 2]
+    assert publish_data_dict["Smith"]["Publication_IDs"].tolist() == [0, 2]
+    publication_table = dataset["Publication_Table"]
+    lovelace_column = list(publication_table["Author_Keys"]).index("Lovelace")
+    np.testing.assert_array_equal(
+        publication_table["Credit_Matrix"][:, lovelace_column], [0, 1, 0.5]
+    )
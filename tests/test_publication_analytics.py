@@ -0,0 +1,49 @@
+import numpy as np
+
+from publication_analytics import fit_linear_trends, rolling_window_rate
+
+
+def test_rolling_window_rate_averages_the_trailing_window():
+    rates = rolling_window_rate([[2, 0], [4, 1], [0, 1], [6, 0]], 2)
+    np.testing.assert_allclose(rates, [[2, 0], [3, 0.5], [2, 1], [3, 0.5]])
+
+
+def test_rolling_window_rate_first_periods_average_what_is_available():
+    rates = rolling_window_rate([3, 6, 9, 0], 3)
+    np.testing.assert_allclose(rates, [3, 4.5, 6, 5])
+    # A one-period window is the counts themselves
+    np.testing.assert_allclose(rolling_window_rate([3, 6, 9, 0], 1), [3, 6, 9, 0])
+
+
+def test_rolling_window_rate_with_empty_periods():
+    np.testing.assert_allclose(rolling_window_rate([0, 0, 4, 0], 2), [0, 0, 2, 2])
+    assert rolling_window_rate(np.zeros((0, 3)), 12).shape == (0, 3)
+
+
+def test_rolling_window_longer_than_the_span_is_the_running_mean():
+    period_counts = np.array([[1, 4], [3, 0], [5, 2]])
+    rates = rolling_window_rate(period_counts, 12)
+    np.testing.assert_allclose(
+        rates, np.cumsum(period_counts, axis=0) / np.arange(1, 4)[:, None]
+    )
+
+
+def test_linear_trend_of_a_single_period_is_flat():
+    slopes, trend_values = fit_linear_trends([[5, 0]], projection_periods=2)
+    np.testing.assert_allclose(slopes, [0, 0], atol=1e-12)
+    np.testing.assert_allclose(trend_values, [[5, 0], [5, 0], [5, 0]], atol=1e-12)
+
+
+def test_linear_trend_of_a_constant_series_is_flat():
+    slopes, trend_values = fit_linear_trends(np.full((4, 2), 3.0), projection_periods=1)
+    np.testing.assert_allclose(slopes, [0, 0], atol=1e-12)
+    np.testing.assert_allclose(trend_values, np.full((5, 2), 3.0))
+
+
+def test_linear_trend_slope_signs():
+    period_counts = np.array([[1, 6, 2], [2, 4, 2], [3, 2, 2], [4, 0, 2]])
+    slopes, trend_values = fit_linear_trends(period_counts, projection_periods=1)
+    assert slopes[0] > 0
+    assert slopes[1] < 0
+    np.testing.assert_allclose(slopes, [1, -2, 0], atol=1e-12)
+    np.testing.assert_allclose(trend_values[-1], [5, -2, 2])
@@ -0,0 +1,379 @@
+import numpy as np
+import pytest
+
+import publication_data
+from conftest import (
+    DEFAULT_PUBLISHERS,
+    RECORDED_YEARS,
+    make_publications,
+    write_workbook,
+)
+
+
+def test_chunked_ingestion_parses_citations_once(tmp_path, monkeypatch):
+    workbook_path = write_workbook(tmp_path / "master.xlsx", make_publications(40))
+    parse_calls = []
+    parse_citations = publication_data.parse_citations
+
+    def count_parse_calls(citations):
+        parse_calls.append(len(citations))
+        return parse_citations(citations)
+
+    monkeypatch.setattr(publication_data, "parse_citations", count_parse_calls)
+    datasets = list(publication_data.iter_workbook_dataset(workbook_path, chunk_rows=7))
+    assert len(datasets) > 2
+    assert parse_calls == [40]
+
+
+def test_chunked_ingestion_matches_single_pass(tmp_path):
+    workbook_path = write_workbook(tmp_path / "master.xlsx", make_publications(40))
+    single_pass = publication_data.load_workbook_dataset(workbook_path)
+    for chunked in publication_data.iter_workbook_dataset(workbook_path, chunk_rows=7):
+        pass
+    for each_array in [
+        "Dates",
+        "Venue_Codes",
+        "Venue_Names",
+        "Citation_Years",
+        "Author_Matrix",
+        "Credit_Matrix",
+        "Membership_Bits",
+    ]:
+        np.testing.assert_array_equal(
+            chunked["Publication_Table"][each_array],
+            single_pass["Publication_Table"][each_array],
+        )
+
+
+def test_chunks_fill_in_one_publication_table(tmp_path):
+    workbook_path = write_workbook(tmp_path / "master.xlsx", make_publications(40))
+    datasets = list(publication_data.iter_workbook_dataset(workbook_path, chunk_rows=7))
+    publication_table = datasets[-1]["Publication_Table"]
+    assert all(
+        each_dataset["Publication_Table"] is publication_table
+        for each_dataset in datasets
+    )
+    assert [each_dataset["Rows_Attributed"] for each_dataset in datasets] == [
+        0,
+        7,
+        14,
+        21,
+        28,
+        35,
+        40,
+    ]
+
+
+def make_all_data(rows):
+    """Build an "All Data" frame from (print date, online date, DOI, citation) rows"""
+    import pandas as pd
+
+    return pd.DataFrame(
+        rows, columns=["Print Published", "Online published", "DOI", "Citation"]
+    )
+
+
+def test_deduplication_fills_missing_print_date_from_duplicate():
+    import pandas as pd
+
+    all_raw_data = make_all_data(
+        [
+            (None, None, "10.1000/a", "Smith J. A study. Nature. 2004;1(2):1-9."),
+            (
+                pd.Timestamp("2004-03-15"),
+                None,
+                "https://doi.org/10.1000/A",
+                "Smith J. A study. Nature. 2004;1(2):1-9.",
+            ),
+        ]
+    )
+    deduplicated_data, doi_index, duplicate_report, undated_sheet_rows = (
+        publication_data.deduplicate_publications(all_raw_data)
+    )
+    assert len(deduplicated_data) == 1
+    assert deduplicated_data.at[0, "Print Published"] == pd.Timestamp("2004-03-15")
+    assert doi_index == {"10.1000/a": 0}
+    assert duplicate_report[0]["Merged Sheet Rows"] == "2, 3"
+    assert undated_sheet_rows == []
+
+
+def test_deduplication_falls_back_to_online_date_and_reports_undated_rows():
+    import pandas as pd
+
+    all_raw_data = make_all_data(
+        [
+            (None, pd.Timestamp("2005-01-02"), "10.1000/b", "Jones M. Online."),
+            (None, None, "10.1000/c", "Jones M. Undated."),
+            (None, None, "10.1000/c", "Jones M. Undated."),
+        ]
+    )
+    deduplicated_data, _, _, undated_sheet_rows = (
+        publication_data.deduplicate_publications(all_raw_data)
+    )
+    assert deduplicated_data.at[0, "Print Published"] == pd.Timestamp("2005-01-02")
+    assert undated_sheet_rows == ["3", "4"]
+
+
+def test_undated_publication_is_rejected_after_deduplication(tmp_path):
+    import datetime
+
+    from workbook_validation import WorkbookValidationError
+
+    publications = make_publications(4)
+    # Undated, but its duplicate on the last row supplies the date
+    publications.append((None, publications[0][1], publications[0][2]))
+    workbook_path = write_workbook(tmp_path / "master.xlsx", publications)
+    dataset = publication_data.load_workbook_dataset(workbook_path)
+    assert dataset["Publication_Table"]["Dates"][0] == np.datetime64(
+        datetime.datetime(2003, 1, 15)
+    )
+    publications.append((None, "10.1000/undated", "Smith J. No date at all."))
+    workbook_path = write_workbook(tmp_path / "undated.xlsx", publications)
+    with pytest.raises(WorkbookValidationError) as raised:
+        publication_data.load_workbook_dataset(workbook_path)
+    assert raised.value.validation_report[0]["Rows"] == "7"
+
+
+def test_position_and_hire_year_are_optional(tmp_path):
+    from publisher_cohorts import get_dataset_cohorts
+
+    workbook_path = write_workbook(
+        tmp_path / "master.xlsx", make_publications(12), publisher_columns=()
+    )
+    dataset = publication_data.load_workbook_dataset(workbook_path)
+    assert dataset["Publish_Data"]["Smith"]["Position"] is None
+    assert dataset["Publish_Data"]["Smith"]["Hire_Year"] is None
+    assert list(get_dataset_cohorts(dataset["Publish_Data"])) == [
+        "All",
+        "Still at NYIT",
+    ]
+    workbook_path = write_workbook(
+        tmp_path / "ranked.xlsx", make_publications(12), publisher_columns=("Position",)
+    )
+    dataset = publication_data.load_workbook_dataset(workbook_path)
+    assert dataset["Publish_Data"]["Smith"]["Position"] == "Professor"
+    assert "Rank: Professor" in get_dataset_cohorts(dataset["Publish_Data"])
+
+
+def test_top_publishers_with_fewer_than_five(tmp_path):
+    workbook_path = write_workbook(tmp_path / "master.xlsx", make_publications(12))
+    ranked_per_chunk = [
+        publication_data.get_top_publishers(dataset["Publish_Data"])
+        for dataset in publication_data.iter_workbook_dataset(
+            workbook_path, chunk_rows=5
+        )
+    ]
+    # Publishers are known before any row is attributed
+    assert ranked_per_chunk[0] == [
+        (1, "Smith, John", 0),
+        (2, "Jones, Mary", 0),
+        (3, "Lovelace, Ada", 0),
+    ]
+    for top_publishers in ranked_per_chunk:
+        assert [each_row[0] for each_row in top_publishers] == [1, 2, 3]
+        publication_counts = [each_row[2] for each_row in top_publishers]
+        assert publication_counts == sorted(publication_counts, reverse=True)
+    assert publication_data.get_top_publishers({}) == []
+
+
+def test_publisher_column_labels_without_optional_columns(tmp_path):
+    percent_labels = [str(each_year) + " Research %" for each_year in RECORDED_YEARS]
+    workbook_path = write_workbook(
+        tmp_path / "master.xlsx", make_publications(12), publisher_columns=()
+    )
+    dataset = publication_data.load_workbook_dataset(workbook_path)
+    assert (
+        publication_data.get_publisher_column_labels(dataset["Publisher_Data"])
+        == ["First Name", "Last Name", "Currently at NYIT"] + percent_labels
+    )
+    workbook_path = write_workbook(tmp_path / "ranked.xlsx", make_publications(12))
+    dataset = publication_data.load_workbook_dataset(workbook_path)
+    assert (
+        publication_data.get_publisher_column_labels(dataset["Publisher_Data"])
+        == [
+            "First Name",
+            "Last Name",
+            "Currently at NYIT",
+            "Position",
+            "Hire Year",
+        ]
+        + percent_labels
+    )
+
+
+def test_doi_duplicate_across_workbooks_is_merged(tmp_path):
+    publications = make_publications(6)
+    first_path = write_workbook(tmp_path / "first.xlsx", publications[:4])
+    # The same publication as the first workbook's third row, under a DOI link in other case
+    repeated = (publications[2][0], "https://doi.org/10.1000/TEST2", publications[2][2])
+    second_path = write_workbook(
+        tmp_path / "second.xlsx", [repeated] + publications[4:]
+    )
+    dataset = publication_data.load_workbook_dataset(first_path, second_path)
+    assert len(dataset["Publication_Table"]["DOIs"]) == 6
+    assert dataset["Duplicate_Report"] == [
+        {
+            "Publication ID": 2,
+            "Matched On": "DOI",
+            "DOI": "10.1000/test2",
+            "Merged Sheet Rows": "first.xlsx row 4, second.xlsx row 2",
+            "Citation": publications[2][2],
+        }
+    ]
+
+
+def test_duplicate_without_doi_is_matched_by_citation_text():
+    import pandas as pd
+
+    all_raw_data = make_all_data(
+        [
+            (
+                pd.Timestamp("2004-03-15"),
+                None,
+                None,
+                "Smith J. A study.  Nature. 2004.",
+            ),
+            (None, None, "10.1000/other", "Jones M. Another study. Nature. 2004."),
+            (None, None, None, " smith j. a study. NATURE. 2004."),
+        ]
+    )
+    deduplicated_data, doi_index, duplicate_report, _ = (
+        publication_data.deduplicate_publications(all_raw_data)
+    )
+    assert len(deduplicated_data) == 2
+    assert doi_index == {"10.1000/other": 1}
+    assert duplicate_report[0]["Matched On"] == "Citation"
+    assert duplicate_report[0]["Merged Sheet Rows"] == "2, 4"
+
+
+def test_merged_workbooks_attribute_to_the_union_of_publishers(tmp_path):
+    import datetime
+
+    shared_publication = (
+        datetime.datetime(2004, 5, 15),
+        "10.1000/shared",
+        "Smith J, Lovelace A. A shared study. Nature. 2004;3(2):1-9.",
+    )
+    first_path = write_workbook(
+        tmp_path / "first.xlsx",
+        make_publications(3) + [shared_publication],
+        publishers=DEFAULT_PUBLISHERS[:2],
+    )
+    second_path = write_workbook(
+        tmp_path / "second.xlsx",
+        [shared_publication],
+        publishers=DEFAULT_PUBLISHERS[1:],
+    )
+    dataset = publication_data.load_workbook_dataset(first_path, second_path)
+    assert len(dataset["Publisher_Data"]) == 3
+    shared_row = list(dataset["Publication_Table"]["DOIs"]).index("10.1000/shared")
+    author_keys = list(dataset["Publication_Table"]["Author_Keys"])
+    shared_authors = dataset["Publication_Table"]["Author_Matrix"][shared_row]
+    assert [
+        each_publisher
+        for each_publisher, is_author in zip(author_keys, shared_authors)
+        if is_author
+    ] == ["Smith", "Lovelace"]
+    # Lovelace is only on the second workbook's publisher sheet
+    assert "10.1000/shared" in [
+        each_publication[1]
+        for each_publication in dataset["Publish_Data"]["Lovelace"][
+            "Author_Publications"
+        ]
+    ]
+
+
+def test_parse_citations_of_multi_author_and_malformed_entries():
+    citation_fields = publication_data.parse_citations(
+        [
+            "Smith J, Jones M, Lovelace A, Other X. A study of thing. J Anat. 2004;12(2):1-9.",
+            "Jones M. Another study. PLoS One. 2015 Mar 3;10(3):e0120.",
+            "Smith J. A study without a year. Nature.",
+            "Smith J. A study. Nature. 2004:1-9.",
+            "not a citation",
+            None,
+        ]
+    )
+    assert citation_fields.iloc[:2].to_dict("records") == [
+        {"Venue": "J Anat", "Year": "2004", "Volume": "12"},
+        {"Venue": "PLoS One", "Year": "2015", "Volume": "10"},
+    ]
+    # Entries without a year and volume are left unparsed rather than guessed
+    assert citation_fields.iloc[2:].isna().all(axis=None)
+
+
+def test_publications_without_a_doi_keep_their_venue(tmp_path):
+    publications = make_publications(3)
+    publications[1] = (publications[1][0], None, publications[1][2])
+    publications[2] = (publications[2][0], None, "Lovelace A. Malformed entry")
+    workbook_path = write_workbook(tmp_path / "master.xlsx", publications)
+    publication_table = publication_data.load_workbook_dataset(workbook_path)[
+        "Publication_Table"
+    ]
+    venue_names = publication_table["Venue_Names"][publication_table["Venue_Codes"][:2]]
+    assert list(venue_names) == ["J Anat", "Nature"]
+    assert publication_table["Venue_Codes"][2] == -1
+    assert publication_table["Citation_Years"][1] == 2004
+
+
+def make_attributed_table(publisher_count, publication_authors):
+    """Build a publication table whose i-th publication is attributed to the publisher
+    positions in publication_authors[i]"""
+    import pandas as pd
+
+    all_raw_data = pd.DataFrame(
+        {
+            "Print Published": pd.Timestamp("2004-01-15"),
+            "DOI": [
+                "10.1000/bits" + str(index) for index in range(len(publication_authors))
+            ],
+            "Citation": "Smith J. A study. Nature. 2004;1(2):1-9.",
+        }
+    )
+    publish_data_dict = {
+        "P"
+        + str(author_index): {
+            "Publication_IDs": np.array(
+                [
+                    publication_id
+                    for publication_id, authors in enumerate(publication_authors)
+                    if author_index in authors
+                ],
+                dtype=np.int64,
+            )
+        }
+        for author_index in range(publisher_count)
+    }
+    return publication_data.build_publication_table(all_raw_data, publish_data_dict, {})
+
+
+def test_selection_bitmask_past_the_64th_publisher():
+    publication_table = make_attributed_table(70, [[0], [63, 64], [69], [5, 69], []])
+    assert publication_table["Membership_Bits"].shape == (5, 9)
+    selected_mask = publication_data.get_selected_publication_mask(
+        publication_table, ["P64", "P69"]
+    )
+    assert selected_mask.tolist() == [False, True, True, True, False]
+    assert publication_data.count_selected_authors(
+        publication_table, ["P5", "P63", "P64", "P69"]
+    ).tolist() == [0, 2, 1, 2, 0]
+    np.testing.assert_allclose(
+        publication_table["Credit_Matrix"][1, [63, 64]], [0.5, 0.5]
+    )
+
+
+def test_empty_selection_bitmask_matches_nothing():
+    publication_table = make_attributed_table(70, [[0], [63, 64], [69]])
+    assert not publication_data.get_selection_bits(publication_table, []).any()
+    assert not publication_data.get_selected_publication_mask(
+        publication_table, []
+    ).any()
+    assert publication_data.count_selected_authors(publication_table, []).tolist() == [
+        0,
+        0,
+        0,
+    ]
+    # Unknown publishers select nothing either
+    assert not publication_data.get_selected_publication_mask(
+        publication_table, ["Nobody"]
+    ).any()
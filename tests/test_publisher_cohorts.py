@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import publication_data
+import publisher_cohorts
+from conftest import make_publications, write_workbook
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        publisher_cohorts, "cohort_cache", publisher_cohorts.OrderedDict()
+    )
+    workbook_path = write_workbook(tmp_path / "master.xlsx", make_publications(30))
+    return publication_data.load_workbook_dataset(workbook_path)
+
+
+def test_cohort_totals_count_each_publication_once(dataset):
+    cohort_totals = publisher_cohorts.get_cohort_totals(dataset, ["Smith", "Jones"])
+    period_edges = np.array(
+        ["2003-01-01", "2004-01-01", "2006-01-01"], "datetime64[ns]"
+    )
+    unique_counts = publisher_cohorts.get_cohort_period_counts(
+        cohort_totals, period_edges
+    )
+    attributed_counts = publisher_cohorts.get_cohort_period_counts(
+        cohort_totals, period_edges, "Attributed"
+    )
+    publication_table = dataset["Publication_Table"]
+    cohort_publications = publication_data.get_selected_publication_mask(
+        publication_table, ["Smith", "Jones"]
+    )
+    publication_years = publication_table["Dates"].astype("datetime64[Y]")
+    assert unique_counts.tolist() == [
+        np.count_nonzero(
+            cohort_publications & (publication_years == np.datetime64("2003"))
+        ),
+        np.count_nonzero(
+            cohort_publications & (publication_years > np.datetime64("2003"))
+        ),
+    ]
+    assert (attributed_counts >= unique_counts).all()
+    assert attributed_counts.sum() > unique_counts.sum()
+
+
+def test_cohort_totals_keep_the_most_recently_used(dataset, monkeypatch):
+    monkeypatch.setattr(publisher_cohorts, "COHORT_TOTALS_ENTRIES", 2)
+    smith_totals = publisher_cohorts.get_cohort_totals(dataset, ["Smith"])
+    publisher_cohorts.get_cohort_totals(dataset, ["Jones"])
+    assert publisher_cohorts.get_cohort_totals(dataset, ["Smith"]) is smith_totals
+    publisher_cohorts.get_cohort_totals(dataset, ["Lovelace"])
+    cached_totals = publisher_cohorts.cohort_cache[dataset["Dataset_Hash"]]["Totals"]
+    assert list(cached_totals) == [("Smith",), ("Lovelace",)]
+    pair_totals = publisher_cohorts.get_cohort_totals(dataset, ["Jones", "Smith"])
+    assert (
+        publisher_cohorts.get_cohort_totals(dataset, ["Smith", "Jones"]) is pair_totals
+    )
+    assert len(cached_totals) == 2
+
+
+def test_author_totals_match_one_cohort_per_author(dataset):
+    publication_table = dataset["Publication_Table"]
+    publisher_keys = ["Smith", "Jones", "Lovelace"]
+    period_edges = np.array(
+        ["2003-01-01", "2004-01-01", "2005-01-01", "2006-01-01"], "datetime64[ns]"
+    )
+    author_totals = publisher_cohorts.build_author_totals(
+        publication_table, publisher_keys
+    )
+    for count_mode in ["Attributed", "Fractional"]:
+        author_counts = publisher_cohorts.get_cohort_period_counts(
+            author_totals, period_edges, count_mode
+        )
+        assert author_counts.shape == (3, 3)
+        for name_index, each_name in enumerate(publisher_keys):
+            np.testing.assert_allclose(
+                author_counts[:, name_index],
+                publisher_cohorts.get_cohort_period_counts(
+                    publisher_cohorts.build_cohort_totals(
+                        publication_table, [each_name]
+                    ),
+                    period_edges,
+                    count_mode,
+                ),
+            )
+    np.testing.assert_array_equal(
+        publisher_cohorts.get_cohort_period_counts(author_totals, period_edges),
+        publisher_cohorts.get_cohort_period_counts(
+            publisher_cohorts.build_cohort_totals(publication_table, publisher_keys),
+            period_edges,
+        ),
+    )
+
+
+def test_unreadable_saved_cohorts_are_logged(tmp_path, monkeypatch, caplog):
+    cohorts_path = tmp_path / "cohorts.json"
+    cohorts_path.write_text("{not json")
+    monkeypatch.setattr(publisher_cohorts, "SAVED_COHORTS_FILE", str(cohorts_path))
+    monkeypatch.setattr(publisher_cohorts, "saved_cohorts", {})
+    monkeypatch.setattr(
+        publisher_cohorts, "saved_cohorts_state", {"Loaded": False, "Version": 0}
+    )
+    assert publisher_cohorts.get_saved_cohorts() == ({}, 0)
+    assert caplog.records[0].levelname == "WARNING"
+    assert str(cohorts_path) in caplog.records[0].getMessage()
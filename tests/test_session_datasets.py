@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import session_datasets
+
+
+@pytest.fixture(autouse=True)
+def empty_session_datasets(monkeypatch):
+    monkeypatch.setattr(
+        session_datasets, "session_datasets", type(session_datasets.session_datasets)()
+    )
+
+
+def test_partial_registrations_keep_the_last_estimate():
+    session_datasets.register_session_dataset(
+        "session", ("upload",), {"Rows": np.zeros(1000)}, None
+    )
+    measured_bytes = session_datasets.session_datasets["session"]["Bytes"]
+    assert measured_bytes >= 8000
+    session_datasets.register_session_dataset(
+        "session",
+        ("upload",),
+        {"Rows": np.zeros(100000)},
+        None,
+        estimate_bytes=False,
+    )
+    assert session_datasets.session_datasets["session"]["Bytes"] == measured_bytes
+    session_datasets.register_session_dataset(
+        "session", ("upload",), {"Rows": np.zeros(100000)}, None
+    )
+    assert session_datasets.session_datasets["session"]["Bytes"] >= 800000
+
+
+def test_partial_registration_of_a_new_upload_starts_unmeasured():
+    session_datasets.register_session_dataset(
+        "session", ("first",), {"Rows": np.zeros(1000)}, None
+    )
+    session_datasets.register_session_dataset(
+        "session", ("second",), {"Rows": np.zeros(1000)}, None, estimate_bytes=False
+    )
+    assert session_datasets.session_datasets["session"]["Bytes"] == 0
@@ -0,0 +1,56 @@
+import pytest
+
+import shared_dataset
+
+
+class StopWatching(BaseException):
+    """Ends the watcher loop from the test's sleep"""
+
+
+def test_watcher_survives_failed_polls(tmp_path, monkeypatch, caplog):
+    polls = []
+
+    def find_newest_workbook(directory):
+        polls.append(directory)
+        if len(polls) == 1:
+            raise PermissionError("scan denied")
+        if len(polls) == 2:
+            return (str(tmp_path / "master.xlsx"), (1, 1))
+        return None
+
+    def load_shared_workbook(workbook_path, workbook_hash=None):
+        raise RuntimeError("reload failed")
+
+    def sleep(seconds):
+        if len(polls) == 3:
+            raise StopWatching()
+
+    monkeypatch.setattr(shared_dataset, "DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(shared_dataset, "warm_lazy_modules", lambda: None)
+    monkeypatch.setattr(shared_dataset, "find_newest_workbook", find_newest_workbook)
+    monkeypatch.setattr(shared_dataset, "hash_workbook", lambda workbook_path: "hash")
+    monkeypatch.setattr(shared_dataset, "load_shared_workbook", load_shared_workbook)
+    monkeypatch.setattr(shared_dataset.time, "sleep", sleep)
+    with pytest.raises(StopWatching):
+        shared_dataset.watch_data_directory()
+    assert len(polls) == 3
+    assert [str(each_record.exc_info[1]) for each_record in caplog.records] == [
+        "scan denied",
+        "reload failed",
+    ]
+    assert all(each_record.levelname == "ERROR" for each_record in caplog.records)
+
+
+def test_vanished_workbook_is_skipped(tmp_path, monkeypatch):
+    (tmp_path / "kept.xlsx").write_bytes(b"kept")
+    (tmp_path / "gone.xlsx").write_bytes(b"gone")
+    scan_directory = shared_dataset.os.scandir
+
+    def scan_then_remove(directory):
+        directory_entries = list(scan_directory(directory))
+        (tmp_path / "gone.xlsx").unlink()
+        return iter(directory_entries)
+
+    monkeypatch.setattr(shared_dataset.os, "scandir", scan_then_remove)
+    newest_workbook = shared_dataset.find_newest_workbook(str(tmp_path))
+    assert newest_workbook[0] == str(tmp_path / "kept.xlsx")
@@ -0,0 +1,40 @@
+import datetime
+
+import openpyxl
+
+from summary_report import SHEET_TITLE_LIMIT, iter_wide_rows, write_summary_report
+
+
+def test_wide_rows_hold_every_column_per_label():
+    assert list(iter_wide_rows(["2003 - 2004", "2004 - 2005"], [[1, 2], [3, 4]])) == [
+        ["2003 - 2004", 1, 3],
+        ["2004 - 2005", 2, 4],
+    ]
+
+
+def test_summary_report_writes_a_sheet_per_table(tmp_path):
+    report_path = tmp_path / "report.xlsx"
+    long_title = "Efficiency Median and Maximum Per Timespan"
+    write_summary_report(
+        report_path,
+        {
+            "Monthly Counts": (
+                ["Month", "Publications"],
+                iter_wide_rows(
+                    [datetime.datetime(2003, 1, 1), datetime.datetime(2003, 2, 1)],
+                    [[4, 0.5]],
+                ),
+            ),
+            long_title: (["Year", "Median", "Maximum"], iter([])),
+        },
+    )
+    workbook = openpyxl.load_workbook(report_path)
+    assert workbook.sheetnames == ["Monthly Counts", long_title[:SHEET_TITLE_LIMIT]]
+    assert list(workbook["Monthly Counts"].iter_rows(values_only=True)) == [
+        ("Month", "Publications"),
+        (datetime.datetime(2003, 1, 1), 4),
+        (datetime.datetime(2003, 2, 1), 0.5),
+    ]
+    assert list(
+        workbook[long_title[:SHEET_TITLE_LIMIT]].iter_rows(values_only=True)
+    ) == [("Year", "Median", "Maximum")]
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from workbook_validation import (
+    ALL_DATA_COLUMNS,
+    validate_all_data_sheet,
+    validate_publication_dates,
+)
+
+
+def make_all_data(print_dates):
+    """Build an "All Data" frame holding the given print dates"""
+    return pd.DataFrame(
+        {
+            "Print Published": print_dates,
+            "Online published": [None] * len(print_dates),
+            "Number of NYIT \nStudent Authors": [0] * len(print_dates),
+            "DOI": ["10.1000/" + str(index) for index in range(len(print_dates))],
+            "Citation": [
+                "Smith J. Study " + str(index) for index in range(len(print_dates))
+            ],
+        },
+        columns=ALL_DATA_COLUMNS,
+    )
+
+
+def test_missing_print_date_is_left_to_deduplication():
+    validation_report = []
+    validate_all_data_sheet(
+        make_all_data([pd.Timestamp("2004-01-01"), None]), validation_report
+    )
+    assert validation_report == []
+
+
+def test_unparseable_print_date_is_rejected():
+    validation_report = []
+    validate_all_data_sheet(
+        make_all_data([pd.Timestamp("2004-01-01"), "soon", "later"]), validation_report
+    )
+    assert [
+        (each_problem["Problem"], each_problem["Rows"])
+        for each_problem in validation_report
+    ] == [("Not a date", "3, 4")]
+
+
+def test_undated_publications_are_reported_by_sheet_row():
+    assert validate_publication_dates([]) == []
+    validation_report = validate_publication_dates(
+        ["a.xlsx row " + str(index) for index in range(2, 14)]
+    )
+    assert validation_report[0]["Column"] == "Print Published"
+    assert validation_report[0]["Rows"].endswith("a.xlsx row 11 (+2 more)")
@@ -0,0 +1,273 @@
+## Workbook Validation
+
+# Column-wise checks of both sheets, run before attribution so a malformed upload is rejected
+# before any per-row work is done
+
+from lazy_imports import pd
+from performance_metrics import timed
+
+ALL_DATA_COLUMNS = [
+    "Print Published",
+    "Online published",
+    "Number of NYIT \nStudent Authors",
+    "DOI",
+    "Citation",
+]
+PUBLISHER_COLUMNS = [
+    "First Name",
+    "Last Name",
+    "Currently at NYIT",
+]  # "Position" and "Hire Year" are optional, feeding the rank and hire-year cohorts when present
+ALIAS_COLUMNS = [
+    "Last Name",
+    "First Name",
+    "Alias Last Name",
+    "Alias First Name",
+]
+# Offending rows listed per problem before the rest are only counted
+REPORTED_ROW_LIMIT = 10
+
+
+class WorkbookValidationError(ValueError):
+    """Raised when an uploaded workbook fails validation, carrying the report of every problem found"""
+
+    def __init__(self, validation_report):
+        super().__init__(
+            "Not a valid workbook. "
+            + str(len(validation_report))
+            + " problem(s) found before attribution"
+        )
+        self.validation_report = validation_report
+
+
+def describe_rows(row_flags, header_rows):
+    """List the sheet row numbers flagged in a boolean column, e.g. '2, 7, 9 (+3 more)'"""
+    return describe_sheet_rows(
+        (row_flags.to_numpy().nonzero()[0] + header_rows + 1).tolist()
+    )
+
+
+def describe_sheet_rows(sheet_rows):
+    """List sheet rows, numbers or labels, up to the reported limit"""
+    row_text = ", ".join(str(each_row) for each_row in sheet_rows[:REPORTED_ROW_LIMIT])
+    if len(sheet_rows) > REPORTED_ROW_LIMIT:
+        row_text += " (+" + str(len(sheet_rows) - REPORTED_ROW_LIMIT) + " more)"
+    return row_text
+
+
+def add_row_problem(validation_report, sheet, column, problem, row_flags, header_rows):
+    """Add a problem to the report if any row is flagged"""
+    if row_flags.any():
+        validation_report.append(
+            {
+                "Sheet": sheet,
+                "Column": column.replace("\n", ""),
+                "Problem": problem,
+                "Rows": describe_rows(row_flags, header_rows),
+            }
+        )
+
+
+def find_non_string_cells(column_values):
+    """Flag filled cells that do not hold text"""
+    return column_values.notna() & ~column_values.map(type).eq(str)
+
+
+def find_empty_text_cells(column_values):
+    """Flag empty cells and cells holding only whitespace"""
+    return column_values.isna() | column_values.astype(str).str.strip().eq("")
+
+
+def validate_all_data_sheet(all_raw_data, validation_report):
+    """Check the "All Data" sheet's columns, print dates and citations"""
+    for each_column in ALL_DATA_COLUMNS:
+        if each_column not in all_raw_data.columns:
+            validation_report.append(
+                {
+                    "Sheet": "All Data",
+                    "Column": each_column.replace("\n", ""),
+                    "Problem": "Missing column",
+                    "Rows": "",
+                }
+            )
+    if "Print Published" in all_raw_data.columns:
+        # Missing print dates may still be filled from a duplicate or the online date,
+        # so they are only checked once duplicates are merged
+        print_dates = all_raw_data["Print Published"]
+        parsed_dates = pd.to_datetime(print_dates, errors="coerce")
+        add_row_problem(
+            validation_report,
+            "All Data",
+            "Print Published",
+            "Not a date",
+            print_dates.notna() & parsed_dates.isna(),
+            1,
+        )
+    if "Citation" in all_raw_data.columns:
+        citations = all_raw_data["Citation"]
+        non_string_citations = find_non_string_cells(citations)
+        add_row_problem(
+            validation_report,
+            "All Data",
+            "Citation",
+            "Citation is not text",
+            non_string_citations,
+            1,
+        )
+        add_row_problem(
+            validation_report,
+            "All Data",
+            "Citation",
+            "Empty citation",
+            find_empty_text_cells(citations) & ~non_string_citations,
+            1,
+        )
+
+
+def validate_publisher_sheet(
+    publisher_raw_data, percent_super_header, validation_report
+):
+    """Check the "Publishers" sheet's columns, names and research percents"""
+    top_headers = set(publisher_raw_data.columns.get_level_values(0))
+    for each_column in PUBLISHER_COLUMNS + [percent_super_header]:
+        if each_column not in top_headers:
+            validation_report.append(
+                {
+                    "Sheet": "Publishers",
+                    "Column": each_column,
+                    "Problem": "Missing column",
+                    "Rows": "",
+                }
+            )
+    for each_column in ["First Name", "Last Name"]:
+        if each_column in top_headers:
+            publisher_names = publisher_raw_data[each_column].iloc[:, 0]
+            add_row_problem(
+                validation_report,
+                "Publishers",
+                each_column,
+                "Missing or non-text name",
+                find_empty_text_cells(publisher_names)
+                | find_non_string_cells(publisher_names),
+                2,
+            )
+    if percent_super_header in top_headers:
+        research_percents = publisher_raw_data[percent_super_header]
+        non_year_headers = [
+            str(each_year)
+            for each_year in research_percents.columns
+            if not isinstance(each_year, int)
+        ]
+        if non_year_headers:
+            validation_report.append(
+                {
+                    "Sheet": "Publishers",
+                    "Column": percent_super_header,
+                    "Problem": "Year headers that are not years: "
+                    + ", ".join(non_year_headers),
+                    "Rows": "",
+                }
+            )
+        numeric_percents = research_percents.apply(pd.to_numeric, errors="coerce")
+        add_row_problem(
+            validation_report,
+            "Publishers",
+            percent_super_header,
+            "Research percent is not a number",
+            (research_percents.notna() & numeric_percents.isna()).any(axis=1),
+            2,
+        )
+
+
+def validate_alias_sheet(alias_raw_data, publisher_raw_data, validation_report):
+    """Check the "Aliases" sheet's columns, and that every alias names a listed publisher"""
+    missing_columns = [
+        each_column
+        for each_column in ALIAS_COLUMNS
+        if each_column not in alias_raw_data.columns
+    ]
+    for each_column in missing_columns:
+        validation_report.append(
+            {
+                "Sheet": "Aliases",
+                "Column": each_column,
+                "Problem": "Missing column",
+                "Rows": "",
+            }
+        )
+    if missing_columns:
+        return
+    alias_last_names = alias_raw_data["Alias Last Name"]
+    add_row_problem(
+        validation_report,
+        "Aliases",
+        "Alias Last Name",
+        "Missing or non-text alias",
+        find_empty_text_cells(alias_last_names)
+        | find_non_string_cells(alias_last_names),
+        1,
+    )
+    top_headers = set(publisher_raw_data.columns.get_level_values(0))
+    if not {"Last Name", "First Name"} <= top_headers:
+        return
+    listed_names = set(
+        zip(
+            publisher_raw_data["Last Name"]
+            .iloc[:, 0]
+            .astype(str)
+            .str.strip()
+            .str.lower(),
+            publisher_raw_data["First Name"]
+            .iloc[:, 0]
+            .astype(str)
+            .str.strip()
+            .str.lower(),
+        )
+    )
+    alias_names = pd.Series(
+        list(
+            zip(
+                alias_raw_data["Last Name"].astype(str).str.strip().str.lower(),
+                alias_raw_data["First Name"].astype(str).str.strip().str.lower(),
+            )
+        ),
+        dtype=object,
+    )
+    add_row_problem(
+        validation_report,
+        "Aliases",
+        "Last Name",
+        "Not a publisher on the Publishers sheet",
+        ~alias_names.isin(listed_names),
+        1,
+    )
+
+
+def validate_publication_dates(undated_sheet_rows):
+    """Report the sheet rows of publications left without a print date after duplicates were merged
+    and online dates filled in"""
+    if not undated_sheet_rows:
+        return []
+    return [
+        {
+            "Sheet": "All Data",
+            "Column": "Print Published",
+            "Problem": "Missing print publication date, with no duplicate or online date to fill it from",
+            "Rows": describe_sheet_rows(undated_sheet_rows),
+        }
+    ]
+
+
+@timed()
+def validate_workbook(
+    all_raw_data, publisher_raw_data, percent_super_header, alias_raw_data=None
+):
+    """Check the sheets of a workbook column by column, returning one report row per problem"""
+    validation_report = []
+    validate_all_data_sheet(all_raw_data, validation_report)
+    validate_publisher_sheet(
+        publisher_raw_data, percent_super_header, validation_report
+    )
+    if alias_raw_data is not None:
+        validate_alias_sheet(alias_raw_data, publisher_raw_data, validation_report)
+    return validation_report